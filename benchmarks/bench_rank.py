@@ -0,0 +1,209 @@
+"""
+智能识别评分基准与权重调优：在带标注的目录语料上测量首选命中率与评分吞吐量，并网格搜索权重方案
+
+用法:
+    python benchmarks/bench_rank.py [--corpus benchmarks/rank_corpus.json] [--profile config/rank_weights.ini]
+    python benchmarks/bench_rank.py --grid "token_exact=100,150,200;launcher_name=0,20,40" [--save config/rank_weights.ini]
+    python benchmarks/bench_rank.py --make-corpus "D:\\Program Files" my_corpus.json
+语料为 JSON 列表，每项 {"dir": 相对目录 (/ 分隔), "exes": [该目录下的 exe], "expected": 应排第一的 exe}，
+程序名与扫描时相同 (目录名，bin 目录取上一级目录名)。路径在内存中拼接，不访问磁盘。
+--profile 指定基线权重文件 (格式同 config/rank_weights.ini)，缺省时使用内置默认权重。
+--grid 未指定时对每项权重各取 {0, 默认值, 2 倍默认值} 做全组合；命中率相同的方案取与基线相对差异最小的一个。
+--save 把最佳方案写成权重文件 (关键词列表沿用基线)，扫描时由 load_rank_rules() 从 config/ 读取。
+--make-corpus 遍历真实目录树生成语料模板，expected 先填当前权重下的首选，人工核对修改后使用。
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend.const import DEFAULT_RANK_WEIGHTS, FILENAME_RANK_WEIGHTS
+from scanner_backend.core_rank import FEATURES, RankScorer, program_tokens
+from scanner_backend.manager_rules import load_rank_rules, save_rank_rules
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = os.path.abspath(os.sep + 'Apps')
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rank_corpus.json')
+GRID_CHUNK = 4096  # 向量化评估时每次计算的方案数
+
+
+def program_name_of(rel_dir):
+    parts = rel_dir.replace('\\', '/').strip('/').split('/')
+    if parts[-1].lower() == 'bin' and len(parts) > 1: return parts[-2]
+    return parts[-1]
+
+
+def load_corpus(filename):
+    with open(filename, encoding='utf-8') as f:
+        entries = json.load(f)
+    jobs, expected = [], []
+    for e in entries:
+        folder = os.path.join(ROOT, *e['dir'].replace('\\', '/').split('/'))
+        paths = [os.path.join(folder, x) for x in e['exes']]
+        jobs.append((program_name_of(e['dir']), paths, ROOT))
+        expected.append(e['exes'].index(e['expected']))
+    return entries, jobs, expected
+
+
+def make_corpus(root, out):
+    """遍历 root，每个含 exe 的目录生成一项，expected 为默认权重下的首选"""
+    scorer = RankScorer(**load_rank_rules()[0])
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort(key=str.lower)
+        exes = sorted((f for f in filenames if f.lower().endswith('.exe')), key=str.lower)
+        if not exes or dirpath == root: continue
+        rel = os.path.relpath(dirpath, root).replace(os.sep, '/')
+        best = scorer.rank(program_name_of(rel), [os.path.join(dirpath, x) for x in exes], dirpath)[0]
+        entries.append({'dir': rel, 'exes': exes, 'expected': os.path.basename(best)})
+    with open(out, 'w', encoding='utf-8') as f:
+        f.write('[\n' + ',\n'.join('  ' + json.dumps(e, ensure_ascii=False) for e in entries) + '\n]\n')
+    print(f"写入 {len(entries)} 项: {out} (请逐项核对 expected)")
+
+
+def feature_rows(scorer, jobs):
+    """全部候选的特征行与每个目录的 [start, end)"""
+    rows, bounds = [], []
+    for program_name, paths, root_path in jobs:
+        tokens, clean_name = program_tokens(program_name)
+        start = len(rows)
+        rows.extend(scorer.features(tokens, clean_name, p, root_path) for p in paths)
+        bounds.append((start, len(rows)))
+    return rows, bounds
+
+
+def top1_hits(scorer, jobs, expected):
+    return [order[0] == exp for order, exp in zip(scorer.rank_indices(jobs), expected)]
+
+
+def grid_accuracy(rows, bounds, expected, profiles):
+    """
+    每个方案 (权重向量) 的首选命中数；排序为稳定降序，所以命中 = 期望项得分等于组内最大值，且排在它前面的都更低
+    有 NumPy 时一次算出一批方案的得分矩阵
+    """
+    if np is None:
+        hits = []
+        for w in profiles:
+            scores = [sum(f * x for f, x in zip(row, w)) for row in rows]
+            n = 0
+            for (a, b), exp in zip(bounds, expected):
+                group = scores[a:b]
+                n += group.index(max(group)) == exp
+            hits.append(n)
+        return hits
+    F = np.array(rows, dtype=float)
+    starts = np.array([a for a, _ in bounds])
+    exp_idx = starts + np.array(expected)
+    hits = []
+    for i in range(0, len(profiles), GRID_CHUNK):
+        S = F @ np.array(profiles[i:i + GRID_CHUNK], dtype=float).T  # 候选 x 方案
+        gmax = np.maximum.reduceat(S, starts, axis=0)
+        ok = S[exp_idx] == gmax
+        for g, ((a, _), exp) in enumerate(zip(bounds, expected)):
+            if exp: ok[g] &= S[a:a + exp].max(axis=0) < gmax[g]
+        hits.extend(ok.sum(axis=0).tolist())
+    return hits
+
+
+def parse_grid(text, base):
+    grid = {f: [base[f]] for f in FEATURES}
+    if not text:
+        for f in FEATURES: grid[f] = sorted({0, base[f], base[f] * 2})
+        return grid
+    for part in text.split(';'):
+        if not part.strip(): continue
+        key, _, values = part.partition('=')
+        key = key.strip()
+        if key not in grid: raise SystemExit(f"未知权重: {key} (可选: {', '.join(FEATURES)})")
+        grid[key] = [float(v) if '.' in v else int(v) for v in (x.strip() for x in values.split(',')) if v]
+    return grid
+
+
+def throughput(scorer, jobs, repeat):
+    n = sum(len(paths) for _, paths, _ in jobs)
+    best_many = best_one = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        scorer.rank_many(jobs)
+        t1 = time.perf_counter()
+        for job in jobs: scorer.rank(*job)
+        t2 = time.perf_counter()
+        best_many = t1 - t0 if best_many is None else min(best_many, t1 - t0)
+        best_one = t2 - t1 if best_one is None else min(best_one, t2 - t1)
+    return n, best_many, best_one
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--corpus', default=DEFAULT_CORPUS)
+    ap.add_argument('--profile', help='基线权重文件，缺省使用内置默认权重')
+    ap.add_argument('--repeat', type=int, default=20, help='吞吐量测量时重复整份语料的次数')
+    ap.add_argument('--grid', help='key=v1,v2;key=v1,... 未列出的权重固定为基线值')
+    ap.add_argument('--no-grid', action='store_true', help='只评估基线')
+    ap.add_argument('--save', nargs='?', const=FILENAME_RANK_WEIGHTS, help='最佳方案写入的文件')
+    ap.add_argument('--make-corpus', nargs=2, metavar=('ROOT', 'OUT'))
+    ap.add_argument('--verbose', action='store_true', help='列出未命中的目录')
+    args = ap.parse_args()
+
+    if args.make_corpus:
+        make_corpus(*args.make_corpus)
+        return
+
+    if args.profile:
+        if not os.path.exists(args.profile): raise SystemExit(f"权重文件不存在: {args.profile}")
+        rules, msg = load_rank_rules(args.profile)
+        print(f"基线: {args.profile} ({msg})")
+    else:
+        rules = {'weights': dict(DEFAULT_RANK_WEIGHTS), 'negative_keywords': None, 'launcher_names': None}
+        print("基线: 内置默认权重")
+    scorer = RankScorer(**rules)
+    entries, jobs, expected = load_corpus(args.corpus)
+
+    hits = top1_hits(scorer, jobs, expected)
+    n, t_many, t_one = throughput(scorer, jobs, args.repeat)
+    print(f"语料: {len(jobs)} 个目录, {n} 个候选   NumPy: {'有' if np is not None else '无'}")
+    print(f"首选命中: {sum(hits)}/{len(hits)} ({sum(hits) / len(hits):.1%})")
+    print(f"评分吞吐: rank_many {n / t_many:9.0f} 候选/s   逐目录 rank {n / t_one:9.0f} 候选/s")
+    if args.verbose:
+        for e, job, ok in zip(entries, jobs, hits):
+            if not ok: print(f"  未命中 {e['dir']}: 期望 {e['expected']}, 实际 {os.path.basename(scorer.rank(*job)[0])}")
+    if args.no_grid: return
+
+    base = scorer.weights
+    grid = parse_grid(args.grid, base)
+    profiles = list(itertools.product(*(grid[f] for f in FEATURES)))
+    rows, bounds = feature_rows(scorer, jobs)
+    t0 = time.perf_counter()
+    scores = grid_accuracy(rows, bounds, expected, profiles)
+    dt = time.perf_counter() - t0
+    best = max(scores)
+
+    def distance(w):  # 与基线的相对差异 (L1)，命中率相同时优先改动小的方案
+        return sum(abs(x - base[f]) / (abs(base[f]) or 1) for f, x in zip(FEATURES, w))
+
+    winner = min((w for w, s in zip(profiles, scores) if s == best), key=distance)
+    print(f"网格搜索: {len(profiles)} 个方案, {dt * 1000:.1f} ms   最佳命中 {best}/{len(jobs)} ({best / len(jobs):.1%})")
+    for f, x in zip(FEATURES, winner):
+        print(f"  {f:<18} {x:>6}" + (f"   (基线 {base[f]})" if x != base[f] else ""))
+
+    tuned = RankScorer(dict(zip(FEATURES, winner)), scorer.negative_keywords, scorer.launcher_names)
+    if sum(top1_hits(tuned, jobs, expected)) != best: print("警告: 向量化评估与 RankScorer 结果不一致")
+    if args.verbose:
+        for e, job, ok in zip(entries, jobs, top1_hits(tuned, jobs, expected)):
+            if not ok: print(f"  未命中 {e['dir']}: 期望 {e['expected']}, 实际 {os.path.basename(tuned.rank(*job)[0])}")
+    if args.save:
+        ok, msg = save_rank_rules({'weights': tuned.weights, 'negative_keywords': list(tuned.negative_keywords),
+                                   'launcher_names': sorted(tuned.launcher_names)}, args.save)
+        print(f"{msg}: {args.save}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+扫描规则匹配基准：原逐条循环 (扩展名循环 + 黑名单 / 编程环境集合 + is_junk_path) vs CompiledRules
+
+用法:
+    python benchmarks/bench_rules.py [--files 200000] [--dirs 50000] [--exts .exe,.bat,.cmd,.jar] [--patterns 500]
+在内存中生成合成文件名与目录路径，不访问磁盘。
+--patterns N 额外测量黑名单中再加入 N 条通配符 + N 条 re: 规则时的文件匹配耗时 (原逐条循环不支持这两种写法)。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend.const import DEFAULT_IGNORED_DIRS, DEFAULT_BLOCKLIST, DEFAULT_PROG_RUNTIMES, BAD_PATH_KEYWORDS
+from scanner_backend.core_discovery import is_junk_path
+from scanner_backend.core_rules import CompiledRules
+
+
+def build_samples(n_files, n_dirs, seed=42):
+    rng = random.Random(seed)
+    exts = ['.exe', '.dll', '.txt', '.dat', '.bat', '.png', '.jar', '.EXE']
+    blocked = sorted(DEFAULT_BLOCKLIST) + sorted(DEFAULT_PROG_RUNTIMES)
+    files = []
+    for i in range(n_files):
+        if rng.random() < 0.05:
+            files.append(rng.choice(blocked))
+        else:
+            files.append(f"File{i}{rng.choice(exts)}")
+    words = ['Program Files', 'Vendor', 'App', 'bin', 'data', 'Tools', 'Games', 'Common']
+    noise = list(BAD_PATH_KEYWORDS) + ['a1b2c3d4e5f6a7b8c9d0e1f2', 'node_modules', '.git']
+    dirs, names = [], []
+    for i in range(n_dirs):
+        parts = [rng.choice(words) + str(rng.randint(0, 99)) for _ in range(rng.randint(2, 6))]
+        if rng.random() < 0.1: parts.insert(rng.randint(0, len(parts)), rng.choice(noise))
+        dirs.append('D:\\' + '\\'.join(parts))
+        names.append(parts[-1])
+    return files, dirs, names
+
+
+def legacy(files, dirs, names, exts, blocklist, prog_runtimes, ignored_lower, bad_kws):
+    def is_candidate(file):
+        f = file.lower()
+        is_target = False
+        for ext in exts:
+            if f.endswith(ext): is_target = True; break
+        if not is_target: return False
+        if f in blocklist: return False
+        if f in prog_runtimes: return False
+        return True
+
+    skip_dir = lambda p: is_junk_path(p, bad_kws)
+    t0 = time.perf_counter()
+    r_files = [is_candidate(f) for f in files]
+    t1 = time.perf_counter()
+    r_dirs = [skip_dir(d) for d in dirs]
+    t2 = time.perf_counter()
+    prune_dir = lambda d: d.lower() in ignored_lower or d.startswith('.')  # 与原扫描代码中的回调相同
+    r_names = [prune_dir(d) for d in names]
+    t3 = time.perf_counter()
+    return (t1 - t0, t2 - t1, t3 - t2), (r_files, r_dirs, r_names)
+
+
+def compiled(files, dirs, names, exts, blocklist, prog_runtimes, ignored_lower, bad_kws):
+    t0 = time.perf_counter()
+    rules = CompiledRules(exts, blocklist, prog_runtimes, ignored_lower, bad_kws)
+    t_build = time.perf_counter() - t0
+    match_file, is_junk_dir, prune_dir = rules.match_file, rules.is_junk_dir, rules.prune_dir
+    t0 = time.perf_counter()
+    r_files = [match_file(f) for f in files]
+    t1 = time.perf_counter()
+    r_dirs = [is_junk_dir(d) for d in dirs]
+    t2 = time.perf_counter()
+    r_names = [prune_dir(d) for d in names]
+    t3 = time.perf_counter()
+    return (t1 - t0, t2 - t1, t3 - t2), (r_files, r_dirs, r_names), t_build
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--files', type=int, default=200000)
+    ap.add_argument('--dirs', type=int, default=50000)
+    ap.add_argument('--exts', default='.exe,.bat,.cmd,.jar')
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--patterns', type=int, default=500)
+    args = ap.parse_args()
+
+    files, dirs, names = build_samples(args.files, args.dirs)
+    exts = [e.strip().lower() for e in args.exts.split(',')]
+    blocklist = {x.lower() for x in DEFAULT_BLOCKLIST}
+    prog_runtimes = {x.lower() for x in DEFAULT_PROG_RUNTIMES}
+    ignored_lower = {d.lower() for d in DEFAULT_IGNORED_DIRS}
+    bad_kws = {x.lower() for x in BAD_PATH_KEYWORDS}
+    rule_args = (exts, blocklist, prog_runtimes, ignored_lower, bad_kws)
+
+    best_old = best_new = None
+    for _ in range(args.repeat):
+        t_old, r_old = legacy(files, dirs, names, *rule_args)
+        t_new, r_new, t_build = compiled(files, dirs, names, *rule_args)
+        best_old = t_old if best_old is None else tuple(map(min, best_old, t_old))
+        best_new = t_new if best_new is None else tuple(map(min, best_new, t_new))
+
+    print(f"样本: {len(files)} 个文件名, {len(dirs)} 个目录   规则编译: {t_build * 1000:.2f} ms")
+    for label, old, new, n in zip(("文件匹配", "垃圾目录", "忽略目录"), best_old, best_new,
+                                  (len(files), len(dirs), len(names))):
+        print(f"{label}: 逐条循环 {old * 1000:8.1f} ms   CompiledRules {new * 1000:8.1f} ms"
+              f"   ({old / n * 1e9:5.0f} -> {new / n * 1e9:5.0f} ns/项, {old / new:.2f}x)")
+    print(f"结果一致: {r_old == r_new}")
+
+    if args.patterns:
+        patterns = [f"tool{i}_*.exe" for i in range(args.patterns)] + \
+                   [f"re:^helper{i}_\\d+\\.exe$" for i in range(args.patterns)]
+        rules = CompiledRules(exts, list(blocklist) + patterns, prog_runtimes, ignored_lower, bad_kws)
+        match_file = rules.match_file
+        best = None
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            for f in files: match_file(f)
+            dt = time.perf_counter() - t0
+            best = dt if best is None else min(best, dt)
+        print(f"文件匹配 (+{len(patterns)} 条通配符/正则规则): {best * 1000:8.1f} ms   ({best / len(files) * 1e9:5.0f} ns/项)")
+
+
+if __name__ == '__main__':
+    main()
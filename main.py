@@ -1,16 +1,17 @@
 import sys
+import multiprocessing
 import scanner_backend as backend  # 先导入 backend 以便初始化环境
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import Qt
 
-# 必须在导入 UI 之前初始化环境，确保配置文件路径正确
-backend.init_environment()
 
-# 导入 UI (必须在环境初始化之后)
-from ui.main_window import MainWindow
+def main():
+    # 必须在导入 UI 之前初始化环境，确保配置文件路径正确
+    backend.init_environment()
 
+    # 导入 UI (必须在环境初始化之后)
+    from ui.main_window import MainWindow
 
-def main():
     app = QApplication(sys.argv)
     app.setApplicationName("GGDesk")
 
@@ -21,4 +22,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # 多进程排序的子进程以 spawn 方式启动，会重新导入本模块；
+    # 打包后的 exe 需要 freeze_support()，初始化与界面只在主进程中执行
+    multiprocessing.freeze_support()
+    main()
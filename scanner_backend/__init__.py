@@ -10,18 +10,39 @@ from .const import (
 )
 
 from .utils_system import create_shortcut, open_file_explorer, scan_existing_shortcuts, normalize_path
-from .manager_config import load_config, save_config
-from .manager_rules import load_blocklist, save_blocklist, load_ignored_dirs, save_ignored_dirs
+from .utils_lnk import read_lnk, read_lnk_target, read_lnk_targets
+from .manager_config import (
+    load_config, save_config, flush_config, get_config_service,
+    config_get, config_getint, config_getfloat, config_getboolean, config_set
+)
+from .manager_rules import (
+    load_blocklist, save_blocklist, load_ignored_dirs, save_ignored_dirs, load_rank_rules, save_rank_rules
+)
 
-from .core_discovery import discover_programs_generator
+from .core_discovery import discover_programs_generator, split_roots
 from .core_dedup import deduplicate_programs
+from .core_rules import CompiledRules
+from .core_rank import RankScorer
+from .core_shortcuts import create_shortcuts_batch
 
 from .manager_db import (
     init_databases,
+    close_databases,
+    transaction,
     add_shortcut_to_db,
+    upsert_shortcuts,
     get_all_shortcuts,
+    get_shortcuts_by_ids,
+    get_shortcuts_by_exe_paths,
     delete_shortcut,
-    increment_run_count
+    increment_run_count,
+    record_launch,
+    flush_launches,
+    change_generation,
+    changes_since,
+    load_icon_blob,
+    save_icon_blobs,
+    trim_icon_cache
 )
 
 
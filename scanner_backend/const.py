@@ -14,6 +14,7 @@ FILENAME_BLOCKLIST = os.path.join(DIR_CONFIG, "blocklist.txt")
 FILENAME_IGNORED_DIRS = os.path.join(DIR_CONFIG, "ignored_dirs.txt")
 FILENAME_PROG_RUNTIMES = os.path.join(DIR_CONFIG, "prog_runtimes.txt")
 FILENAME_BAD_PATH_KEYWORDS = os.path.join(DIR_CONFIG, "bad_path_keywords.txt")
+FILENAME_RANK_WEIGHTS = os.path.join(DIR_CONFIG, "rank_weights.ini")
 
 # 数据库文件
 DB_FILE_USER = os.path.join(DIR_DATA, "user_data.db")
@@ -33,6 +34,10 @@ DEFAULT_CONFIG = {
     'enable_smart_root': 'true',
     'is_first_run': 'true',
     'enable_prog_filter': 'true',
+    'scan_threads': '0',
+    'enable_incremental_scan': 'true',
+    'enable_process_rank': 'false',
+    'rank_processes': '0',
 
     'launcher_icon_size': '72',
     'launcher_show_badges': 'true',
@@ -71,4 +76,24 @@ BAD_PATH_KEYWORDS = [
     'runtime', 'framework', 'redist', 'prerequisites', 'installer',
     'debug', 'release', 'amd64', 'x86', 'plugins', 'extensions',
     'sha256', 'checksum', 'hash', 'driver'
-]
\ No newline at end of file
+]
+
+# 智能识别评分 (core_rank)：特征权重与关键词，可在 rank_weights.ini 中修改
+DEFAULT_RANK_WEIGHTS = {
+    'token_exact': 150,  # 程序名中的单词与文件名完全相同 (每个单词计一次)
+    'token_partial': 80,  # 文件名包含程序名中的单词
+    'name_exact': 100,  # 文件名与程序名 (去掉分隔符与数字) 相同
+    'name_partial': 50,  # 文件名包含程序名
+    'launcher_name': 20,  # launcher / main / start 等入口名称
+    'x64': 10,  # 文件名含 64
+    'exe': 5,  # .exe 文件
+    'depth': -15,  # 相对根目录每深一层
+    'negative_keyword': -100,  # 每命中一个负面关键词
+}
+
+RANK_LAUNCHER_NAMES = ['launcher', 'main', 'start', 'app', 'run']
+
+RANK_NEGATIVE_KEYWORDS = [
+    'helper', 'console', 'server', 'agent', 'service', 'tool', 'crash', 'update', 'handler', 'uninstall',
+    'eula', 'reporter'
+]
@@ -1,8 +1,43 @@
 import os
+import re
 import difflib
 from collections import defaultdict
 
 
+class DedupCandidate:
+    """
+    去重比较用的预计算特征，每个条目只构建一次
+    norm_path:   规范化 + 小写后的路径
+    path_key:    路径前 5 个字符 (路径太短为 None，不与任何项相似)
+    parts:       路径各级目录
+    name:        小写名称
+    tokens:      名称的字符多重集，元素为 (字符, 第 k 次出现)，交集大小即 quick_ratio 的分子
+    fingerprint: 名称 1-gram / 2-gram 的 64 位指纹，A 包含于 B 时 A 的指纹必是 B 的子集
+    """
+    __slots__ = ('item', 'norm_path', 'path_key', 'parts', 'name', 'tokens', 'fingerprint')
+
+    def __init__(self, item):
+        self.item = item
+        self.norm_path = os.path.normpath(item['root_path']).lower()
+        self.path_key = self.norm_path[:5] if len(self.norm_path) >= 5 else None
+        self.parts = tuple(x for x in re.split(r'[\\/]+', self.norm_path) if x)
+        self.name = item['name'].lower()
+
+        seen = {}
+        toks = []
+        fp = 0
+        prev = ''
+        for ch in self.name:
+            k = seen.get(ch, 0)
+            seen[ch] = k + 1
+            toks.append((ch, k))
+            fp |= 1 << (hash(ch) & 63)
+            if prev: fp |= 1 << (hash(prev + ch) & 63)
+            prev = ch
+        self.tokens = frozenset(toks)
+        self.fingerprint = fp
+
+
 class DuplicateAnalyzer:
     def __init__(self, threshold=0.6):
         """
@@ -42,33 +77,13 @@ class DuplicateAnalyzer:
         unique_candidates = list(exact_map.values())
 
         # 2. 模糊去重 (Fuzzy Match) - 也就是你要求的路径+名称分析
-        # 复杂度 O(N^2)，但通常扫描结果在几百以内，可接受
-        # 我们使用并查集 (Union-Find) 思想或者简单的聚类来分组
+        # 先生成候选对 (分块 + 字符前缀过滤)，只对可能相似的对做精确比较，再用并查集合并成组
+        # 按路径排序，保持分组顺序稳定
+        unique_candidates.sort(key=lambda x: x['root_path'])
 
-        visited = set()
         fuzzy_groups = []
         final_unique = []
-
-        # 按路径排序，增加邻近性检查的命中率
-        unique_candidates.sort(key=lambda x: x['root_path'])
-
-        for i in range(len(unique_candidates)):
-            if i in visited: continue
-
-            current = unique_candidates[i]
-            group = [current]
-            visited.add(i)
-
-            for j in range(i + 1, len(unique_candidates)):
-                if j in visited: continue
-
-                candidate = unique_candidates[j]
-
-                # 执行相似度检查
-                if self._is_similar(current, candidate):
-                    group.append(candidate)
-                    visited.add(j)
-
+        for group in self.cluster(unique_candidates):
             if len(group) > 1:
                 fuzzy_groups.append(group)
             else:
@@ -76,32 +91,146 @@ class DuplicateAnalyzer:
 
         return final_unique, fuzzy_groups
 
-    def _is_similar(self, p1, p2):
-        # 1. 路径相似度分析
-        # 如果两个程序在同一个父目录下 (比如 /123/456/A.exe 和 /123/567/B.exe)
-        # 计算公共路径长度
-        path1 = os.path.normpath(p1['root_path']).lower()
-        path2 = os.path.normpath(p2['root_path']).lower()
-
-        # 如果完全不在一个盘符或差异巨大，直接False
-        common = os.path.commonprefix([path1, path2])
-        if len(common) < 5:  # 公共路径太短
-            return False
+    def make_candidates(self, items):
+        """为每个条目预先计算一次比较特征 (DedupCandidate)"""
+        return [c if isinstance(c, DedupCandidate) else DedupCandidate(c) for c in items]
 
-        # 2. 名称相似度分析 (A.exe vs A_B.exe)
-        name1 = p1['name'].lower()
-        name2 = p2['name'].lower()
+    def cluster(self, items):
+        """
+        将 items 聚成若干组 (连通分量)，返回 [[item, ...], ...]
+        items 可以是原始 dict，也可以是 make_candidates 的结果；返回的组内始终是原始 dict
+        组按首个成员在 items 中的位置排序，组内保持原有顺序；不相似的项自成一组
+        """
+        cands = self.make_candidates(items)
+        uf = _UnionFind(len(cands))
+        for i, j in self.find_similar_pairs(cands):
+            uf.union(i, j)
 
-        # 包含关系 (A in A_B)
-        if name1 in name2 or name2 in name1:
-            return True
+        groups = {}
+        for i, c in enumerate(cands):
+            groups.setdefault(uf.find(i), []).append(c.item)
+        return list(groups.values())
 
-        # 序列相似度 (Levenshtein)
-        ratio = difflib.SequenceMatcher(None, name1, name2).ratio()
-        if ratio > self.threshold:
+    def find_similar_pairs(self, items):
+        """
+        返回所有满足 _is_similar 的下标对 (i, j)，i < j，结果与两两比较完全一致
+        1. 分块：公共前缀 >= 5 等价于规范化路径前 5 个字符相同，不同块之间不可能相似
+        2. 候选：名称按字符多重集做前缀过滤 (ratio 的上界是字符多重集交集)，
+           包含关系单独用"最稀有字符"倒排表召回
+        3. 校验：包含关系 -> 长度上界 -> 多重集交集 -> ratio
+        """
+        cands = self.make_candidates(items)
+
+        blocks = defaultdict(list)
+        for i, c in enumerate(cands):
+            if c.path_key is not None: blocks[c.path_key].append(i)
+
+        pairs = []
+        for members in blocks.values():
+            if len(members) > 1:
+                pairs.extend(self._pairs_in_block(members, cands))
+        return pairs
+
+    def _pairs_in_block(self, members, cands):
+        t = self.threshold
+
+        # 全局顺序：越稀有越靠前 (频次只在块内统计)
+        freq = defaultdict(int)
+        for i in members:
+            for tok in cands[i].tokens: freq[tok] += 1
+        ordered = {i: sorted(cands[i].tokens, key=lambda tok: (freq[tok], tok)) for i in members}
+
+        prefix_index = defaultdict(list)  # token -> 已处理项 (只索引前缀)
+        full_index = defaultdict(list)  # token -> 已处理项 (索引全部 token)
+        rarest_index = defaultdict(list)  # token -> 以它为最稀有 token 的已处理项
+        matcher = difflib.SequenceMatcher(None)
+        result = []
+
+        # members 按下标递增，候选 j 总是早于 i，比较顺序 (j, i) 与两两比较时一致
+        for i in members:
+            ci = cands[i]
+            toks = ordered[i]
+            if not toks:
+                # 空名称包含于任何名称之中
+                result.extend((j, i) for j in members if j < i)
+                rarest_index[None].append(i)
+                continue
+            # ratio > t 要求交集 > t * (l1 + l2) / 2 >= t * l / 2，据此确定前缀长度
+            prefix_len = len(toks) - int(t * len(toks) / 2)
+            found = set()
+            for tok in toks[:prefix_len]:
+                found.update(prefix_index[tok])
+            # 包含关系：短串的最稀有 token 必然出现在长串中
+            found.update(full_index[toks[0]])  # i 较短
+            for tok in ci.tokens:  # i 较长
+                found.update(rarest_index[tok])
+            # 早于 i 的空名称
+            found.update(rarest_index[None])
+
+            # SequenceMatcher 对第二个序列建索引，i 固定在第二个位置，只需建一次
+            matcher.set_seq2(ci.name)
+            for j in sorted(found):
+                if self._candidates_similar(cands[j], ci, matcher):
+                    result.append((j, i))
+
+            for tok in toks[:prefix_len]: prefix_index[tok].append(i)
+            for tok in ci.tokens: full_index[tok].append(i)
+            rarest_index[toks[0]].append(i)
+        return result
+
+    def _candidates_similar(self, c1, c2, matcher=None):
+        """
+        c1 / c2 为 DedupCandidate，判定规则与 _is_similar 相同
+        matcher: 可复用的 SequenceMatcher，调用方已 set_seq2(c2.name)
+        """
+        if c1.path_key is None or c1.path_key != c2.path_key:
+            return False
+        name1, name2 = c1.name, c2.name
+
+        # 包含关系 (A in A_B)：指纹先排除不可能的情况
+        if (c1.fingerprint & ~c2.fingerprint) == 0 and name1 in name2:
+            return True
+        if (c2.fingerprint & ~c1.fingerprint) == 0 and name2 in name1:
             return True
 
-        return False
+        # 序列相似度：先用长度与字符多重集交集两个上界排除
+        total = len(name1) + len(name2)
+        t = self.threshold
+        if 2.0 * min(len(name1), len(name2)) / total <= t:
+            return False
+        if 2.0 * len(c1.tokens & c2.tokens) / total <= t:
+            return False
+        if matcher is None:
+            matcher = difflib.SequenceMatcher(None, name1, name2)
+        else:
+            matcher.set_seq1(name1)
+        return matcher.ratio() > t
+
+    def _is_similar(self, p1, p2):
+        # 1. 路径相似度分析：公共路径太短 (不在一个盘符或差异巨大) 直接 False
+        # 2. 名称相似度分析 (A.exe vs A_B.exe)：包含关系或序列相似度
+        return self._candidates_similar(DedupCandidate(p1), DedupCandidate(p2))
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent[root] != root: root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb: return
+        if self.size[ra] < self.size[rb]: ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
 
 
 # 暴露的简单接口
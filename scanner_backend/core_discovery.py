@@ -1,11 +1,20 @@
 import os
 import re
-import win32com.client
-from collections import defaultdict
+import ntpath
+import queue
+import hashlib
+import threading
+from collections import defaultdict, deque
 from .manager_config import load_config
 # 【Beta 9.8】 不再直接导入常量，改为导入 IO 函数
-from .manager_rules import load_bad_path_keywords, load_prog_runtimes
+from .manager_rules import load_bad_path_keywords, load_prog_runtimes, load_rank_rules
 from .core_dedup import deduplicate_programs
+from .core_walker import ParallelWalker
+from .core_rank import RankScorer, default_scorer
+from .core_rank_pool import RankPool, RANK_BATCH_DIRS, RANK_BATCH_EXES, wait_result
+from .core_rules import CompiledRules, RuleSet, normalize_rule
+from .manager_db import load_dir_index, save_dir_index
+from .utils_lnk import read_lnk_targets
 
 
 # --- 辅助：判断是否为垃圾路径 ---
@@ -13,6 +22,7 @@ def is_junk_path(path, bad_keywords):
     """
     智能判断当前路径是否为组件/缓存/运行时目录
     bad_keywords: 从文件加载的动态集合
+    (扫描时使用 CompiledRules.is_junk_dir，这里保留逐条判断的版本供单次调用与基准对比)
     """
     path_lower = path.lower()
     folder_name = os.path.basename(path_lower)
@@ -29,29 +39,41 @@ def is_junk_path(path, bad_keywords):
     return False
 
 
-# ... (scan_start_menu, scan_uwp_apps, smart_rank_executables 保持不变，省略以节省篇幅) ...
-# 请保留原有的 scan_start_menu, scan_uwp_apps, smart_rank_executables 函数代码不变
-def scan_start_menu(blocklist):
-    paths = [os.path.expandvars(r'%APPDATA%\Microsoft\Windows\Start Menu\Programs'),
-             os.path.expandvars(r'%ProgramData%\Microsoft\Windows\Start Menu\Programs')]
-    shell = win32com.client.Dispatch("WScript.Shell")
-    for p in paths:
+def _rules_signature(*parts):
+    """影响候选文件集合的规则指纹；规则变化后旧的目录索引自动失效"""
+    norm = [sorted(p) if isinstance(p, (set, frozenset, list, tuple)) else p for p in parts]
+    return hashlib.md5(repr(norm).encode('utf-8')).hexdigest()
+
+
+# ... (scan_start_menu, scan_uwp_apps 保持不变，省略以节省篇幅) ...
+# 请保留原有的 scan_start_menu, scan_uwp_apps 函数代码不变
+def start_menu_dirs():
+    return [os.path.expandvars(r'%APPDATA%\Microsoft\Windows\Start Menu\Programs'),
+            os.path.expandvars(r'%ProgramData%\Microsoft\Windows\Start Menu\Programs')]
+
+
+def scan_start_menu(blocklist, roots=None):
+    """roots 默认为当前用户与所有用户的开始菜单目录"""
+    for p in start_menu_dirs() if roots is None else roots:
         if not os.path.exists(p): continue
-        for root, _, files in os.walk(p):
-            for f in files:
-                if f.lower().endswith('.lnk'):
-                    try:
-                        target = shell.CreateShortCut(os.path.join(root, f)).TargetPath
-                        if target.lower().endswith('.exe'):
-                            if os.path.basename(target).lower() not in blocklist:
-                                yield {'name': os.path.splitext(f)[0], 'path': target, 'root': root,
-                                       'type': 'start_menu'}
-                    except:
-                        pass
+        lnk_files = [(root, f) for root, _, files in os.walk(p) for f in files if f.lower().endswith('.lnk')]
+        # 纯 Python 解析 .lnk (线程池并行)，替代逐个 WScript.Shell COM 调用
+        targets = read_lnk_targets(os.path.join(root, f) for root, f in lnk_files)
+        for (root, f), target in zip(lnk_files, targets):
+            if target and target.lower().endswith('.exe'):
+                if ntpath.basename(target).lower() not in blocklist:  # .lnk 中的目标总是 Windows 路径
+                    yield {'name': os.path.splitext(f)[0], 'path': target, 'root': root,
+                           'type': 'start_menu'}
 
 
 def scan_uwp_apps(blocklist):
     try:
+        import win32com.client
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()  # 在独立的扫描线程中运行，COM 需要按线程初始化
+        except ImportError:
+            pass
         shell = win32com.client.Dispatch("Shell.Application")
         apps = shell.NameSpace("shell:AppsFolder")
         if apps:
@@ -64,38 +86,68 @@ def scan_uwp_apps(blocklist):
 
 
 def smart_rank_executables(program_name, exe_paths, root_path):
-    tokens = [t.lower() for t in re.split(r'[_\-\s\.]+', program_name) if len(t) > 1 and not t.isdigit()]
-    clean_name = re.sub(r'[_\-\s\d\.]+', '', program_name.lower())
-    scored_list = []
-    for path in exe_paths:
-        score = 0
-        filename = os.path.basename(path).lower()
-        name_no_ext = os.path.splitext(filename)[0]
-        for token in tokens:
-            if token == name_no_ext:
-                score += 150
-            elif token in name_no_ext:
-                score += 80
-        if name_no_ext == clean_name:
-            score += 100
-        elif clean_name in name_no_ext:
-            score += 50
-        if name_no_ext in ['launcher', 'main', 'start', 'app', 'run']: score += 20
-        if '64' in name_no_ext: score += 10
-        if filename.endswith('.exe'): score += 5
-        rel_path = os.path.relpath(path, root_path)
-        score -= (rel_path.count(os.path.sep) * 15)
-        neg = ['helper', 'console', 'server', 'agent', 'service', 'tool', 'crash', 'update', 'handler', 'uninstall',
-               'eula', 'reporter']
-        for kw in neg:
-            if kw in name_no_ext: score -= 100
-        scored_list.append((score, path))
-    scored_list.sort(key=lambda x: x[0], reverse=True)
-    return [x[1] for x in scored_list]
+    """按得分降序排列候选 exe (默认评分规则，见 core_rank.RankScorer)"""
+    return default_scorer().rank(program_name, exe_paths, root_path)
+
+
+def split_roots(custom_path):
+    """
+    自定义扫描目录列表：接受 ; 分隔的字符串或路径列表
+    去掉重复的目录与已被其他目录包含的子目录 (否则会被扫描两遍)，保持原顺序
+    """
+    parts = custom_path.split(';') if isinstance(custom_path, str) else list(custom_path or ())
+    roots, keys = [], []
+    for p in parts:
+        p = p.strip()
+        if not p: continue
+        key = os.path.normcase(os.path.abspath(p)).rstrip('\\/') + os.sep
+        if key in keys: continue
+        roots.append(p)
+        keys.append(key)
+    return [r for r, k in zip(roots, keys) if not any(k != o and k.startswith(o) for o in keys)]
+
+
+def _merge_in_order(streams, stop):
+    """
+    并发运行多个结果流 (每个流一个线程)，按 streams 的顺序输出：
+    当前流的结果即时输出，后面的流同时在后台扫描、结果先暂存，轮到时直接输出。
+    输出顺序与逐个扫描完全相同 (跨来源去重依赖这个顺序)，总耗时约等于最慢的一个流。
+    stream(stop) 返回结果生成器；调用方提前关闭本生成器时通知所有流停止。
+    """
+    if len(streams) == 1:
+        yield from streams[0](stop)
+        return
+    closed = threading.Event()
+    halt = lambda: closed.is_set() or stop()
+    queues = [queue.SimpleQueue() for _ in streams]
+
+    def run(stream, q):
+        try:
+            for item in stream(halt): q.put(('item', item))
+        except Exception as e:
+            q.put(('error', e))
+        q.put(('end', None))
+
+    for stream, q in zip(streams, queues):
+        threading.Thread(target=run, args=(stream, q), daemon=True).start()
+    try:
+        for q in queues:
+            while True:
+                kind, value = q.get()
+                if kind == 'end': break
+                if kind == 'error': raise value
+                if stop(): return  # 已停止时不再输出暂存的结果
+                yield value
+    finally:
+        closed.set()
 
 
 # --- 主生成器 (Beta 9.8) ---
 def discover_programs_generator(sources, custom_path, blocklist, ignored_dirs, check_stop_callback=None):
+    """
+    custom_path 可以是多个目录 (; 分隔的字符串或列表)
+    开始菜单、UWP 与每个自定义目录各在一个线程中并发扫描，结果按 开始菜单 -> UWP -> 各目录 的顺序合并输出
+    """
     conf = load_config()
     rules = conf['Rules']
 
@@ -114,6 +166,16 @@ def discover_programs_generator(sources, custom_path, blocklist, ignored_dirs, c
     filter_bad_path = rules.getboolean('enable_bad_path', True)  # 新增配置项
     bad_path_kws, _ = load_bad_path_keywords()
 
+    # 评分规则 (rank_weights.ini) 每次扫描编译一次
+    rank_rules, _ = load_rank_rules()
+    scorer = RankScorer(**rank_rules)
+
+    scan_threads = rules.getint('scan_threads', 0)  # 0 = 自动
+    incremental = rules.getboolean('enable_incremental_scan', True)
+    # 多进程排序只在智能识别开启时有意义
+    use_pool = enable_smart_root and 'custom' in sources and rules.getboolean('enable_process_rank', False)
+    pool = RankPool(rules.getint('rank_processes', 0)) if use_pool else None
+
     seen_names = {}
     source_priority = {'custom': 3, 'uwp': 2, 'start_menu': 1}
 
@@ -125,84 +187,166 @@ def discover_programs_generator(sources, custom_path, blocklist, ignored_dirs, c
             seen_names[key] = prio
         yield item
 
-    if 'start_menu' in sources:
-        for item in scan_start_menu(blocklist):
-            if check_stop_callback and check_stop_callback(): return
-            res = {'name': item['name'], 'root_path': item['root'], 'all_exes': [], 'selected_exes': (item['path'],),
+    blocked = RuleSet(blocklist)  # 开始菜单 / UWP 按文件名过滤，同样支持通配符与 re: 规则
+
+    def start_menu_stream(stop):
+        for item in scan_start_menu(blocked):
+            if stop(): return
+            yield {'name': item['name'], 'root_path': item['root'], 'all_exes': [], 'selected_exes': (item['path'],),
                    'type': 'start_menu'}
-            yield from process_and_yield(res)
 
-    if 'uwp' in sources:
-        for item in scan_uwp_apps(blocklist):
-            if check_stop_callback and check_stop_callback(): return
-            res = {'name': item['name'], 'root_path': "UWP / System", 'all_exes': [], 'selected_exes': (item['path'],),
+    def uwp_stream(stop):
+        for item in scan_uwp_apps(blocked):
+            if stop(): return
+            yield {'name': item['name'], 'root_path': "UWP / System", 'all_exes': [], 'selected_exes': (item['path'],),
                    'type': 'uwp'}
-            yield from process_and_yield(res)
 
-    if 'custom' in sources and custom_path and os.path.exists(custom_path):
-        ignored_lower = {d.lower() for d in ignored_dirs}
+    ignored_lower = {normalize_rule(d) for d in ignored_dirs}
+    # 规则在扫描开始时编译一次，所有目录的遍历线程共享
+    compiled = CompiledRules(exts, blocklist, prog_runtimes if filter_prog else (), ignored_lower,
+                             bad_path_kws if filter_bad_path else (), detect_junk=filter_bad_path)
+    rules_sig = _rules_signature(exts, blocklist, filter_prog, prog_runtimes, ignored_lower,
+                                 filter_bad_path, bad_path_kws, scorer.signature())
 
-        for root, dirs, files in os.walk(custom_path, topdown=True):
-            if check_stop_callback and check_stop_callback(): return
+    def custom_stream(custom_path, stop):
+        # 增量扫描：目录 mtime 未变时直接复用上次的候选文件与排序结果
+        dir_index = load_dir_index(custom_path, rules_sig) if incremental else None
+        new_records = []
+        visited = set()
+        completed = False
 
+        # 并行遍历 (os.scandir + work-stealing)，剪枝语义与原 os.walk 一致
+        walker = ParallelWalker(
+            workers=scan_threads,
             # 【Beta 9.8】 动态判断垃圾目录
-            if filter_bad_path and is_junk_path(root, bad_path_kws):
-                dirs[:] = []
-                continue
-
-            dirs[:] = [d for d in dirs if d.lower() not in ignored_lower and not d.startswith('.')]
-
-            current_exes = []
-            for file in files:
-                is_target = False
-                for ext in exts:
-                    if file.lower().endswith(ext): is_target = True; break
-                if not is_target: continue
-                if file.lower() in blocklist: continue
-
-                # 【Beta 9.8】 动态判断编程环境
-                if filter_prog and file.lower() in prog_runtimes: continue
-
-                try:
-                    full = os.path.join(root, file)
-                    sz = os.path.getsize(full)
-                    if use_size and (sz < min_kb or size > max_mb): continue
-
-                    if not enable_smart_root:
-                        res = {
-                            'name': os.path.splitext(file)[0],
-                            'root_path': root,
-                            'all_exes': [],
-                            'selected_exes': (full,),
-                            'type': 'custom'
-                        }
-                        yield from process_and_yield(res)
-                    else:
-                        current_exes.append((full, file, sz))
-                except:
-                    pass
+            skip_dir=compiled.skip_dir if compiled.filters_dirs else None,
+            prune_dir=compiled.prune_dir,
+            match_file=compiled.match_file,
+            check_stop_callback=stop,
+            dir_index=dir_index
+        )
 
+        def prepare(visit):
+            # 目录记录: [visit, 全部候选, 大小过滤后的候选, 程序名 (不需要排序时为 None), 排序结果]
+            if visit.cached is not None:
+                _, _, all_exes, ranked = visit.cached
+            else:
+                all_exes = []
+                for entry in visit.files:
+                    try:
+                        # 复用 DirEntry 的 stat 缓存 (Windows 下遍历时已带回，无需额外系统调用)
+                        all_exes.append((entry.path, entry.name, entry.stat().st_size))
+                    except OSError:
+                        pass
+                ranked = None
+            # 大小过滤放在缓存之后，这样修改大小阈值不会使索引失效
+            current_exes = [x for x in all_exes if not use_size or min_kb <= x[2] <= max_mb]
+            program_name = None
             if enable_smart_root and current_exes:
-                folder_name = os.path.basename(root)
+                folder_name = os.path.basename(visit.path)
                 if folder_name.lower() == 'bin':
-                    program_name = os.path.basename(os.path.dirname(root))
+                    program_name = os.path.basename(os.path.dirname(visit.path))
                 else:
                     program_name = folder_name
+            return [visit, all_exes, current_exes, program_name, ranked]
+
+        def emit(rec, fresh_rank):
+            visit, all_exes, current_exes, program_name, ranked = rec
+            root = visit.path
+            if not enable_smart_root:
+                for full, file, sz in current_exes:
+                    res = {
+                        'name': os.path.splitext(file)[0],
+                        'root_path': root,
+                        'all_exes': [],
+                        'selected_exes': (full,),
+                        'type': 'custom'
+                    }
+                    yield res
 
-                exe_paths = [x[0] for x in current_exes]
-                ranked = smart_rank_executables(program_name, exe_paths, root)
-                details = []
-                for p in ranked:
-                    s = 0
-                    for x in current_exes:
-                        if x[0] == p: s = x[2]; break
-                    details.append((p, os.path.basename(p), s, os.path.relpath(p, custom_path)))
+            elif current_exes:
+                sizes = {x[0]: x[2] for x in current_exes}
+                shown = [p for p in ranked if p in sizes] if use_size else ranked
+                details = [(p, os.path.basename(p), sizes[p], os.path.relpath(p, custom_path)) for p in shown]
 
                 res = {
                     'name': program_name,
                     'root_path': root,
                     'all_exes': details,
-                    'selected_exes': tuple([ranked[0]]) if ranked else (),
+                    'selected_exes': tuple([shown[0]]) if shown else (),
                     'type': 'custom'
                 }
-                yield from process_and_yield(res)
\ No newline at end of file
+                yield res
+
+            if dir_index is not None:
+                visited.add(root)
+                if visit.cached is None or fresh_rank:
+                    new_records.append((root, visit.mtime, visit.subdirs, all_exes, ranked))
+
+        def rank_here(rec):
+            # 对全部候选排序后再按大小过滤，结果与只对过滤后的子集排序一致 (稳定排序)
+            rec[4] = scorer.rank(rec[3], [x[0] for x in rec[1]], rec[0].path)
+
+        def finish(future, batch):
+            # 按提交顺序输出一批目录；进程池出错或已关闭 (future 为 None) 时退回本进程排序
+            orders = None
+            if future is not None:
+                try:
+                    orders = wait_result(future, stop)
+                except Exception as e:
+                    print(f"Rank Error: {e}")
+                if stop(): return
+            orders = iter(orders) if orders is not None else None
+            for rec, need_rank in batch:
+                if need_rank:
+                    if orders is not None:
+                        paths = [x[0] for x in rec[1]]
+                        rec[4] = [paths[i] for i in next(orders)]
+                    else:
+                        rank_here(rec)
+                yield from emit(rec, need_rank)
+
+        pending = deque()  # 已提交的批次 [(future 或 None, [(目录记录, 是否需要排序)])]
+        batch, jobs, job_exes = [], [], 0
+        try:
+            for visit in walker.walk(custom_path):
+                rec = prepare(visit)
+                need_rank = rec[3] is not None and rec[4] is None
+                if pool is None:
+                    if need_rank: rank_here(rec)
+                    yield from emit(rec, need_rank)
+                    continue
+
+                batch.append((rec, need_rank))
+                if need_rank:
+                    jobs.append((rec[3], [x[0] for x in rec[1]], visit.path))
+                    job_exes += len(rec[1])
+                if len(batch) >= RANK_BATCH_DIRS or job_exes >= RANK_BATCH_EXES:
+                    pending.append((pool.submit(jobs, rank_rules) if jobs else None, batch))
+                    batch, jobs, job_exes = [], [], 0
+                # 已完成的批次立即输出；积压过多时等待最早的一批
+                while pending and (pending[0][0] is None or pending[0][0].done() or len(pending) > pool.max_pending):
+                    yield from finish(*pending.popleft())
+            # 已停止时不再提交最后一批 (进程池可能已被关闭)
+            if batch and not stop(): pending.append((pool.submit(jobs, rank_rules) if jobs else None, batch))
+            while pending and not stop():
+                yield from finish(*pending.popleft())
+            completed = not stop()
+        finally:
+            if dir_index is not None:
+                # 只有完整扫描才清理已消失的目录；中途停止时只保存已访问的部分
+                stale = [p for p in dir_index if p not in visited] if completed else []
+                save_dir_index(new_records, rules_sig, stale)
+
+    streams = []
+    if 'start_menu' in sources: streams.append(start_menu_stream)
+    if 'uwp' in sources: streams.append(uwp_stream)
+    if 'custom' in sources:
+        streams.extend(lambda stop, p=p: custom_stream(p, stop) for p in split_roots(custom_path) if os.path.exists(p))
+    if not streams: return
+    stop = check_stop_callback or (lambda: False)
+    try:
+        for res in _merge_in_order(streams, stop):
+            yield from process_and_yield(res)
+    finally:
+        if pool is not None: pool.shutdown()
@@ -0,0 +1,47 @@
+import math
+import time
+
+# --- 常用度 (frecency) ---
+# 每次启动贡献 exp(-λ·(now - t))，λ 由半衰期决定，常用度为所有启动贡献之和。
+# 直接存这个和会随时间变化；改存 log(Σ exp(λ·t_i))：now 只是公共因子 exp(-λ·now)，
+# 所以存下的值可以直接比较、排序，且不随时间改变，新的一次启动只需要一次 logaddexp。
+
+HALF_LIFE_DAYS = 14
+DECAY = math.log(2) / (HALF_LIFE_DAYS * 86400)  # λ (1/秒)
+
+
+def launch_score(ts):
+    """一次启动 (unix 时间 ts) 的对数得分"""
+    return DECAY * ts
+
+
+def logaddexp(a, b):
+    """log(exp(a) + exp(b))，None 视为没有任何启动"""
+    if a is None: return b
+    if b is None: return a
+    hi, lo = (a, b) if a >= b else (b, a)
+    return hi + math.log1p(math.exp(lo - hi))
+
+
+def add_launch(score, ts=None):
+    """在已有的对数得分上累加一次启动"""
+    return logaddexp(score, launch_score(time.time() if ts is None else ts))
+
+
+def combine_launches(times):
+    """多次启动 (unix 时间列表) 合并成一个对数得分，用于批量累加"""
+    score = None
+    for ts in times: score = logaddexp(score, launch_score(ts))
+    return score
+
+
+def seed_score(run_count, ts):
+    """只有启动次数、没有启动时间的旧数据：按 run_count 次都发生在 ts 估算"""
+    if not run_count or run_count <= 0: return None
+    return launch_score(ts) + math.log(run_count)
+
+
+def current_value(score, now=None):
+    """对数得分换算成当前时刻的常用度 (约等于 "相当于几次刚刚发生的启动")，用于显示"""
+    if score is None: return 0.0
+    return math.exp(score - launch_score(time.time() if now is None else now))
@@ -0,0 +1,115 @@
+import os
+import re
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 可选：没有时用纯 Python 计算加权和，结果相同
+    np = None
+
+from .const import DEFAULT_RANK_WEIGHTS, RANK_LAUNCHER_NAMES, RANK_NEGATIVE_KEYWORDS
+
+# --- 智能识别评分 ---
+# 候选 exe 的得分 = 特征向量 · 权重向量，特征见 FEATURES (与 DEFAULT_RANK_WEIGHTS 同序)。
+# 规则 (负面关键词正则、入口名称集合、权重向量) 在 RankScorer 创建时编译一次；
+# rank_many() 把一批目录的全部候选拼成一个特征矩阵，一次矩阵乘法得到所有得分。
+# 默认权重下的得分与原先逐项累加的结果完全相同，排序同样是稳定的降序。
+
+FEATURES = tuple(DEFAULT_RANK_WEIGHTS)
+
+_TOKEN_SPLIT = re.compile(r'[_\-\s\.]+').split
+_CLEAN_SUB = re.compile(r'[_\-\s\d\.]+').sub
+
+
+def program_tokens(program_name):
+    """程序名拆出的单词 (小写，去掉单字符与纯数字) 与去掉分隔符、数字后的名称"""
+    tokens = [t.lower() for t in _TOKEN_SPLIT(program_name) if len(t) > 1 and not t.isdigit()]
+    return tokens, _CLEAN_SUB('', program_name.lower())
+
+
+def path_depth(path, root_path):
+    """相对 root_path 的目录层数，与 os.path.relpath(path, root_path).count(os.sep) 相同"""
+    # 常见情况 (root_path 下的直接文件) 不必走 relpath 的完整规范化
+    prefix = root_path.rstrip(os.sep) + os.sep
+    if root_path and path.startswith(prefix):
+        rest = path[len(prefix):]
+        if rest not in ('', '.', '..') and os.sep not in rest and not (os.altsep and os.altsep in rest):
+            return 0
+    return os.path.relpath(path, root_path).count(os.sep)
+
+
+class RankScorer:
+    """
+    可执行文件评分器 (只读，可在线程间共享)
+    weights 中缺少的项使用默认值；negative_keywords / launcher_names 为 None 时使用默认列表
+    """
+
+    def __init__(self, weights=None, negative_keywords=None, launcher_names=None):
+        self.weights = dict(DEFAULT_RANK_WEIGHTS)
+        if weights: self.weights.update((k, v) for k, v in weights.items() if k in self.weights)
+        if negative_keywords is None: negative_keywords = RANK_NEGATIVE_KEYWORDS
+        if launcher_names is None: launcher_names = RANK_LAUNCHER_NAMES
+        self.negative_keywords = tuple(dict.fromkeys(k.lower() for k in negative_keywords if k))
+        self.launcher_names = frozenset(n.lower() for n in launcher_names)
+        self._vector = [self.weights[f] for f in FEATURES]
+        self._np_vector = np.array(self._vector) if np is not None else None
+        # 大多数文件名不含任何负面关键词：先用合并的正则判断一次，命中时才逐个计数
+        self._negative_search = (re.compile('|'.join(map(re.escape, self.negative_keywords))).search
+                                 if self.negative_keywords else None)
+
+    def signature(self):
+        """评分规则指纹的组成部分 (规则变化后目录索引中缓存的排序结果需要失效)"""
+        return repr((sorted(self.weights.items()), sorted(self.negative_keywords), sorted(self.launcher_names)))
+
+    def features(self, tokens, clean_name, path, root_path):
+        filename = os.path.basename(path).lower()
+        name = os.path.splitext(filename)[0]
+        exact = partial = 0
+        for token in tokens:
+            if token == name:
+                exact += 1
+            elif token in name:
+                partial += 1
+        name_exact = name == clean_name
+        negative = 0
+        if self._negative_search is not None and self._negative_search(name):
+            negative = sum(kw in name for kw in self.negative_keywords)
+        return (exact, partial, name_exact, not name_exact and clean_name in name, name in self.launcher_names,
+                '64' in name, filename.endswith('.exe'), path_depth(path, root_path), negative)
+
+    def scores(self, rows):
+        """特征矩阵 (每行一个候选) 乘权重向量"""
+        if not rows: return []
+        if self._np_vector is not None:
+            return (np.array(rows, dtype=self._np_vector.dtype) @ self._np_vector).tolist()
+        vector = self._vector
+        return [sum(f * w for f, w in zip(row, vector)) for row in rows]
+
+    def rank_indices(self, jobs):
+        """
+        jobs = [(program_name, exe_paths, root_path)]，所有目录的候选一起计算
+        返回每个 job 按得分降序 (同分保持原顺序) 排列的下标元组
+        """
+        rows, bounds = [], []
+        for program_name, paths, root_path in jobs:
+            tokens, clean_name = program_tokens(program_name)
+            start = len(rows)
+            rows.extend(self.features(tokens, clean_name, p, root_path) for p in paths)
+            bounds.append((start, len(rows)))
+        scores = self.scores(rows)
+        return [tuple(sorted(range(b - a), key=scores[a:b].__getitem__, reverse=True)) for a, b in bounds]
+
+    def rank_many(self, jobs):
+        return [[paths[i] for i in order] for (_, paths, _), order in zip(jobs, self.rank_indices(jobs))]
+
+    def rank(self, program_name, exe_paths, root_path):
+        return self.rank_many([(program_name, exe_paths, root_path)])[0]
+
+
+_default = None
+
+
+def default_scorer():
+    """使用内置默认规则的评分器"""
+    global _default
+    if _default is None: _default = RankScorer()
+    return _default
@@ -0,0 +1,66 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+# --- 多进程排序 (可选) ---
+# 每个目录的评分排序是纯 Python 的 CPU 计算 (正则拆分、relpath、关键词匹配)，
+# 可执行文件很多的大目录树上会成为瓶颈，而遍历线程受 GIL 限制无法并行计算。
+# 开启后扫描线程把目录按批提交到进程池排序，子进程只回传排序后的下标元组 (pickle 体积小)，
+# 扫描线程按提交顺序取回结果，输出顺序与单进程完全一致。
+# 子进程以 spawn 方式启动 (Windows 默认)，主程序入口需调用 multiprocessing.freeze_support()。
+
+RANK_BATCH_DIRS = 64  # 每批最多目录数
+RANK_BATCH_EXES = 2000  # 每批最多可执行文件数
+POLL_INTERVAL = 0.1  # 等待结果时检查停止请求的间隔 (秒)
+
+_scorers = {}  # 子进程内按规则缓存的评分器
+
+
+def rank_jobs(jobs, rank_rules=None):
+    """
+    子进程中执行：jobs = [(program_name, exe_paths, root_path)]，rank_rules 为 RankScorer 的参数
+    整批一次算出全部得分，返回每个 job 排序后的下标元组 (exe_paths 中的位置)，而不是路径字符串
+    """
+    from .core_rank import RankScorer, default_scorer
+    if rank_rules is None: return default_scorer().rank_indices(jobs)
+    key = repr(sorted(rank_rules.items()))
+    scorer = _scorers.get(key)
+    if scorer is None: scorer = _scorers[key] = RankScorer(**rank_rules)
+    return scorer.rank_indices(jobs)
+
+
+class RankPool:
+    """
+    进程池 (第一次提交时才启动子进程)，可被多个扫描线程共享
+    shutdown() 之后不再接受提交：submit 返回 None，调用方在本进程排序，不会再启动新的子进程
+    """
+
+    def __init__(self, workers=0):
+        self.workers = workers if workers and workers > 0 else max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = self.workers * 2  # 每个扫描线程最多积压的批次
+        self._executor = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, jobs, rank_rules=None):
+        with self._lock:
+            if self._closed: return None
+            if self._executor is None: self._executor = ProcessPoolExecutor(self.workers)
+            return self._executor.submit(rank_jobs, jobs, rank_rules)
+
+    def shutdown(self):
+        """取消尚未开始的批次并关闭进程池 (不等待正在执行的批次)"""
+        with self._lock:
+            self._closed = True
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def wait_result(future, stop):
+    """等待一批排序结果；期间 stop() 为真时返回 None"""
+    while True:
+        try:
+            return future.result(timeout=POLL_INTERVAL)
+        except FutureTimeout:
+            if stop(): return None
@@ -0,0 +1,205 @@
+import os
+import re
+import fnmatch
+
+# --- 预编译扫描规则 ---
+# 扫描时每个文件、每个目录都要过一遍规则；这里在扫描开始时把规则整理成一次就能判定的形式：
+# - 扩展名：元组交给 str.endswith (C 层逐个比较，不再有 Python 循环)
+# - 文件名黑名单 + 编程环境：合并成一个集合
+# - 忽略目录：集合
+# - 路径关键词：按公共前缀合并成一个正则 (相当于 Aho-Corasick 的字典树)，一次 search 判定全部关键词
+#
+# 黑名单 / 编程环境 / 黑洞目录的每一行可以是:
+#   unins000.exe          字面量 (忽略大小写)，集合查找
+#   unins*.exe            通配符 (* ? [...])，匹配完整名称
+#   re:^unins\d+\.exe$     正则 (忽略大小写，search 语义)，re: 之后的部分保持原样不转小写
+# 黑洞目录中含 / 的规则按完整路径匹配 (路径统一转成小写、/ 分隔)，例如 */steamapps/common/*/_commonredist
+# 所有通配符与正则合并成一个正则，规则再多每次判定也只有一次集合查找 + 一次 search
+
+_HAS_DIGIT = re.compile(r'\d').search
+_HAS_ALPHA = re.compile(r'[a-z]').search
+
+
+def keyword_pattern(words):
+    """
+    把关键词集合编译成按前缀合并的正则，例如 {release, redist, runtime} -> r(?:e(?:dist|lease)|untime)
+    匹配结果与 any(w in text for w in words) 一致；没有关键词时返回 None
+    """
+    trie = {}
+    for w in words:
+        if not w: continue
+        node = trie
+        for ch in w: node = node.setdefault(ch, {})
+        node[''] = {}  # 词尾标记
+    if not trie: return None
+
+    def build(node):
+        end = '' in node
+        alts = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts: return ''
+        body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+        # 已经是完整的关键词时后续部分可有可无 (只需判断是否出现，取最短匹配即可)
+        return '(?:' + body + ')?' if end else body
+
+    return re.compile(build(trie))
+
+
+REGEX_PREFIX = 're:'
+_GLOB_CHARS = frozenset('*?[')
+
+
+def normalize_rule(rule):
+    """规则行的规范形式：去掉首尾空白，re: 规则保持原样，其余转小写"""
+    rule = rule.strip()
+    return rule if rule.startswith(REGEX_PREFIX) else rule.lower()
+
+
+def is_path_rule(rule):
+    """黑洞目录规则是否按完整路径匹配"""
+    return '/' in rule if rule.startswith(REGEX_PREFIX) else '/' in rule.replace('\\', '/')
+
+
+def path_rule(rule):
+    """
+    路径规则的规范形式，与 skip_dir 中被检查的路径一致：小写、/ 分隔、去掉结尾的 /
+    例如 C:\\Windows\\Temp\\ -> c:/windows/temp；re: 规则保持原样
+    """
+    rule = normalize_rule(rule)
+    if rule.startswith(REGEX_PREFIX): return rule
+    return rule.replace('\\', '/').rstrip('/') or '/'
+
+
+class RuleSet:
+    """
+    字面量 + 通配符 + re: 正则组成的规则集合，name in rules 判断 (已小写的) 名称是否命中
+    可以直接替代原来的小写字符串集合传给 scan_start_menu 等函数
+    - 字面量：集合查找
+    - 通配符与以 ^ 开头的正则：按开头的字面量前缀分桶，每个桶合并成一个正则；
+      判定时只取名称的几个前缀长度查桶，规则数量再多也只需测试前缀相同的少数几条
+    - 其余正则 (不以 ^ 开头，可能出现在任意位置)：合并成一个正则做 search
+    """
+    __slots__ = ('literals', 'patterns', '_buckets', '_lengths', '_search')
+
+    def __init__(self, rules=()):
+        literals, patterns = set(), []
+        anchored = {}  # 字面量前缀 -> [只在开头匹配的正则]
+        floating = []
+        for rule in rules:
+            rule = normalize_rule(rule)
+            if not rule: continue
+            if rule.startswith(REGEX_PREFIX):
+                pattern = rule[len(REGEX_PREFIX):]
+                prefix = _regex_prefix(pattern)
+            elif _GLOB_CHARS.intersection(rule):
+                glob = rule.replace('\\', '/')
+                pattern = fnmatch.translate(glob)
+                prefix = glob[:min(glob.find(ch) % (len(glob) + 1) for ch in _GLOB_CHARS)]
+            else:
+                literals.add(rule)
+                continue
+            try:
+                re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                print(f"Rule Error: {rule}: {e}")
+                continue
+            patterns.append(pattern)
+            if prefix is None:
+                floating.append(pattern)
+            else:
+                anchored.setdefault(prefix, []).append(pattern)
+        self.literals = frozenset(literals)
+        self.patterns = tuple(patterns)
+        self._buckets = {prefix: _combine(group, 'match') for prefix, group in anchored.items()}
+        self._lengths = tuple(sorted({len(prefix) for prefix in anchored}))
+        self._search = _combine(floating, 'search')
+
+    def __contains__(self, name):
+        if name in self.literals: return True
+        if self._lengths:
+            buckets = self._buckets
+            for n in self._lengths:
+                if n > len(name): break
+                match = buckets.get(name[:n])
+                if match is not None and match(name) is not None: return True
+        return self._search is not None and self._search(name) is not None
+
+    def __bool__(self):
+        return bool(self.literals or self.patterns)
+
+
+_REGEX_META = frozenset('\\.^$*+?{}[]|()')
+
+
+def _regex_prefix(pattern):
+    """以 ^ 开头的正则开头的字面量 (小写)；无法确定 (不以 ^ 开头或含 |) 时返回 None"""
+    if not pattern.startswith('^') or '|' in pattern: return None
+    i = 1
+    while i < len(pattern) and pattern[i] not in _REGEX_META: i += 1
+    # 紧跟量词时最后一个字符可有可无，不能算进前缀
+    if i < len(pattern) and pattern[i] in '*?{': i -= 1
+    return pattern[1:max(i, 1)].lower()
+
+
+def _combine(patterns, mode):
+    """把多个正则合并成一个 match / search；含反向引用等无法合并的写法时退回逐个匹配"""
+    if not patterns: return None
+    try:
+        return getattr(re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE), mode)
+    except re.error:
+        compiled = [getattr(re.compile(p, re.IGNORECASE), mode) for p in patterns]
+        return lambda text: next((m for m in (f(text) for f in compiled) if m), None)
+
+
+class CompiledRules:
+    """
+    一次扫描使用的预编译规则 (只读，可在多个遍历线程间共享)
+    match_file(文件名) / prune_dir(目录名) / skip_dir(目录路径) 可直接作为 ParallelWalker 的回调
+    detect_junk=False 时 skip_dir 只检查路径规则，不做垃圾目录判断
+    """
+    __slots__ = ('exts', 'excluded_files', 'ignored_dirs', 'ignored_paths', 'bad_keywords', 'detect_junk',
+                 '_bad_search')
+
+    def __init__(self, exts=('.exe',), blocklist=(), prog_runtimes=(), ignored_dirs=(), bad_keywords=(),
+                 detect_junk=True):
+        # 与原逻辑一致：扩展名为空串时匹配所有文件
+        self.exts = tuple(dict.fromkeys(e.strip().lower() for e in exts))
+        self.excluded_files = RuleSet(list(blocklist) + list(prog_runtimes))
+        ignored = [normalize_rule(d) for d in ignored_dirs]
+        self.ignored_dirs = RuleSet(d for d in ignored if not is_path_rule(d))
+        self.ignored_paths = RuleSet(path_rule(d) for d in ignored if is_path_rule(d))
+        self.detect_junk = detect_junk
+        self.bad_keywords = frozenset(k.lower() for k in bad_keywords)
+        pattern = keyword_pattern(self.bad_keywords)
+        self._bad_search = pattern.search if pattern is not None else None
+
+    def match_file(self, name):
+        """是否为候选文件 (扩展名匹配且不在黑名单 / 编程环境中)"""
+        f = name.lower()
+        if not f.endswith(self.exts): return False
+        rules = self.excluded_files
+        return f not in rules.literals and (not rules.patterns or f not in rules)
+
+    def prune_dir(self, name):
+        """是否跳过该子目录 (忽略目录或隐藏目录)"""
+        if name.startswith('.'): return True
+        d = name.lower()
+        rules = self.ignored_dirs
+        return d in rules.literals or (bool(rules.patterns) and d in rules)
+
+    @property
+    def filters_dirs(self):
+        """skip_dir 是否可能返回 True (否则遍历时不必调用)"""
+        return self.detect_junk or bool(self.ignored_paths)
+
+    def skip_dir(self, path):
+        """整个目录 (含子树) 是否跳过：命中黑洞目录的路径规则，或是垃圾目录"""
+        if self.ignored_paths and path.lower().replace('\\', '/') in self.ignored_paths: return True
+        return self.detect_junk and self.is_junk_dir(path)
+
+    def is_junk_dir(self, path):
+        """组件 / 缓存 / 运行时目录，或哈希命名的目录"""
+        path_lower = path.lower()
+        if self._bad_search is not None and self._bad_search(path_lower): return True
+        folder_name = os.path.basename(path_lower)
+        return (len(folder_name) > 20 and ' ' not in folder_name
+                and _HAS_DIGIT(folder_name) is not None and _HAS_ALPHA(folder_name) is not None)
@@ -0,0 +1,245 @@
+import re
+import bisect
+import heapq
+from collections import defaultdict
+
+# --- 启动台搜索索引 ---
+# 每个条目生成若干检索键 (名称、单词、单词首字母、拼音首字母、exe 文件名)，全部放入一个有序数组，
+# 前缀查询只需两次二分；3 个字符以上的查询再用三元组 (trigram) 倒排表做子串 / 模糊匹配。
+# 增删改都是按条目增量更新，不需要重建。
+
+# 排名档位 (越小越靠前)
+TIER_EXACT = 0  # 名称完全相同
+TIER_NAME_PREFIX = 1  # 名称前缀
+TIER_KEY_PREFIX = 2  # 单词 / 首字母 / 拼音首字母 / 文件名前缀
+TIER_SUBSTRING = 3  # 名称或文件名中包含查询串
+TIER_FUZZY = 4  # 三元组重合度达到 FUZZY_THRESHOLD
+FUZZY_THRESHOLD = 0.5
+FUZZY_MIN_RESULTS = 20  # 精确 / 前缀 / 子串结果少于这么多时才做模糊匹配
+
+_MAX_CHAR = '\U0010ffff'
+_EMPTY = frozenset()
+
+_WORD_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[一-鿿]+')
+_CJK_RE = re.compile(r'[一-鿿]')
+
+# GB2312 一级汉字按拼音排序，各声母首字的区位码 (GBK 编码 - 65536)
+_PINYIN_BOUNDS = (
+    (-20319, 'a'), (-20283, 'b'), (-19775, 'c'), (-19218, 'd'), (-18710, 'e'), (-18526, 'f'),
+    (-18239, 'g'), (-17922, 'h'), (-17417, 'j'), (-16474, 'k'), (-16212, 'l'), (-15640, 'm'),
+    (-15165, 'n'), (-14922, 'o'), (-14914, 'p'), (-14630, 'q'), (-14149, 'r'), (-14090, 's'),
+    (-13318, 't'), (-12838, 'w'), (-12556, 'x'), (-11847, 'y'), (-11055, 'z'),
+)
+_PINYIN_CODES = [c for c, _ in _PINYIN_BOUNDS]
+_PINYIN_LAST = -10247
+
+
+def pinyin_initial(ch):
+    """汉字的拼音首字母 (仅 GB2312 一级汉字，其余返回空串)"""
+    try:
+        b = ch.encode('gb2312')
+    except UnicodeEncodeError:
+        return ''
+    if len(b) != 2: return ''
+    code = b[0] * 256 + b[1] - 65536
+    if code < _PINYIN_CODES[0] or code > _PINYIN_LAST: return ''
+    return _PINYIN_BOUNDS[bisect.bisect_right(_PINYIN_CODES, code) - 1][1]
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def exe_basename(exe_path):
+    """exe 文件名 (小写、不含扩展名)；同时接受 / 与 \\ 分隔符"""
+    base = exe_path.replace('\\', '/').rpartition('/')[2]
+    stem, dot, _ = base.rpartition('.')
+    return (stem if dot else base).lower()
+
+
+def search_keys(name, exe_path=''):
+    """
+    条目的检索键 (小写)，第一个总是完整名称
+    "Visual Studio Code", Code.exe -> visual studio code / visual / studio / code / vsc
+    "微信", WeChat.exe              -> 微信 / 信 / wx / wechat
+    """
+    return _keys_for(name, exe_basename(exe_path) if exe_path else '')
+
+
+def _keys_for(name, base):
+    lower = name.lower()
+    keys = [lower]
+    words = _WORD_RE.findall(name)
+    if _CJK_RE.search(name):
+        latin = []
+        for w in words:
+            w = w.lower()
+            keys.append(w)
+            if _CJK_RE.match(w):
+                keys.extend(w[i:] for i in range(1, len(w)))  # 中文没有空格分词，每个后缀都可作为起点
+            else:
+                latin.append(w)
+        initials = ''.join(pinyin_initial(ch) if _CJK_RE.match(ch) else ch for ch in lower if ch.isalnum())
+        if initials: keys.append(initials)
+    else:
+        latin = [w.lower() for w in words]
+        keys.extend(latin)
+    if len(latin) > 1: keys.append(''.join(w[0] for w in latin))
+    if base: keys.append(base)
+    # 去重并保持顺序
+    return list(dict.fromkeys(k for k in keys if k))
+
+
+class SearchIndex:
+    """
+    名称检索索引 (只在单一线程使用)
+    update(sid, name, exe_path) / remove(sid) 增量维护；search(query) 返回按相关度排序的 id 列表
+    查询路径上尽量用切片、集合运算与内置函数完成，避免逐条目的 Python 循环
+    """
+
+    def __init__(self):
+        self._keys = {}  # id -> 检索键列表 (第一个为小写名称)
+        self._texts = {}  # id -> 子串匹配用文本 (名称 + 文件名)
+        self._order = {}  # id -> 同档位内的排序键 (名称长度, 名称, id)
+        self._names = []  # 有序数组 [(小写名称, id)]
+        self._name_ids = []  # 与 _names 对应的 id (切片后直接建集合)
+        self._prefix = []  # 有序数组 [(其余检索键, id)]
+        self._prefix_ids = []
+        self._grams = defaultdict(set)  # 三元组 -> {id}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, sid):
+        return sid in self._keys
+
+    def clear(self):
+        self.__init__()
+
+    def rebuild(self, entries):
+        """entries: [(id, name, exe_path)]，整体重建 (一次排序，比逐条插入快)"""
+        self.clear()
+        for sid, name, exe_path in entries:
+            keys = self._register(sid, name, exe_basename(exe_path) if exe_path else '')
+            self._names.append((keys[0], sid))
+            self._prefix.extend((k, sid) for k in keys[1:])
+        self._names.sort()
+        self._prefix.sort()
+        self._name_ids = [sid for _, sid in self._names]
+        self._prefix_ids = [sid for _, sid in self._prefix]
+
+    def update(self, sid, name, exe_path=''):
+        """新增或更新一个条目"""
+        base = exe_basename(exe_path) if exe_path else ''
+        if self._keys.get(sid) == _keys_for(name, base): return
+        self.remove(sid)
+        keys = self._register(sid, name, base)
+        _insert_sorted(self._names, self._name_ids, (keys[0], sid))
+        for k in keys[1:]: _insert_sorted(self._prefix, self._prefix_ids, (k, sid))
+
+    def remove(self, sid):
+        keys = self._keys.pop(sid, None)
+        if keys is None: return
+        del self._order[sid]
+        _remove_sorted(self._names, self._name_ids, (keys[0], sid))
+        for k in keys[1:]: _remove_sorted(self._prefix, self._prefix_ids, (k, sid))
+        for g in _trigrams(self._texts.pop(sid)):
+            ids = self._grams.get(g)
+            if ids is not None:
+                ids.discard(sid)
+                if not ids: del self._grams[g]
+
+    def _register(self, sid, name, base):
+        keys = _keys_for(name, base)
+        lower = keys[0]
+        self._keys[sid] = keys
+        self._order[sid] = (len(lower), lower, sid)
+        text = lower + '\0' + base if base else lower
+        self._texts[sid] = text
+        grams = self._grams
+        for i in range(len(text) - 2): grams[text[i:i + 3]].add(sid)
+        return keys
+
+    # --- 查询 ---
+    def search(self, query, limit=None):
+        """返回匹配 query 的 id 列表，按 (档位, 名称长度, 名称) 排序；空查询返回空列表"""
+        words = query.lower().split()
+        if not words: return []
+        if len(words) == 1:
+            buckets = self._match(words[0])
+        else:
+            # 多个词：每个词都要命中，档位取各词中最差的那个
+            # cum[t] = 各词档位都 <= t 的条目
+            per_word = [self._match(w) for w in words]
+            buckets, done = [], set()
+            for t in range(len(per_word[0])):
+                cum = set.intersection(*(set().union(*m[:t + 1]) for m in per_word))
+                buckets.append(cum - done)
+                done = cum
+            # 带空格的完整名称前缀 ("visual stu") 提到名称前缀档
+            exact, named = self._name_prefix(' '.join(words))
+            if exact or named:
+                buckets = [b - exact - named for b in buckets]
+                buckets[TIER_EXACT] |= exact
+                buckets[TIER_NAME_PREFIX] |= named
+
+        order = self._order.__getitem__
+        result = []
+        for bucket in buckets:
+            if limit is None:
+                result.extend(sorted(bucket, key=order))
+                continue
+            room = limit - len(result)
+            if room <= 0: break
+            result.extend(heapq.nsmallest(room, bucket, key=order) if len(bucket) > room else sorted(bucket, key=order))
+        return result
+
+    def _name_prefix(self, q):
+        names = self._names
+        i = bisect.bisect_left(names, (q,))
+        end = bisect.bisect_left(names, (q + _MAX_CHAR,), i)
+        hits = set(self._name_ids[i:end])
+        stop = bisect.bisect_left(names, (q + '\0',), i, end)  # 完全相同的名称排在区间最前面
+        exact = set(self._name_ids[i:stop])
+        return exact, hits - exact
+
+    def _match(self, q):
+        """返回各档位的 id 集合 [完全相同, 名称前缀, 检索键前缀, 子串, 模糊]"""
+        exact, named = self._name_prefix(q)
+        prefix = self._prefix
+        i = bisect.bisect_left(prefix, (q,))
+        end = bisect.bisect_left(prefix, (q + _MAX_CHAR,), i)
+        keyed = set(self._prefix_ids[i:end]) - exact - named
+        found = exact | named | keyed
+
+        substr, fuzzy = set(), set()
+        grams = _trigrams(q)
+        if grams:
+            postings = sorted((self._grams.get(g, _EMPTY) for g in grams), key=len)
+            common = postings[0].intersection(*postings[1:]) - found
+            # 含有全部三元组的条目几乎都包含子串，只有 4 个字符以上的查询需要核对
+            if len(q) > 3:
+                texts = self._texts
+                common = {sid for sid in common if q in texts[sid]}
+            substr = common
+            # 精确结果不多时才做模糊匹配 (三元组计数是查询里最慢的部分)
+            if len(found) + len(substr) < FUZZY_MIN_RESULTS:
+                counts = defaultdict(int)
+                for ids in postings:
+                    for sid in ids: counts[sid] += 1
+                need = len(grams) * FUZZY_THRESHOLD
+                fuzzy = {sid for sid, n in counts.items() if n >= need} - found - substr
+        return [exact, named, keyed, substr, fuzzy]
+
+
+def _insert_sorted(items, ids, item):
+    i = bisect.bisect_left(items, item)
+    items.insert(i, item)
+    ids.insert(i, item[1])
+
+
+def _remove_sorted(items, ids, item):
+    i = bisect.bisect_left(items, item)
+    if i < len(items) and items[i] == item:
+        del items[i]
+        del ids[i]
@@ -0,0 +1,71 @@
+import os
+import ntpath
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .utils_lnk import build_lnk
+
+
+def _explorer_path():
+    return ntpath.join(os.environ.get('SystemRoot', r'C:\Windows'), 'explorer.exe')
+
+
+def build_shortcut_bytes(target_path, args=""):
+    """与 utils_system.create_shortcut 相同的字段规则，生成 .lnk 二进制内容"""
+    # UWP 逻辑
+    if "://" not in target_path and ":" not in target_path and "\\" not in target_path and "shell:AppsFolder" in args:
+        explorer = _explorer_path()
+        return build_lnk(explorer, arguments=args, icon_location=explorer, icon_index=0)
+    work_dir = os.path.dirname(target_path) if os.path.exists(target_path) else ''
+    return build_lnk(target_path, working_dir=work_dir, icon_location=target_path, icon_index=0)
+
+
+def write_shortcut(target_path, shortcut_path, args=""):
+    """写入单个快捷方式 (先写同目录下的唯一临时文件再替换，避免留下半个 .lnk)"""
+    tmp_path = None
+    try:
+        data = build_shortcut_bytes(target_path, args)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(shortcut_path) + ".",
+                                        dir=os.path.dirname(shortcut_path) or None)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, shortcut_path)
+        return True, f"成功: {os.path.basename(shortcut_path)}"
+    except Exception as e:
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return False, f"失败: {os.path.basename(shortcut_path)} | {e}"
+
+
+def create_shortcuts_batch(tasks, progress_callback=None, check_stop_callback=None, max_workers=None):
+    """
+    批量生成快捷方式
+    tasks: [(name, exe, lnk_path, args, source_type)]，与 ScanPage.generate 收集的任务格式一致
+    progress_callback(done, total): 每完成一个任务回调一次 (在调用线程中执行)
+    check_stop_callback(): 返回 True 时取消尚未开始的任务
+    返回 [(task, ok, msg)]，按完成顺序排列；被取消的任务不出现在结果中
+    指向同一个 lnk_path 的任务只保留最后一个 (与逐个顺序写入时最终留在磁盘上的文件一致)
+    """
+    latest = {}
+    for t in tasks: latest[os.path.normcase(t[2])] = t
+    tasks = list(latest.values())
+    total = len(tasks)
+    results = []
+    if not tasks: return results
+
+    workers = max_workers or min(16, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(write_shortcut, t[1], t[2], t[3]): t for t in tasks}
+        stopped = False
+        for fut in as_completed(futures):
+            # 取消后仍要收集已在执行中的任务，保证返回值与磁盘上的文件一致
+            if fut.cancelled(): continue
+            ok, msg = fut.result()
+            results.append((futures[fut], ok, msg))
+            if progress_callback: progress_callback(len(results), total)
+            if not stopped and check_stop_callback and check_stop_callback():
+                stopped = True
+                for f in futures: f.cancel()
+    return results
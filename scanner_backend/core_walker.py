@@ -0,0 +1,192 @@
+import os
+import queue
+import random
+import threading
+from collections import deque, namedtuple
+
+_DONE = object()
+
+# 一次目录访问的结果
+#   path:    目录路径
+#   files:   命中 match_file 的 DirEntry 列表 (命中缓存时为 None)
+#   mtime:   目录 mtime (仅在启用 dir_index 时采集)
+#   subdirs: 实际进入的子目录路径列表
+#   cached:  dir_index 中 mtime 未变的记录 (未命中为 None)
+DirVisit = namedtuple('DirVisit', ['path', 'files', 'mtime', 'subdirs', 'cached'])
+# 已入队但无法访问 (stat / scandir 失败) 的目录，只用于让 walk() 的重排不必等待它
+_Missing = namedtuple('_Missing', ['path'])
+# 访问目录时回调 (skip_dir / prune_dir / match_file) 抛出的异常，由 walk() 在调用方线程中重新抛出
+_Failed = namedtuple('_Failed', ['path', 'error'])
+
+
+def _dir_order(path):
+    # 同级目录的输出顺序：按名称 (不区分大小写，与 NTFS 的枚举顺序一致)，大小写不同的同名目录再按原样比较
+    return path.lower(), path
+
+
+def default_worker_count():
+    # 目录遍历以 IO 为主 (尤其是网络共享)，线程数可以比 CPU 核心数多
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class ParallelWalker:
+    """
+    基于 os.scandir 的并行目录遍历器 (Work-Stealing 线程池)
+
+    - 每个线程有自己的双端队列：从尾部取任务 (深度优先，缓存友好)，空闲时从其他线程的头部"偷"任务
+    - 与 os.walk(topdown=True) 保持一致的剪枝语义：
+        skip_dir(path)  -> True: 整个目录 (含子树) 跳过，不产出
+        prune_dir(name) -> True: 该子目录不进入
+    - match_file(name) 用于预筛候选文件，只把命中的 DirEntry 交给调用方 (stat 结果由 DirEntry 缓存)
+    - dir_index: {path: record}，record[0] 为 mtime、record[1] 为子目录列表。
+      目录 mtime 未变时不再 scandir，直接沿用记录中的子目录继续向下 (子目录仍逐个比对 mtime)
+    - 产出顺序固定为先序 (父目录在前，同级目录按名称排序)，与线程调度无关，多次扫描结果一致；
+      线程并行访问目录，walk() 把先到达的结果暂存，轮到时再输出
+    - 回调在工作线程中抛出的异常 (OSError 之外) 会从 walk() 重新抛出，不会让扫描悄悄缺少目录
+    """
+
+    def __init__(self, workers=0, skip_dir=None, prune_dir=None, match_file=None, check_stop_callback=None,
+                 dir_index=None):
+        self.workers = workers if workers and workers > 0 else default_worker_count()
+        self.skip_dir = skip_dir
+        self.prune_dir = prune_dir
+        self.match_file = match_file
+        self.check_stop_callback = check_stop_callback
+        self.dir_index = dir_index
+
+    def walk(self, top):
+        """生成器: 逐个产出 DirVisit，每个被访问的目录一条"""
+        if self.skip_dir and self.skip_dir(top): return
+
+        self._deques = [deque() for _ in range(self.workers)]
+        self._cond = threading.Condition()
+        self._pending = 1
+        self._stop = threading.Event()
+        self._out = queue.Queue(maxsize=4096)
+        self._deques[0].append((top, None))
+
+        threads = [threading.Thread(target=self._worker, args=(i,), daemon=True) for i in range(self.workers)]
+        for t in threads: t.start()
+        arrived = {}  # 已访问但还没轮到输出的目录
+        order = [top]  # 待输出的目录 (栈顶为下一个)
+        try:
+            while order:
+                if self.check_stop_callback and self.check_stop_callback(): return
+                item = arrived.pop(order[-1], None)
+                if item is None:
+                    try:
+                        item = self._out.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if item is _DONE: return  # 每个入队的目录都有结果，不会先于栈中的目录结束
+                    if type(item) is _Failed: raise item.error  # 规则出错时中止，而不是悄悄少扫一部分目录
+                    arrived[item.path] = item
+                    continue
+                order.pop()
+                if type(item) is _Missing: continue
+                order.extend(sorted(item.subdirs, key=_dir_order, reverse=True))
+                yield item
+        finally:
+            self._stop.set()
+            with self._cond: self._cond.notify_all()
+            for t in threads: t.join()
+
+    # --- 内部实现 ---
+    def _take(self, wid):
+        try:
+            return self._deques[wid].pop()
+        except IndexError:
+            pass
+        # 本地队列为空，随机挑一个起点去偷其他线程最"老"(最浅) 的目录
+        n = self.workers
+        start = random.randrange(n)
+        for k in range(n):
+            victim = (start + k) % n
+            if victim == wid: continue
+            try:
+                return self._deques[victim].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _worker(self, wid):
+        while not self._stop.is_set():
+            task = self._take(wid)
+            if task is None:
+                with self._cond:
+                    if self._pending == 0: return
+                    self._cond.wait(0.01)
+                continue
+            try:
+                self._visit(wid, *task)
+            except Exception as e:
+                self._emit(_Failed(task[0], e))
+            finally:
+                with self._cond:
+                    self._pending -= 1
+                    finished = self._pending == 0
+                    if finished: self._cond.notify_all()
+                if finished: self._emit(_DONE)
+
+    def _visit(self, wid, path, mtime):
+        if self.dir_index is not None:
+            if mtime is None:
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    self._emit(_Missing(path))
+                    return
+            rec = self.dir_index.get(path)
+            if rec is not None and rec[0] == mtime:
+                # 目录内容未变：跳过 scandir，子目录的 mtime 交给子任务自己 stat
+                subdirs = [d for d in rec[1] if not (self.skip_dir and self.skip_dir(d))]
+                self._push(wid, [(d, None) for d in subdirs])
+                self._emit(DirVisit(path, None, mtime, subdirs, rec))
+                return
+
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # 与 os.walk(followlinks=False) 一致：不进入符号链接目录
+                        if self.prune_dir and self.prune_dir(entry.name): continue
+                        try:
+                            if entry.is_symlink(): continue
+                            # Windows 下 DirEntry.stat() 直接来自目录枚举结果，不产生额外 IO
+                            sub_mtime = entry.stat().st_mtime if self.dir_index is not None else None
+                        except OSError:
+                            continue
+                        subdirs.append((entry.path, sub_mtime))
+                    elif self.match_file is None or self.match_file(entry.name):
+                        files.append(entry)
+        except OSError:
+            self._emit(_Missing(path))
+            return
+
+        if self.skip_dir:
+            subdirs = [d for d in subdirs if not self.skip_dir(d[0])]
+        self._push(wid, subdirs)
+        self._emit(DirVisit(path, files, mtime, [d[0] for d in subdirs], None))
+
+    def _push(self, wid, tasks):
+        if not tasks: return
+        with self._cond:
+            self._pending += len(tasks)
+        self._deques[wid].extend(tasks)
+        with self._cond:
+            self._cond.notify(len(tasks))
+
+    def _emit(self, item):
+        # 输出队列有上限，防止消费者慢时内存堆积；停止后直接丢弃
+        while not self._stop.is_set():
+            try:
+                self._out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
@@ -0,0 +1,47 @@
+import threading
+from collections import deque, namedtuple
+
+# --- 数据变更通知 ---
+# 每个数据库一条变更流：每次提交后的写入都会让代数 (generation) +1 并记录一条事件。
+# 视图记住自己同步到的代数：代数没变直接跳过刷新；变了就用 changes_since 取增量，只处理变化的行。
+# 事件只保留最近 MAX_EVENTS 条，落后太多的视图会拿到 None，需要整体重新加载。
+
+MAX_EVENTS = 1024
+
+# kind: 'insert' | 'update' | 'upsert' | 'delete' | 'run_count'
+# ids: 受影响的行 id；exe_paths: 无法事先知道 id 的写入 (upsert) 用 exe_path 标识
+ChangeEvent = namedtuple('ChangeEvent', ['gen', 'kind', 'ids', 'exe_paths'])
+
+
+class ChangeFeed:
+    def __init__(self, max_events=MAX_EVENTS):
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._events = deque(maxlen=max_events)
+
+    def generation(self):
+        return self._gen
+
+    def publish(self, kind, ids=(), exe_paths=()):
+        with self._lock:
+            self._gen += 1
+            self._events.append(ChangeEvent(self._gen, kind, tuple(ids), tuple(exe_paths)))
+            return self._gen
+
+    def changes_since(self, gen):
+        """返回代数 gen 之后的全部事件；gen 太旧 (事件已被丢弃) 时返回 None"""
+        with self._lock:
+            if gen >= self._gen: return []
+            if not self._events or self._events[0].gen > gen + 1: return None
+            return [e for e in self._events if e.gen > gen]
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def get_feed(db_file):
+    with _feeds_lock:
+        feed = _feeds.get(db_file)
+        if feed is None: feed = _feeds[db_file] = ChangeFeed()
+        return feed
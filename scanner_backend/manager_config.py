@@ -1,26 +1,211 @@
 # scanner_backend/manager_config.py
+import io
 import os
+import time
+import atexit
+import threading
 import configparser
 from .const import CONFIG_FILE, DEFAULT_CONFIG
 
+# --- 配置服务 ---
+# 进程内只解析一次 config.ini；服务持有的 ConfigParser 发布后不再修改 (写时复制)：
+# 重新加载 (文件被外部修改，mtime 变化，最多每 RELOAD_CHECK_INTERVAL 秒检查一次) 与保存都先构建新对象，
+# 再在锁内整体替换，其他线程 (例如扫描线程) 读取时不会看到缺项或新旧混合的内容。
+# 读取单项用 config_get* (直接查服务当前的对象)，写入单项用 config_set()；
+# load_config() 返回一份独立的副本，页面修改副本后 save_config(副本) 只提交副本中改动过的项，
+# 未保存的修改不会影响其他页面，拿着旧副本保存也不会覆盖别处已经保存的其他项。
+# 写盘：SAVE_DELAY 秒内的多次保存合并为一次 (临时文件 + 原子替换)；
+# 程序退出前调用 flush_config() (另有 atexit 兜底) 立即写入。
+
+SAVE_DELAY = 0.5
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+def _values(config):
+    """{节: {键: 原始值}} (不做插值)"""
+    return {name: dict(config.items(name, raw=True)) for name in config.sections()}
+
+
+def _copy(config, cls=configparser.ConfigParser):
+    buf = io.StringIO()
+    config.write(buf)
+    copy = cls()
+    copy.read_string(buf.getvalue())
+    return copy
+
+
+class ConfigSnapshot(configparser.ConfigParser):
+    """load_config() 返回的副本，记住取出时的内容，保存时只提交改动过的项"""
+    _base = None
+
+
+class ConfigService:
+    def __init__(self, path=CONFIG_FILE):
+        self.path = path
+        self.config = configparser.ConfigParser()
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked = 0.0
+        self._pending = None  # 待写盘的文本快照
+        self._timer = None
+        self._read()
+
+    def _mtime_of(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read(self):
+        fresh = configparser.ConfigParser()
+        mtime = self._mtime_of()
+        if mtime is not None:
+            fresh.read(self.path, encoding='utf-8')
+        if 'Settings' not in fresh: fresh['Settings'] = {}
+        if 'Rules' not in fresh: fresh['Rules'] = {}
+        # 补全默认值
+        for k, v in DEFAULT_CONFIG.items():
+            if k not in fresh['Rules']: fresh['Rules'][k] = v
+
+        self.config = fresh  # 整体替换，不修改已发布的对象
+        self._mtime = mtime
+
+    def current(self):
+        """返回当前的配置对象 (只读，不要修改)；文件被外部修改且没有未写盘的修改时重新加载"""
+        now = time.monotonic()
+        if now - self._checked >= RELOAD_CHECK_INTERVAL:
+            self._checked = now
+            with self._lock:
+                if self._pending is None and self._mtime_of() != self._mtime: self._read()
+        return self.config
+
+    def snapshot(self):
+        """当前配置的独立副本 (ConfigSnapshot)"""
+        copy = _copy(self.current(), ConfigSnapshot)
+        copy._base = _values(copy)
+        return copy
+
+    # --- 类型化读取 (不做插值，直接查当前对象) ---
+    def get(self, section, key, fallback=None):
+        return self.current().get(section, key, raw=True, fallback=fallback)
+
+    def getint(self, section, key, fallback=0):
+        try:
+            return self.current().getint(section, key, raw=True, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    def getfloat(self, section, key, fallback=0.0):
+        try:
+            return self.current().getfloat(section, key, raw=True, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    def getboolean(self, section, key, fallback=False):
+        try:
+            return self.current().getboolean(section, key, raw=True, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    # --- 写入 ---
+    def set(self, section, key, value):
+        self.update({section: {key: str(value)}})
+
+    def save(self, config=None):
+        """
+        提交 config 中的修改 (ConfigSnapshot 只提交相对取出时改动过的项，普通 ConfigParser 提交全部项)
+        SAVE_DELAY 秒后写盘；期间的多次保存只写最后一次
+        """
+        if config is None:
+            self.update({})
+            return
+        values = _values(config)
+        base = config._base if isinstance(config, ConfigSnapshot) else None
+        if base is not None:
+            values = {name: {k: v for k, v in items.items() if base.get(name, {}).get(k) != v}
+                      for name, items in values.items()}
+        self.update(values)
+        if base is not None: config._base = _values(config)
+
+    def update(self, values):
+        """values = {节: {键: 值}}：在副本上修改后整体替换，并安排写盘"""
+        with self._lock:
+            config = _copy(self.config)
+            for name, items in values.items():
+                if not items: continue
+                if not config.has_section(name): config.add_section(name)
+                for key, value in items.items(): config.set(name, key, value)
+            self.config = config
+            buf = io.StringIO()
+            config.write(buf)
+            self._pending = buf.getvalue()
+            if self._timer is not None: self._timer.cancel()
+            self._timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """立即写入未保存的修改"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            text, self._pending = self._pending, None
+            if text is None: return
+            tmp = self.path + '.tmp'
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(tmp, self.path)
+                self._mtime = self._mtime_of()
+            except Exception as e:
+                print(f"Config Error: {e}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_config_service():
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ConfigService()
+                atexit.register(_service.flush)
+    return _service
+
 
 def load_config():
-    config = configparser.ConfigParser()
-    if os.path.exists(CONFIG_FILE):
-        config.read(CONFIG_FILE, encoding='utf-8')
+    """返回当前配置的独立副本 (修改后调用 save_config(副本) 保存；读取单项请用 config_get*)"""
+    return get_config_service().snapshot()
+
+
+def save_config(config=None):
+    get_config_service().save(config)
+
+
+def config_set(section, key, value):
+    """修改单项并保存"""
+    get_config_service().set(section, key, value)
+
+
+def flush_config():
+    """立即把未写盘的配置写入 config.ini (退出前调用)"""
+    if _service is not None: _service.flush()
+
+
+def config_get(section, key, fallback=None):
+    return get_config_service().get(section, key, fallback)
+
+
+def config_getint(section, key, fallback=0):
+    return get_config_service().getint(section, key, fallback)
 
-    if 'Settings' not in config: config['Settings'] = {}
-    if 'Rules' not in config: config['Rules'] = {}
 
-    # 补全默认值
-    for k, v in DEFAULT_CONFIG.items():
-        if k not in config['Rules']: config['Rules'][k] = v
-    return config
+def config_getfloat(section, key, fallback=0.0):
+    return get_config_service().getfloat(section, key, fallback)
 
 
-def save_config(config):
-    try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            config.write(f)
-    except Exception as e:
-        print(f"Config Error: {e}")
\ No newline at end of file
+def config_getboolean(section, key, fallback=False):
+    return get_config_service().getboolean(section, key, fallback)
@@ -1,6 +1,161 @@
 import sqlite3
 import os
+import json
+import time
+import queue
+import threading
+from contextlib import contextmanager
 from .const import DB_FILE_USER, DB_FILE_CACHE
+from .manager_migrations import run_migrations, USER_DB_MIGRATIONS, CACHE_DB_MIGRATIONS
+from .manager_changes import get_feed
+from .core_frecency import logaddexp, combine_launches
+
+# --- 连接管理 ---
+# 每个数据库文件一个小连接池，连接长期保持 (WAL + 预编译语句缓存)，程序退出时由 close_databases 关闭
+
+POOL_SIZE = 4
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # 读写互不阻塞
+    "PRAGMA synchronous=NORMAL",  # WAL 下足够安全，提交不再每次 fsync
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",  # 8 MB
+    "PRAGMA busy_timeout=5000",
+)
+
+_pools = {}
+_pools_lock = threading.Lock()
+_local = threading.local()  # 当前线程正在进行的事务 {db_file: conn} 及其待发布的变更 {db_file: [事件]}
+
+
+class _ConnectionPool:
+    def __init__(self, db_file, size=POOL_SIZE):
+        self.db_file = db_file
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # isolation_level=None: 由 transaction() 显式控制事务，单条语句自动提交
+        conn = sqlite3.connect(self.db_file, timeout=5, check_same_thread=False,
+                               isolation_level=None, cached_statements=256)
+        for pragma in PRAGMAS: conn.execute(pragma)
+        conn.create_function("logaddexp", 2, logaddexp, deterministic=True)  # 常用度的增量更新在 SQL 中完成
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get()  # 池已满，等待其他线程归还
+
+    def release(self, conn):
+        self._idle.put(conn)
+
+    def close(self):
+        with self._lock:
+            conns, self._all = self._all, []
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+def _get_pool(db_file):
+    with _pools_lock:
+        pool = _pools.get(db_file)
+        if pool is None:
+            pool = _pools[db_file] = _ConnectionPool(db_file)
+        return pool
+
+
+def _active_transactions():
+    active = getattr(_local, 'active', None)
+    if active is None:
+        active = _local.active = {}
+    return active
+
+
+def _pending_changes():
+    pending = getattr(_local, 'pending', None)
+    if pending is None:
+        pending = _local.pending = {}
+    return pending
+
+
+def _notify(db_file, kind, ids=(), exe_paths=()):
+    """发布一条变更；处于 transaction() 中时暂存，提交后才发布，回滚则丢弃"""
+    if db_file in _active_transactions():
+        _pending_changes()[db_file].append((kind, ids, exe_paths))
+    else:
+        get_feed(db_file).publish(kind, ids, exe_paths)
+
+
+@contextmanager
+def connection(db_file=DB_FILE_USER):
+    """借出一个连接；当前线程处于 transaction() 中时直接复用事务连接"""
+    conn = _active_transactions().get(db_file)
+    if conn is not None:
+        yield conn
+        return
+    pool = _get_pool(db_file)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def transaction(db_file=DB_FILE_USER):
+    """
+    事务上下文：块内的所有写入 (包括调用 add_shortcut_to_db 等函数) 合并为一次提交
+    可嵌套，内层并入最外层事务；异常时整体回滚
+    """
+    active = _active_transactions()
+    if db_file in active:
+        yield active[db_file]
+        return
+    pool = _get_pool(db_file)
+    conn = pool.acquire()
+    active[db_file] = conn
+    pending = _pending_changes()[db_file] = []
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        del active[db_file]
+        del _pending_changes()[db_file]
+        pool.release(conn)
+    feed = get_feed(db_file)
+    for kind, ids, exe_paths in pending: feed.publish(kind, ids, exe_paths)
+
+
+def close_databases():
+    """关闭所有池化连接 (程序退出时调用，WAL 会在最后一个连接关闭时合并回主库)"""
+    flush_launches()
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools: pool.close()
+
 
 def init_databases():
     """初始化两个 SQLite 数据库及其表结构"""
@@ -12,88 +167,249 @@ def init_databases():
         return False, f"数据库初始化失败: {e}"
 
 def _init_user_db():
-    conn = sqlite3.connect(DB_FILE_USER)
-    c = conn.cursor()
-    # 快捷方式表
-    c.execute('''CREATE TABLE IF NOT EXISTS shortcuts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    exe_path TEXT,
-                    lnk_path TEXT,
-                    args TEXT,
-                    icon_path TEXT,
-                    source_type TEXT, 
-                    category TEXT DEFAULT '默认',
-                    run_count INTEGER DEFAULT 0,
-                    is_pinned BOOLEAN DEFAULT 0,
-                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )''')
-    # 分类表
-    c.execute('''CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    sort_order INTEGER DEFAULT 0
-                )''')
-    conn.commit(); conn.close()
+    with connection(DB_FILE_USER) as conn:
+        run_migrations(conn, USER_DB_MIGRATIONS, "user_data.db")
 
 def _init_cache_db():
-    conn = sqlite3.connect(DB_FILE_CACHE)
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS icon_cache (
-                    file_path TEXT PRIMARY KEY,
-                    icon_blob BLOB,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )''')
-    conn.commit(); conn.close()
+    with connection(DB_FILE_CACHE) as conn:
+        run_migrations(conn, CACHE_DB_MIGRATIONS, "cache.db")
 
 # --- 【Beta 7.0 新增】 CRUD 操作 ---
 
+_UPSERT_SQL = (
+    "INSERT INTO shortcuts (name, exe_path, lnk_path, source_type, args) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(exe_path) DO UPDATE SET "
+    "name=excluded.name, lnk_path=excluded.lnk_path, source_type=excluded.source_type, args=excluded.args"
+)
+
 def add_shortcut_to_db(name, exe_path, lnk_path, source_type, args=""):
-    """添加一个快捷方式到数据库"""
-    conn = sqlite3.connect(DB_FILE_USER)
-    c = conn.cursor()
+    """添加一个快捷方式到数据库，exe_path 相同则更新 (在 transaction() 中调用时并入外层事务)"""
+    return upsert_shortcuts([(name, exe_path, lnk_path, source_type, args)]) == 1
+
+def upsert_shortcuts(rows):
+    """
+    批量添加/更新快捷方式 (单个事务 + executemany)
+    rows: [(name, exe_path, lnk_path, source_type, args)]
+    返回写入的行数，失败返回 0
+    """
+    rows = list(rows)
+    if not rows: return 0
     try:
-        # 简单的查重：如果 exe_path 相同，则更新
-        c.execute("SELECT id FROM shortcuts WHERE exe_path = ?", (exe_path,))
-        data = c.fetchone()
-        if data:
-            # 更新
-            c.execute("UPDATE shortcuts SET name=?, lnk_path=?, source_type=?, args=? WHERE id=?",
-                      (name, lnk_path, source_type, args, data[0]))
-        else:
-            # 插入
-            c.execute("INSERT INTO shortcuts (name, exe_path, lnk_path, source_type, args) VALUES (?, ?, ?, ?, ?)",
-                      (name, exe_path, lnk_path, source_type, args))
-        conn.commit()
-        return True
+        with transaction(DB_FILE_USER) as conn:
+            conn.executemany(_UPSERT_SQL, rows)
+            _notify(DB_FILE_USER, 'upsert', exe_paths=[r[1] for r in rows])
+        return len(rows)
     except Exception as e:
         print(f"DB Error: {e}")
-        return False
-    finally:
-        conn.close()
+        return 0
 
 def get_all_shortcuts():
     """获取所有快捷方式"""
-    conn = sqlite3.connect(DB_FILE_USER)
-    conn.row_factory = sqlite3.Row # 允许通过列名访问
-    c = conn.cursor()
-    c.execute("SELECT * FROM shortcuts ORDER BY added_at DESC")
-    rows = c.fetchall()
-    conn.close()
-    return rows
+    with connection(DB_FILE_USER) as conn:
+        c = conn.cursor()
+        c.row_factory = sqlite3.Row # 允许通过列名访问
+        c.execute("SELECT * FROM shortcuts ORDER BY added_at DESC")
+        return c.fetchall()
+
+def _select_shortcuts_in(column, values):
+    # 分批查询，避免超出 SQLite 的参数个数上限
+    values = list(values)
+    result = []
+    with connection(DB_FILE_USER) as conn:
+        c = conn.cursor()
+        c.row_factory = sqlite3.Row
+        for i in range(0, len(values), 500):
+            chunk = values[i:i + 500]
+            c.execute(f"SELECT * FROM shortcuts WHERE {column} IN ({','.join('?' * len(chunk))})", chunk)
+            result.extend(c.fetchall())
+    return result
+
+def get_shortcuts_by_ids(ids):
+    """按 id 获取快捷方式 (不存在的 id 直接忽略)"""
+    return _select_shortcuts_in('id', ids)
+
+def get_shortcuts_by_exe_paths(exe_paths):
+    """按 exe_path 获取快捷方式 (不存在的路径直接忽略)"""
+    return _select_shortcuts_in('exe_path', exe_paths)
 
 def delete_shortcut(shortcut_id):
-    """删除快捷方式"""
-    conn = sqlite3.connect(DB_FILE_USER)
-    c = conn.cursor()
-    c.execute("DELETE FROM shortcuts WHERE id = ?", (shortcut_id,))
-    conn.commit()
-    conn.close()
-
-def increment_run_count(shortcut_id):
-    """增加启动次数"""
-    conn = sqlite3.connect(DB_FILE_USER)
-    c = conn.cursor()
-    c.execute("UPDATE shortcuts SET run_count = run_count + 1 WHERE id = ?", (shortcut_id,))
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    """删除快捷方式及其启动记录 (同一事务，任一步失败都整体回滚)"""
+    with transaction(DB_FILE_USER) as conn:
+        conn.execute("DELETE FROM shortcuts WHERE id = ?", (shortcut_id,))
+        conn.execute("DELETE FROM launch_history WHERE shortcut_id = ?", (shortcut_id,))
+        _notify(DB_FILE_USER, 'delete', ids=(shortcut_id,))
+
+def increment_run_count(shortcut_id, ts=None):
+    """记录一次启动并立即写入 (同步版本；界面上请用 record_launch + 定时 flush_launches)"""
+    record_launch(shortcut_id, ts)
+    flush_launches()
+
+
+# --- 启动记录 (写回缓冲) ---
+# 启动时只在内存中记一笔，按快捷方式合并；由调用方定时 (以及退出时) 调用 flush_launches 在一个事务内写入：
+# 启动次数 +n、常用度累加 n 次启动、插入 n 条 launch_history。
+# 异常退出最多丢失一个刷新周期内 (且不超过 LAUNCH_BUFFER_SIZE 次) 的启动。
+
+LAUNCH_BUFFER_SIZE = 64  # 缓冲的启动次数达到这么多时立即写入
+_launch_buffer = {}  # shortcut_id -> [启动时间]
+_launch_count = 0
+_launch_lock = threading.Lock()
+
+def record_launch(shortcut_id, ts=None):
+    """缓冲一次启动 (只写内存，不访问数据库)；返回当前缓冲的启动次数"""
+    global _launch_count
+    ts = time.time() if ts is None else ts
+    with _launch_lock:
+        _launch_buffer.setdefault(shortcut_id, []).append(ts)
+        _launch_count += 1
+        count = _launch_count
+    if count >= LAUNCH_BUFFER_SIZE: flush_launches()
+    return count
+
+def flush_launches():
+    """把缓冲的启动一次性写入数据库，返回写入的启动次数；失败时放回缓冲，下次再试"""
+    global _launch_count
+    with _launch_lock:
+        if not _launch_buffer: return 0
+        pending = dict(_launch_buffer)
+        _launch_buffer.clear()
+        _launch_count = 0
+    try:
+        with transaction(DB_FILE_USER) as conn:
+            conn.executemany(
+                "UPDATE shortcuts SET run_count = run_count + ?, frecency = logaddexp(frecency, ?) WHERE id = ?",
+                [(len(times), combine_launches(times), sid) for sid, times in pending.items()])
+            # 缓冲期间被删除的快捷方式不再写启动记录
+            conn.executemany(
+                "INSERT INTO launch_history (shortcut_id, launched_at) "
+                "SELECT ?, ? WHERE EXISTS (SELECT 1 FROM shortcuts WHERE id = ?)",
+                [(sid, ts, sid) for sid, times in pending.items() for ts in times])
+            _notify(DB_FILE_USER, 'run_count', ids=list(pending))
+        return sum(len(times) for times in pending.values())
+    except Exception as e:
+        print(f"DB Error: {e}")
+        with _launch_lock:
+            for sid, times in pending.items():
+                _launch_buffer.setdefault(sid, [])[:0] = times
+                _launch_count += len(times)
+        return 0
+
+def change_generation(db_file=DB_FILE_USER):
+    """数据库的变更代数：每次提交的写入 +1，视图据此判断是否需要刷新"""
+    return get_feed(db_file).generation()
+
+def changes_since(gen, db_file=DB_FILE_USER):
+    """代数 gen 之后的变更事件列表 (ChangeEvent)；gen 过旧时返回 None，调用方应整体重新加载"""
+    return get_feed(db_file).changes_since(gen)
+
+
+# --- 目录索引 (增量扫描) ---
+
+def load_dir_index(root_path, rules_sig):
+    """
+    读取 root_path 下所有目录的索引记录
+    返回 {dir_path: (mtime, subdirs, exes, ranked)}，规则签名不一致的记录视为失效
+    """
+    index = {}
+    # 只取 root_path 本身及其下的子目录：前缀带上分隔符，避免 D:\Games 读到 D:\Games2 的记录
+    # (扫描结束时未访问到的记录会被当作已消失的目录删除)；LIKE 不区分大小写，再用 substr 精确比较
+    prefix = root_path.rstrip(os.sep + (os.altsep or '')) + os.sep
+    pattern = prefix.replace('!', '!!').replace('%', '!%').replace('_', '!_') + '%'
+    try:
+        with connection(DB_FILE_CACHE) as conn:
+            rows = conn.execute("SELECT dir_path, mtime, subdirs, exes, ranked FROM dir_index "
+                                "WHERE rules_sig = ? AND (dir_path = ? OR (dir_path LIKE ? ESCAPE '!' "
+                                "AND substr(dir_path, 1, ?) = ?))",
+                                (rules_sig, root_path, pattern, len(prefix), prefix)).fetchall()
+        for dir_path, mtime, subdirs, exes, ranked in rows:
+            index[dir_path] = (mtime, json.loads(subdirs), [tuple(x) for x in json.loads(exes)],
+                               json.loads(ranked) if ranked else None)
+    except Exception as e:
+        print(f"DB Error: {e}")
+    return index
+
+
+def save_dir_index(records, rules_sig, stale_paths=()):
+    """
+    批量写入目录索引 (单个事务)
+    records: [(dir_path, mtime, subdirs, exes, ranked)]
+    stale_paths: 本次完整扫描未再访问到的旧目录，一并删除
+    """
+    try:
+        with transaction(DB_FILE_CACHE) as conn:
+            c = conn.cursor()
+            c.executemany("DELETE FROM dir_index WHERE dir_path = ?", [(p,) for p in stale_paths])
+            c.executemany("INSERT OR REPLACE INTO dir_index (dir_path, mtime, rules_sig, subdirs, exes, ranked) "
+                          "VALUES (?, ?, ?, ?, ?, ?)",
+                          [(d, m, rules_sig, json.dumps(sub), json.dumps(exes),
+                            json.dumps(ranked) if ranked is not None else None)
+                           for d, m, sub, exes, ranked in records])
+        return True
+    except Exception as e:
+        print(f"DB Error: {e}")
+        return False
+
+
+def clear_dir_index():
+    """清空目录索引，下次扫描将全量进行"""
+    with connection(DB_FILE_CACHE) as conn:
+        conn.execute("DELETE FROM dir_index")
+
+
+# --- 图标缓存 (cache.db: icon_cache) ---
+
+def load_icon_blob(file_path, px, mtime, file_size):
+    """读取缓存的 PNG；文件的 mtime 或大小变化时视为失效，返回 None"""
+    try:
+        with connection(DB_FILE_CACHE) as conn:
+            row = conn.execute("SELECT icon_blob FROM icon_cache WHERE file_path = ? AND px = ? "
+                               "AND mtime = ? AND file_size = ?", (file_path, px, mtime, file_size)).fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        print(f"DB Error: {e}")
+        return None
+
+
+def save_icon_blobs(rows, touched=()):
+    """
+    批量写入图标 (单个事务)
+    rows: [(file_path, px, mtime, file_size, png_bytes)]，同一 (路径, 尺寸) 的旧记录被覆盖
+    touched: [(file_path, px)] 本次命中的记录，刷新最近使用时间
+    """
+    now = time.time()
+    try:
+        with transaction(DB_FILE_CACHE) as conn:
+            conn.executemany("INSERT OR REPLACE INTO icon_cache "
+                             "(file_path, px, mtime, file_size, icon_blob, blob_size, last_used) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             [(p, px, m, sz, blob, len(blob), now) for p, px, m, sz, blob in rows])
+            conn.executemany("UPDATE icon_cache SET last_used = ? WHERE file_path = ? AND px = ?",
+                             [(now, p, px) for p, px in touched])
+        return True
+    except Exception as e:
+        print(f"DB Error: {e}")
+        return False
+
+
+def trim_icon_cache(max_bytes):
+    """总大小超过 max_bytes 时按最近使用时间淘汰，删到上限的 90%；返回删除条数"""
+    try:
+        with transaction(DB_FILE_CACHE) as conn:
+            total = conn.execute("SELECT COALESCE(SUM(blob_size), 0) FROM icon_cache").fetchone()[0]
+            if total <= max_bytes: return 0
+            excess = total - int(max_bytes * 0.9)
+            victims = []
+            for rowid, size in conn.execute("SELECT rowid, blob_size FROM icon_cache ORDER BY last_used"):
+                victims.append((rowid,))
+                excess -= size or 0
+                if excess <= 0: break
+            conn.executemany("DELETE FROM icon_cache WHERE rowid = ?", victims)
+        return len(victims)
+    except Exception as e:
+        print(f"DB Error: {e}")
+        return 0
+
+
+def clear_icon_cache():
+    with connection(DB_FILE_CACHE) as conn:
+        conn.execute("DELETE FROM icon_cache")
@@ -0,0 +1,154 @@
+import time
+import calendar
+from .core_frecency import seed_score
+
+# --- 数据库版本迁移 ---
+# 以 PRAGMA user_version 记录每个库的结构版本，启动时按顺序执行尚未应用的步骤。
+# 每一步在独立事务中执行，连同 user_version 一起提交；失败则整步回滚，下次启动重试。
+# 新增表/索引/列时只需在列表末尾追加 (版本号, 说明, 函数)，已发布的步骤不要再修改。
+
+# 最近一次 run_migrations 的记录: {库名: [(版本号, 说明, 耗时秒)]}
+migration_log = {}
+
+
+# --- user_data.db ---
+
+def _user_v1_base_tables(c):
+    # 快捷方式表
+    c.execute('''CREATE TABLE IF NOT EXISTS shortcuts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    exe_path TEXT,
+                    lnk_path TEXT,
+                    args TEXT,
+                    icon_path TEXT,
+                    source_type TEXT,
+                    category TEXT DEFAULT '默认',
+                    run_count INTEGER DEFAULT 0,
+                    is_pinned BOOLEAN DEFAULT 0,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )''')
+    # 分类表
+    c.execute('''CREATE TABLE IF NOT EXISTS categories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL,
+                    sort_order INTEGER DEFAULT 0
+                )''')
+
+
+def _user_v2_exe_path_unique(c):
+    # 先合并历史重复行：保留最早的一条，启动次数累加
+    c.execute('''UPDATE shortcuts SET
+                    run_count = (SELECT SUM(run_count) FROM shortcuts s2 WHERE s2.exe_path = shortcuts.exe_path),
+                    is_pinned = (SELECT MAX(is_pinned) FROM shortcuts s2 WHERE s2.exe_path = shortcuts.exe_path)
+                 WHERE id IN (SELECT MIN(id) FROM shortcuts WHERE exe_path IS NOT NULL
+                              GROUP BY exe_path HAVING COUNT(*) > 1)''')
+    c.execute('''DELETE FROM shortcuts WHERE exe_path IS NOT NULL AND id NOT IN
+                    (SELECT MIN(id) FROM shortcuts WHERE exe_path IS NOT NULL GROUP BY exe_path)''')
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_shortcuts_exe_path ON shortcuts(exe_path)")
+
+
+def _user_v3_launch_history(c):
+    # 启动记录 + 预先算好的常用度 (对数空间，见 core_frecency)
+    c.execute('''CREATE TABLE IF NOT EXISTS launch_history (
+                    id INTEGER PRIMARY KEY,
+                    shortcut_id INTEGER NOT NULL,
+                    launched_at REAL NOT NULL
+                )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_launch_history_shortcut ON launch_history(shortcut_id, launched_at)")
+    c.execute("ALTER TABLE shortcuts ADD COLUMN frecency REAL")
+    # 旧数据没有启动时间：按添加时间估算，老的常用项会随时间自然衰减
+    rows = c.execute("SELECT id, run_count, added_at FROM shortcuts WHERE run_count > 0").fetchall()
+    seeds = []
+    for sid, run_count, added_at in rows:
+        try:
+            ts = calendar.timegm(time.strptime(str(added_at), "%Y-%m-%d %H:%M:%S"))
+        except ValueError:
+            ts = time.time()
+        seeds.append((seed_score(run_count, ts), sid))
+    c.executemany("UPDATE shortcuts SET frecency = ? WHERE id = ?", seeds)
+
+
+USER_DB_MIGRATIONS = [
+    (1, "基础表 shortcuts / categories", _user_v1_base_tables),
+    (2, "shortcuts.exe_path 唯一索引", _user_v2_exe_path_unique),
+    (3, "启动记录 launch_history / shortcuts.frecency", _user_v3_launch_history),
+]
+
+
+# --- cache.db ---
+
+def _cache_v1_base_tables(c):
+    c.execute('''CREATE TABLE IF NOT EXISTS icon_cache (
+                    file_path TEXT PRIMARY KEY,
+                    icon_blob BLOB,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )''')
+    # 目录索引：增量扫描时跳过 mtime 未变化的目录
+    c.execute('''CREATE TABLE IF NOT EXISTS dir_index (
+                    dir_path TEXT PRIMARY KEY,
+                    mtime REAL,
+                    rules_sig TEXT,
+                    subdirs TEXT,
+                    exes TEXT,
+                    ranked TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )''')
+
+
+def _cache_v2_icon_cache_keys(c):
+    # 旧 icon_cache 从未被读写过，直接重建：按 (路径, 像素尺寸) 存 PNG，mtime/size 用于失效判断
+    c.execute("DROP TABLE IF EXISTS icon_cache")
+    c.execute('''CREATE TABLE icon_cache (
+                    file_path TEXT NOT NULL,
+                    px INTEGER NOT NULL,
+                    mtime REAL,
+                    file_size INTEGER,
+                    icon_blob BLOB,
+                    blob_size INTEGER,
+                    last_used REAL,
+                    PRIMARY KEY (file_path, px)
+                )''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_icon_cache_last_used ON icon_cache(last_used)")
+
+
+CACHE_DB_MIGRATIONS = [
+    (1, "基础表 icon_cache / dir_index", _cache_v1_base_tables),
+    (2, "icon_cache 按路径 + mtime + 大小缓存", _cache_v2_icon_cache_keys),
+]
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn, migrations, db_name):
+    """
+    将 conn 对应的库升级到 migrations 中的最新版本
+    conn 需处于自动提交模式 (isolation_level=None)，事务由这里显式控制
+    已是最新版本时只读一次 user_version 即返回
+    返回本次执行的 [(版本号, 说明, 耗时秒)]
+    """
+    current = schema_version(conn)
+    if not migrations or current >= migrations[-1][0]:
+        migration_log[db_name] = []
+        return []
+
+    applied = []
+    for version, desc, step in migrations:
+        if version <= current: continue
+        t0 = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            step(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        elapsed = time.perf_counter() - t0
+        applied.append((version, desc, elapsed))
+        print(f"[Migration] {db_name} v{version} {desc}: {elapsed * 1000:.1f} ms")
+
+    migration_log[db_name] = applied
+    return applied
@@ -1,11 +1,15 @@
 import os
+import configparser
 from .const import (
     FILENAME_BLOCKLIST, DEFAULT_BLOCKLIST,
     FILENAME_IGNORED_DIRS, DEFAULT_IGNORED_DIRS,
     DEFAULT_PROG_RUNTIMES, BAD_PATH_KEYWORDS,
     # 【Beta 10.1 修复】 从 const 导入带路径的常量，而不是在本地硬编码
-    FILENAME_PROG_RUNTIMES, FILENAME_BAD_PATH_KEYWORDS
+    FILENAME_PROG_RUNTIMES, FILENAME_BAD_PATH_KEYWORDS,
+    FILENAME_RANK_WEIGHTS, DEFAULT_RANK_WEIGHTS, RANK_NEGATIVE_KEYWORDS, RANK_LAUNCHER_NAMES
 )
+# 规则行的规范化 (re: 正则保持原样，其余转小写)，语法说明见 core_rules
+from .core_rules import normalize_rule
 
 
 # --- 通用 IO ---
@@ -50,7 +54,7 @@ def _save_set_to_file(filename, data_set):
 # 1. 文件名黑名单
 def load_blocklist():
     s, m = _load_set_from_file(FILENAME_BLOCKLIST, DEFAULT_BLOCKLIST)
-    return {x.lower() for x in s}, m
+    return {normalize_rule(x) for x in s}, m
 
 
 def save_blocklist(s): return _save_set_to_file(FILENAME_BLOCKLIST, s)
@@ -70,7 +74,7 @@ def save_ignored_dirs(s): return _save_set_to_file(FILENAME_IGNORED_DIRS, s)
 # 3. 编程运行环境
 def load_prog_runtimes():
     s, m = _load_set_from_file(FILENAME_PROG_RUNTIMES, DEFAULT_PROG_RUNTIMES)
-    return {x.lower() for x in s}, m
+    return {normalize_rule(x) for x in s}, m
 
 
 def save_prog_runtimes(s): return _save_set_to_file(FILENAME_PROG_RUNTIMES, s)
@@ -82,4 +86,58 @@ def load_bad_path_keywords():
     return {x.lower() for x in s}, m
 
 
-def save_bad_path_keywords(s): return _save_set_to_file(FILENAME_BAD_PATH_KEYWORDS, s)
\ No newline at end of file
+def save_bad_path_keywords(s): return _save_set_to_file(FILENAME_BAD_PATH_KEYWORDS, s)
+
+
+# 5. 智能识别评分权重 (rank_weights.ini)
+def _parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def load_rank_rules(filename=FILENAME_RANK_WEIGHTS):
+    """
+    读取评分规则，返回 ({'weights', 'negative_keywords', 'launcher_names'}, 消息)，可直接传给 RankScorer(**rules)
+    文件不存在时写入默认值；单项写错时该项使用默认值
+    filename 可指向其他权重方案 (例如 benchmarks/bench_rank.py 调优得到的文件)
+    """
+    rules = {'weights': dict(DEFAULT_RANK_WEIGHTS), 'negative_keywords': list(RANK_NEGATIVE_KEYWORDS),
+             'launcher_names': list(RANK_LAUNCHER_NAMES)}
+    if not os.path.exists(filename):
+        save_rank_rules(rules, filename)
+        return rules, "创建默认规则"
+    parser = configparser.ConfigParser()
+    try:
+        parser.read(filename, encoding='utf-8')
+    except Exception:
+        return rules, "加载失败"
+    if parser.has_section('Weights'):
+        for key, value in parser['Weights'].items():
+            if key not in rules['weights']: continue
+            try:
+                rules['weights'][key] = _parse_number(value.strip())
+            except ValueError:
+                print(f"Rule Error: {key} = {value}")
+    if parser.has_section('Keywords'):
+        for key, name in (('negative', 'negative_keywords'), ('launcher', 'launcher_names')):
+            if key in parser['Keywords']:
+                rules[name] = [w.strip().lower() for w in parser['Keywords'][key].split(',') if w.strip()]
+    return rules, "加载规则完成"
+
+
+def save_rank_rules(rules, filename=FILENAME_RANK_WEIGHTS):
+    parser = configparser.ConfigParser()
+    parser['Weights'] = {k: str(v) for k, v in rules['weights'].items()}
+    parser['Keywords'] = {'negative': ', '.join(rules['negative_keywords']),
+                          'launcher': ', '.join(rules['launcher_names'])}
+    try:
+        folder = os.path.dirname(filename)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(filename, 'w', encoding='utf-8') as f:
+            parser.write(f)
+        return True, "保存成功"
+    except Exception as e:
+        return False, f"写入失败: {e}"
@@ -0,0 +1,294 @@
+# scanner_backend/utils_lnk.py
+# 纯 Python 的 .lnk (MS-SHLLINK) 解析器，不依赖 COM / Windows API
+import os
+import ntpath
+import codecs
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+LNK_HEADER_SIZE = 0x4C
+LNK_CLSID = bytes.fromhex('0114020000000000c000000000000046')
+
+# LinkFlags
+HAS_ID_LIST = 0x00000001
+HAS_LINK_INFO = 0x00000002
+HAS_NAME = 0x00000004
+HAS_RELATIVE_PATH = 0x00000008
+HAS_WORKING_DIR = 0x00000010
+HAS_ARGUMENTS = 0x00000020
+HAS_ICON_LOCATION = 0x00000040
+IS_UNICODE = 0x00000080
+FORCE_NO_LINK_INFO = 0x00000100
+HAS_EXP_STRING = 0x00000200
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK = 0x2
+
+# ExtraData
+ENVIRONMENT_BLOCK_SIGNATURE = 0xA0000001
+
+try:
+    codecs.lookup('mbcs')
+    ANSI_CODEC = 'mbcs'  # Windows: 系统当前代码页
+except LookupError:
+    ANSI_CODEC = 'cp1252'
+
+
+class LnkFormatError(ValueError):
+    pass
+
+
+def _cstr(buf, offset, unicode=False):
+    """读取以 \\0 结尾的字符串"""
+    if unicode:
+        end = offset
+        while end + 1 < len(buf) and (buf[end] or buf[end + 1]): end += 2
+        return bytes(buf[offset:end]).decode('utf-16-le', 'replace')
+    end = offset
+    while end < len(buf) and buf[end]: end += 1
+    return bytes(buf[offset:end]).decode(ANSI_CODEC, 'replace')
+
+
+def _parse_link_info(buf):
+    size, header_size, flags = struct.unpack_from('<III', buf, 0)
+    vol_off, base_off, net_off, suffix_off = struct.unpack_from('<IIII', buf, 12)
+    base_off_u = suffix_off_u = 0
+    if header_size >= 0x24:
+        base_off_u, suffix_off_u = struct.unpack_from('<II', buf, 28)
+
+    suffix = ''
+    if suffix_off_u:
+        suffix = _cstr(buf, suffix_off_u, True)
+    elif suffix_off:
+        suffix = _cstr(buf, suffix_off)
+
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        base = _cstr(buf, base_off_u, True) if base_off_u else _cstr(buf, base_off)
+        return base + suffix
+
+    if flags & COMMON_NETWORK_RELATIVE_LINK and net_off:
+        net = buf[net_off:]
+        net_name_off, = struct.unpack_from('<I', net, 8)
+        if net_name_off > 0x14:
+            net_name = _cstr(net, struct.unpack_from('<I', net, 20)[0], True)
+        else:
+            net_name = _cstr(net, net_name_off)
+        return ntpath.join(net_name, suffix) if suffix else net_name
+    return ''
+
+
+def _parse_id_list(buf):
+    """
+    从 Shell Item ID 列表中还原文件系统路径 (只处理 "我的电脑 -> 盘符 -> 文件夹/文件" 这一常见形式)
+    """
+    parts = []
+    pos = 0
+    while pos + 2 <= len(buf):
+        item_size, = struct.unpack_from('<H', buf, pos)
+        if item_size < 3 or pos + item_size > len(buf): break  # 结束标记或被截断
+        item = buf[pos:pos + item_size]
+        pos += item_size
+        kind = item[2] & 0x70
+        if kind == 0x20:  # 卷 (C:\)
+            parts = [_cstr(item, 3)]
+        elif kind == 0x30 and parts:  # 文件 / 文件夹
+            name = _file_entry_long_name(item)
+            if not name: return ''
+            parts.append(name)
+    if not parts: return ''
+    return ntpath.join(*parts)
+
+
+def _file_entry_long_name(item):
+    is_unicode = bool(item[2] & 0x04)
+    off = 14
+    short = _cstr(item, off, is_unicode)
+    off += (len(short) + 1) * (2 if is_unicode else 1)
+    if off % 2: off += 1
+
+    # 扩展块 0xBEEF0004 中保存长文件名
+    while off + 8 <= len(item):
+        ext_size, version, sig = struct.unpack_from('<HHI', item, off)
+        if ext_size < 8: break
+        if sig == 0xBEEF0004:
+            ext = item[off:off + ext_size]
+            name_off = 0x12
+            if version >= 7: name_off += 18
+            if version >= 3: name_off += 2
+            if version >= 9: name_off += 4
+            if version >= 8: name_off += 4
+            if name_off < len(ext):
+                return _cstr(ext, name_off, True)
+            break
+        off += ext_size
+    return short
+
+
+def _parse_extra_data(buf):
+    extra = {}
+    pos = 0
+    while pos + 8 <= len(buf):
+        block_size, sig = struct.unpack_from('<II', buf, pos)
+        if block_size < 4: break
+        if sig == ENVIRONMENT_BLOCK_SIGNATURE and block_size >= 0x314:
+            target = _cstr(buf, pos + 268, True) or _cstr(buf, pos + 8)
+            if target: extra['env_target'] = target
+        pos += block_size
+    return extra
+
+
+def parse_lnk(data, lnk_path=None):
+    """
+    解析 .lnk 文件内容 (bytes)
+    返回 dict: target / arguments / working_dir / icon_location / relative_path / name
+    target 的取值顺序与 WScript.Shell 的 TargetPath 一致：环境变量路径 > LinkInfo > IDList > 相对路径
+    """
+    buf = memoryview(data)
+    if len(buf) < LNK_HEADER_SIZE or struct.unpack_from('<I', buf, 0)[0] != LNK_HEADER_SIZE \
+            or bytes(buf[4:20]) != LNK_CLSID:
+        raise LnkFormatError("不是有效的 Shell Link 文件")
+
+    flags, = struct.unpack_from('<I', buf, 0x14)
+    is_unicode = bool(flags & IS_UNICODE)
+    pos = LNK_HEADER_SIZE
+
+    id_list_target = ''
+    if flags & HAS_ID_LIST:
+        id_size, = struct.unpack_from('<H', buf, pos)
+        id_list_target = _parse_id_list(buf[pos + 2:pos + 2 + id_size])
+        pos += 2 + id_size
+
+    link_info_target = ''
+    if flags & HAS_LINK_INFO:
+        li_size, = struct.unpack_from('<I', buf, pos)
+        if not flags & FORCE_NO_LINK_INFO:
+            link_info_target = _parse_link_info(buf[pos:pos + li_size])
+        pos += li_size
+
+    result = {'name': '', 'relative_path': '', 'working_dir': '', 'arguments': '', 'icon_location': ''}
+    for flag, key in ((HAS_NAME, 'name'), (HAS_RELATIVE_PATH, 'relative_path'),
+                      (HAS_WORKING_DIR, 'working_dir'), (HAS_ARGUMENTS, 'arguments'),
+                      (HAS_ICON_LOCATION, 'icon_location')):
+        if not flags & flag: continue
+        count, = struct.unpack_from('<H', buf, pos)
+        pos += 2
+        n_bytes = count * 2 if is_unicode else count
+        raw = bytes(buf[pos:pos + n_bytes])
+        result[key] = raw.decode('utf-16-le' if is_unicode else ANSI_CODEC, 'replace')
+        pos += n_bytes
+
+    extra = _parse_extra_data(buf[pos:])
+
+    target = ''
+    if flags & HAS_EXP_STRING and extra.get('env_target'):
+        target = ntpath.expandvars(extra['env_target'])
+    if not target: target = link_info_target or id_list_target
+    if not target and result['relative_path'] and lnk_path:
+        target = ntpath.normpath(ntpath.join(ntpath.dirname(lnk_path), result['relative_path']))
+
+    result['target'] = target
+    result['flags'] = flags
+    return result
+
+
+def read_lnk(lnk_path):
+    """读取并解析单个 .lnk 文件，失败 (含截断、损坏的文件) 返回 None"""
+    try:
+        with open(lnk_path, 'rb') as f:
+            return parse_lnk(f.read(), lnk_path)
+    except (OSError, ValueError, IndexError, struct.error):
+        return None
+
+
+def read_lnk_target(lnk_path):
+    info = read_lnk(lnk_path)
+    return info['target'] if info else None
+
+
+def read_lnk_targets(lnk_paths, max_workers=None):
+    """并行解析多个 .lnk，按输入顺序返回目标路径列表 (失败项为 None)"""
+    lnk_paths = list(lnk_paths)
+    if len(lnk_paths) < 32:
+        return [read_lnk_target(p) for p in lnk_paths]
+    workers = max_workers or min(16, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_lnk_target, lnk_paths, chunksize=16))
+
+
+# --- 序列化 (写入 .lnk) ---
+
+def _ansi_z(text):
+    return text.encode(ANSI_CODEC, 'replace') + b'\0'
+
+
+def _unicode_z(text):
+    return text.encode('utf-16-le') + b'\0\0'
+
+
+def _build_link_info(target):
+    needs_unicode = not target.isascii()
+    header_size = 0x24 if needs_unicode else 0x1C
+
+    if target.startswith('\\\\'):
+        # UNC 路径: \\server\share\rest -> CommonNetworkRelativeLink + CommonPathSuffix
+        parts = target[2:].split('\\', 2)
+        net_name = '\\\\' + '\\'.join(parts[:2])
+        suffix = parts[2] if len(parts) > 2 else ''
+        cnrl_header = 0x1C if needs_unicode else 0x14
+        net_ansi = _ansi_z(net_name)
+        cnrl_body = net_ansi
+        uni_fields = b''
+        if needs_unicode:
+            uni_fields = struct.pack('<II', cnrl_header + len(net_ansi), 0)
+            cnrl_body += _unicode_z(net_name)
+        cnrl = struct.pack('<IIIII', cnrl_header + len(cnrl_body), 0, cnrl_header, 0, 0) + uni_fields + cnrl_body
+
+        net_off = header_size
+        suffix_off = net_off + len(cnrl)
+        suffix_ansi = _ansi_z(suffix)
+        offsets = [0, 0, net_off, suffix_off]
+        body = cnrl + suffix_ansi
+        flags = COMMON_NETWORK_RELATIVE_LINK
+        if needs_unicode:
+            offsets += [0, suffix_off + len(suffix_ansi)]
+            body += _unicode_z(suffix)
+    else:
+        # 本地路径: VolumeID (固定磁盘，空卷标) + LocalBasePath
+        volume_id = struct.pack('<IIII', 0x11, 3, 0, 0x10) + b'\0'
+        base_ansi = _ansi_z(target)
+        vol_off = header_size
+        base_off = vol_off + len(volume_id)
+        suffix_off = base_off + len(base_ansi)
+        offsets = [vol_off, base_off, 0, suffix_off]
+        body = volume_id + base_ansi + b'\0'
+        flags = VOLUME_ID_AND_LOCAL_BASE_PATH
+        if needs_unicode:
+            base_u_off = suffix_off + 1
+            offsets += [base_u_off, base_u_off + len(_unicode_z(target))]
+            body += _unicode_z(target) + _unicode_z('')
+
+    header = struct.pack('<III', header_size + len(body), header_size, flags) + struct.pack(
+        '<%dI' % len(offsets), *offsets)
+    return header + body
+
+
+def build_lnk(target, arguments='', working_dir='', icon_location='', icon_index=0):
+    """
+    生成 .lnk 文件内容 (bytes)
+    只写入 LinkInfo + StringData (Unicode)，不生成 IDList，Explorer 会按 LinkInfo 中的路径解析
+    """
+    flags = HAS_LINK_INFO | IS_UNICODE
+    strings = b''
+    for flag, value in ((HAS_WORKING_DIR, working_dir), (HAS_ARGUMENTS, arguments),
+                        (HAS_ICON_LOCATION, icon_location)):
+        if not value: continue
+        flags |= flag
+        strings += struct.pack('<H', len(value.encode('utf-16-le')) // 2) + value.encode('utf-16-le')
+
+    header = struct.pack('<I16sII', LNK_HEADER_SIZE, LNK_CLSID, flags, 0)
+    header += b'\0' * 24  # Creation / Access / Write time
+    header += struct.pack('<IiIH', 0, icon_index, 1, 0)  # FileSize / IconIndex / SW_SHOWNORMAL / HotKey
+    header += b'\0' * 10  # Reserved
+
+    return header + _build_link_info(target) + strings + b'\0\0\0\0'
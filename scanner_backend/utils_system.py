@@ -1,9 +1,10 @@
 # scanner_backend/utils_system.py
 import os
-import win32com.client
+from .utils_lnk import read_lnk_targets
 
 def create_shortcut(target_path, shortcut_path, args=""):
     try:
+        import win32com.client
         shell = win32com.client.Dispatch("WScript.Shell")
         shortcut = shell.CreateShortCut(shortcut_path)
         # UWP 逻辑
@@ -30,15 +31,11 @@ def scan_existing_shortcuts(folder_path):
     results = []
     if not os.path.exists(folder_path): return results
     try:
-        shell = win32com.client.Dispatch("WScript.Shell")
-        for file in os.listdir(folder_path):
-            if file.lower().endswith(".lnk"):
-                full_path = os.path.join(folder_path, file)
-                try:
-                    shortcut = shell.CreateShortCut(full_path)
-                    results.append((file, shortcut.TargetPath))
-                except:
-                    results.append((file, "无法读取目标"))
+        # 直接解析 .lnk 二进制，不再逐个走 COM
+        files = [f for f in os.listdir(folder_path) if f.lower().endswith(".lnk")]
+        targets = read_lnk_targets(os.path.join(folder_path, f) for f in files)
+        for file, target in zip(files, targets):
+            results.append((file, target if target is not None else "无法读取目标"))
     except: pass
     return results
 
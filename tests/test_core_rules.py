@@ -0,0 +1,48 @@
+"""
+黑洞目录的路径规则：字面量、通配符写法中的 \\ 与 / 等价，且不区分大小写
+
+用法:
+    python -m pytest tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend.core_rules import CompiledRules
+
+
+def rules(*ignored):
+    return CompiledRules(ignored_dirs=ignored, detect_junk=False)
+
+
+class PathRuleTest(unittest.TestCase):
+    def test_literal_backslash_rule(self):
+        r = rules('C:\\Windows\\Temp')
+        self.assertTrue(r.skip_dir('C:\\Windows\\Temp'))
+        self.assertTrue(r.skip_dir('c:\\windows\\TEMP'))
+        self.assertTrue(r.skip_dir('C:/Windows/Temp'))
+        self.assertFalse(r.skip_dir('C:\\Windows\\Temp2'))
+        self.assertFalse(r.skip_dir('C:\\Windows'))
+
+    def test_literal_trailing_separator(self):
+        r = rules('D:\\Games\\Cache\\')
+        self.assertTrue(r.skip_dir('D:\\Games\\Cache'))
+
+    def test_literal_forward_slash_rule(self):
+        self.assertTrue(rules('c:/program files/common files').skip_dir('C:\\Program Files\\Common Files'))
+
+    def test_glob_rule(self):
+        r = rules('*\\steamapps\\common\\*\\_CommonRedist')
+        self.assertTrue(r.skip_dir('D:\\Steam\\steamapps\\common\\Game\\_CommonRedist'))
+        self.assertFalse(r.skip_dir('D:\\Steam\\steamapps\\common\\Game'))
+
+    def test_name_rules_unaffected(self):
+        r = rules('node_modules', 'C:\\Windows\\Temp')
+        self.assertTrue(r.prune_dir('node_modules'))
+        self.assertFalse(r.skip_dir('D:\\Apps\\node_modules'))  # 目录名规则由 prune_dir 处理
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+自定义目录扫描：并行遍历的输出顺序固定，去重时保留的同名程序不随线程调度变化
+
+用法:
+    python -m pytest tests
+"""
+import configparser
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend import core_discovery
+from scanner_backend.const import DEFAULT_CONFIG
+from scanner_backend.core_walker import ParallelWalker
+
+RUNS = 5
+
+
+def build_tree(base, seed=7):
+    """多个厂商目录下各有一个同名的 Tool/Tool.exe，外加随机深度的其他程序"""
+    rng = random.Random(seed)
+    for v in range(30):
+        vendor = os.path.join(base, f"Vendor{v:02d}")
+        tool = os.path.join(vendor, *(f"sub{i}" for i in range(rng.randint(0, 3))), 'Tool')
+        os.makedirs(tool)
+        open(os.path.join(tool, 'Tool.exe'), 'wb').close()
+        for a in range(rng.randint(1, 4)):
+            app = os.path.join(vendor, f"App{v}_{a}")
+            os.makedirs(app)
+            open(os.path.join(app, f"App{v}_{a}.exe"), 'wb').close()
+
+
+def preorder(top):
+    """os.walk 先序，同级目录按 ParallelWalker 的排序规则"""
+    result = []
+    for path, dirs, _ in os.walk(top):
+        dirs.sort(key=lambda d: (d.lower(), d))
+        result.append(path)
+    return result
+
+
+class DeterministicScanTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)  # 规则文件 (config/*.txt、rank_weights.ini) 写在临时目录中
+        self.root = os.path.join(self.tmp.name, 'Apps')
+        build_tree(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def scan(self):
+        conf = configparser.ConfigParser()
+        conf['Rules'] = dict(DEFAULT_CONFIG, enable_deduplication='true', enable_incremental_scan='false',
+                             enable_process_rank='false', scan_threads='8')
+        with mock.patch.object(core_discovery, 'load_config', return_value=conf):
+            return [(r['name'], r['root_path'], r['selected_exes'])
+                    for r in core_discovery.discover_programs_generator(['custom'], self.root, [], [])]
+
+    def test_walker_order_is_preorder(self):
+        expected = preorder(self.root)
+        for _ in range(RUNS):
+            walker = ParallelWalker(workers=8)
+            self.assertEqual([v.path for v in walker.walk(self.root)], expected)
+
+    def test_callback_error_is_raised(self):
+        def match_file(name):
+            if name == 'Tool.exe': raise RuntimeError('bad rule')
+            return True
+
+        with self.assertRaises(RuntimeError):
+            list(ParallelWalker(workers=8, match_file=match_file).walk(self.root))
+        with self.assertRaises(ZeroDivisionError):
+            list(ParallelWalker(workers=8, skip_dir=lambda p: p.endswith('Vendor17') and 1 / 0).walk(self.root))
+
+    def test_dedup_survivor_is_stable(self):
+        first = self.scan()
+        tools = [r for r in first if r[0] == 'Tool']
+        self.assertEqual(len(tools), 1)
+        self.assertTrue(tools[0][1].startswith(os.path.join(self.root, 'Vendor00')))
+        for _ in range(RUNS - 1):
+            self.assertEqual(self.scan(), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+图标加载服务：cancel() 之后不再引用该组 (视图关闭后可以被回收)，迟到的结果被丢弃
+
+用法:
+    python -m pytest tests
+"""
+import gc
+import os
+import sys
+import threading
+import time
+import unittest
+import weakref
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QImage
+
+from ui.icon_loader import IconLoader
+
+app = QApplication.instance() or QApplication([])
+
+
+class FakeCache:
+    """内存未命中；load_image 等待放行后返回一张图片"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.delivered = []
+
+    def memory_pixmap(self, path, px):
+        return None
+
+    def load_image(self, path, px):
+        self.release.wait(5)
+        return (1, 1), QImage(px, px, QImage.Format.Format_ARGB32)
+
+    def put_image(self, path, px, st, image):
+        self.delivered.append(path)
+        return None
+
+    def fallback_icon(self, path):
+        return None
+
+
+class Group:
+    pass
+
+
+class IconLoaderCancelTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = FakeCache()
+        self.loader = IconLoader(self.cache, workers=2)
+
+    def tearDown(self):
+        self.cache.release.set()
+        self.loader.shutdown()
+
+    def test_cancel_releases_group(self):
+        group = Group()
+        ref = weakref.ref(group)
+        for i in range(20): self.loader.request(group, f'C:\\app{i}.exe', 32, lambda icon: None)
+        time.sleep(0.05)  # 两个请求已被工作线程取走，其余仍在队列中
+        self.loader.cancel(group)
+        self.cache.release.set()
+        deadline = time.monotonic() + 2
+        while self.loader._results and time.monotonic() < deadline: time.sleep(0.01)
+        time.sleep(0.05)
+        self.loader._deliver()
+
+        self.assertEqual(self.cache.delivered, [])  # 取消前已取走的结果到达后被丢弃
+        for table in (self.loader._gen, self.loader._state, self.loader._callbacks):
+            self.assertFalse(any(k is group or (isinstance(k, tuple) and k[0] is group) for k in table))
+        self.assertFalse(any(e[2][0] is group for e in self.loader._heap + self.loader._extract))
+        del group
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_request_after_cancel_is_delivered(self):
+        group = Group()
+        self.loader.request(group, 'C:\\a.exe', 32, lambda icon: None)
+        self.loader.cancel(group)
+        got = []
+        self.loader.request(group, 'C:\\a.exe', 32, got.append)
+        self.cache.release.set()
+        deadline = time.monotonic() + 2
+        while not got and time.monotonic() < deadline:
+            time.sleep(0.01)
+            self.loader._deliver()
+        self.assertEqual(len(got), 1)
+        self.assertEqual(self.cache.delivered, ['C:\\a.exe'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+开始菜单扫描与输出目录的快捷方式冲突检查：在临时目录中写入 .lnk，检查两个调用方读到的目标
+
+用法:
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend.core_discovery import scan_start_menu
+from scanner_backend.core_rules import RuleSet
+from scanner_backend.core_shortcuts import build_shortcut_bytes, create_shortcuts_batch
+from scanner_backend.utils_lnk import build_lnk, read_lnk
+from scanner_backend.utils_system import scan_existing_shortcuts
+
+TARGETS = {
+    'Notepad++': 'C:\\Program Files\\Notepad++\\notepad++.exe',
+    '微信': 'C:\\Program Files (x86)\\Tencent\\微信\\WeChat.exe',  # LinkInfo 中的 Unicode 路径
+    'Tools': '\\\\fileserver\\share\\Tools\\tool.exe',  # UNC: CommonNetworkRelativeLink
+    'Readme': 'C:\\Program Files\\App\\readme.txt',  # 不是 exe
+    'Uninstall': 'C:\\Program Files\\App\\unins000.exe',  # 黑名单
+}
+
+
+class LnkFixture(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, folder, name, data):
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+
+class StartMenuTest(LnkFixture):
+    def test_scan_start_menu(self):
+        user = os.path.join(self.dir, 'AppData', 'Programs')
+        common = os.path.join(self.dir, 'ProgramData', 'Programs')
+        self.write(user, 'Notepad++.lnk', build_lnk(TARGETS['Notepad++']))
+        self.write(os.path.join(user, 'Tencent'), '微信.lnk', build_lnk(TARGETS['微信']))
+        self.write(common, 'Tools.lnk', build_lnk(TARGETS['Tools']))
+        self.write(common, 'Readme.lnk', build_lnk(TARGETS['Readme']))
+        self.write(common, 'Uninstall.lnk', build_lnk(TARGETS['Uninstall']))
+        self.write(common, 'Broken.lnk', build_lnk(TARGETS['Notepad++'])[:90])
+        self.write(common, 'notes.txt', b'not a shortcut')
+
+        found = list(scan_start_menu(RuleSet(['unins*.exe']), roots=[user, common, os.path.join(self.dir, 'none')]))
+        got = sorted((item['name'], item['path'], item['root']) for item in found)
+        self.assertEqual(got, sorted([
+            ('Notepad++', TARGETS['Notepad++'], user),
+            ('微信', TARGETS['微信'], os.path.join(user, 'Tencent')),
+            ('Tools', TARGETS['Tools'], common),
+        ]))
+        self.assertTrue(all(item['type'] == 'start_menu' for item in found))
+
+
+class ExistingShortcutsTest(LnkFixture):
+    def test_round_trip_through_core_shortcuts(self):
+        out = os.path.join(self.dir, 'out')
+        os.makedirs(out)
+        tasks = [(name, target, os.path.join(out, name + '.lnk'), '', 'custom') for name, target in TARGETS.items()]
+        tasks.append(('Calculator', 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App',
+                      os.path.join(out, 'Calculator.lnk'),
+                      'shell:AppsFolder\\Microsoft.WindowsCalculator_8wekyb3d8bbwe!App', 'uwp'))
+        results = create_shortcuts_batch(tasks)
+        self.assertEqual(len(results), len(tasks))
+        self.assertTrue(all(ok for _, ok, _ in results))
+        self.assertEqual(sorted(f for f in os.listdir(out) if not f.endswith('.lnk')), [])  # 没有残留临时文件
+
+        self.write(out, 'Broken.lnk', b'\x4c\x00\x00\x00garbage')
+        found = dict(scan_existing_shortcuts(out))
+        for name, target in TARGETS.items():
+            self.assertEqual(found[name + '.lnk'], target)
+        self.assertEqual(found['Broken.lnk'], '无法读取目标')
+        self.assertTrue(found['Calculator.lnk'].lower().endswith('explorer.exe'))
+
+        info = read_lnk(os.path.join(out, 'Calculator.lnk'))
+        self.assertEqual(info['arguments'], tasks[-1][3])
+        self.assertEqual(info['icon_location'], info['target'])
+
+    def test_shortcut_bytes_fields(self):
+        data = build_shortcut_bytes(TARGETS['微信'])
+        info = read_lnk(self.write(self.dir, 'x.lnk', data))
+        self.assertEqual(info['target'], TARGETS['微信'])
+        self.assertEqual(info['icon_location'], TARGETS['微信'])
+        self.assertEqual(info['working_dir'], '')  # 目标在本机不存在时不写工作目录
+
+
+if __name__ == '__main__':
+    unittest.main()
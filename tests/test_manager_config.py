@@ -0,0 +1,94 @@
+"""
+配置服务：已发布的配置对象不被原地修改，load_config() 的副本互不影响，保存只提交改动过的项
+
+用法:
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend.manager_config import ConfigService
+
+
+class ConfigServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'config.ini')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("[Settings]\ntheme = dark\noutput_path = D:\\Out\n\n[Rules]\nscan_threads = 4\n")
+        self.service = ConfigService(self.path)
+
+    def tearDown(self):
+        self.service.flush()
+        self.tmp.cleanup()
+
+    def rewrite(self, text):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.utime(self.path, ns=(1, os.stat(self.path).st_mtime_ns + 10 ** 9))
+        self.service._checked = 0.0  # 下一次 current() 立即检查 mtime
+
+    def test_reload_replaces_object(self):
+        old = self.service.current()
+        self.rewrite("[Settings]\ntheme = light\n")
+        new = self.service.current()
+        self.assertIsNot(new, old)
+        self.assertEqual(old.get('Settings', 'theme'), 'dark')
+        self.assertEqual(old.get('Settings', 'output_path'), 'D:\\Out')
+        self.assertEqual(new.get('Settings', 'theme'), 'light')
+        self.assertFalse(new.has_option('Settings', 'output_path'))
+        self.assertEqual(new.get('Rules', 'scan_threads', fallback=None), '0')  # 默认值补全
+
+    def test_unsaved_snapshot_edit_is_private(self):
+        snap = self.service.snapshot()
+        snap['Settings']['theme'] = 'light'
+        self.assertEqual(self.service.get('Settings', 'theme'), 'dark')
+        self.assertEqual(self.service.snapshot().get('Settings', 'theme'), 'dark')
+
+    def test_stale_snapshot_saves_only_its_changes(self):
+        stale = self.service.snapshot()
+        self.service.set('Settings', 'output_path', 'E:\\New')
+        stale['Settings']['theme'] = 'light'
+        self.service.save(stale)
+        self.assertEqual(self.service.get('Settings', 'theme'), 'light')
+        self.assertEqual(self.service.get('Settings', 'output_path'), 'E:\\New')
+        # 再次保存同一副本时只提交之后的新修改
+        self.service.set('Settings', 'theme', 'dark')
+        stale['Rules']['scan_threads'] = '8'
+        self.service.save(stale)
+        self.assertEqual(self.service.get('Settings', 'theme'), 'dark')
+        self.assertEqual(self.service.getint('Rules', 'scan_threads'), 8)
+
+    def test_save_writes_file(self):
+        self.service.set('Settings', 'theme', 'light')
+        self.service.flush()
+        self.assertIn('theme = light', open(self.path, encoding='utf-8').read())
+
+    def test_reader_never_sees_partial_reload(self):
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                if self.service.current().get('Rules', 'target_extensions', fallback=None) is None:
+                    errors.append('missing')
+
+        t = threading.Thread(target=reader)
+        t.start()
+        try:
+            for i in range(200):
+                self.rewrite(f"[Settings]\ntheme = t{i}\n\n[Rules]\nscan_threads = {i}\n")
+                self.service.current()
+        finally:
+            done.set()
+            t.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
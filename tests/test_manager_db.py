@@ -0,0 +1,60 @@
+"""
+目录索引 (cache.db 的 dir_index)：按根目录读取时不能读到前缀相同的兄弟目录
+
+用法:
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend import manager_db
+
+
+class DirIndexPrefixTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(manager_db, 'DB_FILE_CACHE', os.path.join(self.tmp.name, 'cache.db'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        manager_db._init_cache_db()
+
+    def tearDown(self):
+        manager_db.close_databases()
+        self.tmp.cleanup()
+
+    def save(self, *paths):
+        manager_db.save_dir_index([(p, 1.0, [], [], None) for p in paths], 'sig')
+
+    def test_sibling_prefix_not_loaded(self):
+        root = os.path.join(self.tmp.name, 'Apps')
+        sibling = root + '2'
+        self.save(root, os.path.join(root, 'a'), sibling, os.path.join(sibling, 'b'))
+        self.assertEqual(set(manager_db.load_dir_index(root, 'sig')), {root, os.path.join(root, 'a')})
+        self.assertEqual(set(manager_db.load_dir_index(sibling, 'sig')), {sibling, os.path.join(sibling, 'b')})
+        # 根目录带结尾分隔符时同样只取自身子目录
+        self.assertIn(os.path.join(root, 'a'), manager_db.load_dir_index(root + os.sep, 'sig'))
+
+    def test_like_wildcards_in_root(self):
+        root = os.path.join(self.tmp.name, 'my_app%')
+        other = os.path.join(self.tmp.name, 'myXappXX')
+        self.save(os.path.join(root, 'bin'), os.path.join(other, 'bin'))
+        self.assertEqual(set(manager_db.load_dir_index(root, 'sig')), {os.path.join(root, 'bin')})
+
+    def test_case_sensitive_match(self):
+        root = os.path.join(self.tmp.name, 'Apps')
+        self.save(os.path.join(root, 'a'), os.path.join(self.tmp.name, 'APPS', 'b'))
+        self.assertEqual(set(manager_db.load_dir_index(root, 'sig')), {os.path.join(root, 'a')})
+
+    def test_rules_signature(self):
+        root = os.path.join(self.tmp.name, 'Apps')
+        self.save(os.path.join(root, 'a'))
+        self.assertEqual(manager_db.load_dir_index(root, 'other'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
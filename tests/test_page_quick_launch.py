@@ -0,0 +1,70 @@
+"""
+启动台模型 / 搜索代理：有查询时删除中间的行，代理仍映射到正确的源行
+
+用法:
+    python -m pytest tests
+"""
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+from ui.page_quick_launch import SearchProxy, ShortcutListModel, SidRole
+
+app = QApplication.instance() or QApplication([])
+
+NAMES = ['apple', 'apricot', 'banana', 'appstore', 'applet']
+
+
+def db_row(sid, name):
+    return {'id': sid, 'name': name, 'exe_path': f'C:\\Apps\\{name}.exe', 'lnk_path': '', 'source_type': 'custom',
+            'args': '', 'run_count': 0, 'added_at': '2024-01-01 00:00:00', 'frecency': None}
+
+
+class SearchProxyRemoveTest(unittest.TestCase):
+    def setUp(self):
+        self.rows = {k + 1: db_row(k + 1, name) for k, name in enumerate(NAMES)}
+        self.model = ShortcutListModel()
+        self.model.set_rows(self.rows.values())
+        # 按名称包含查询词匹配，顺序固定为 id 顺序 (与源模型的名称排序不同，才能暴露行号错位)
+        self.proxy = SearchProxy(lambda q: [sid for sid, r in self.rows.items() if q in r['name']])
+        self.proxy.setSourceModel(self.model)
+        self.proxy.set_query('ap')
+
+    def shown(self):
+        return [self.proxy.index(k).data() for k in range(self.proxy.rowCount())]
+
+    def check_mapping(self):
+        for k in range(self.proxy.rowCount()):
+            idx = self.proxy.index(k)
+            self.assertEqual(self.rows[idx.data(SidRole)]['name'], idx.data())
+
+    def test_remove_middle_row(self):
+        self.assertEqual(self.shown(), ['apple', 'apricot', 'appstore', 'applet'])
+        sid = next(s for s, r in self.rows.items() if r['name'] == 'applet')
+        del self.rows[sid]
+        self.model.apply_rows([], removed_ids=[sid])
+        self.assertEqual(self.shown(), ['apple', 'apricot', 'appstore'])
+        self.check_mapping()
+
+    def test_full_refresh_after_delete(self):
+        sid = next(s for s, r in self.rows.items() if r['name'] == 'apple')
+        del self.rows[sid]
+        self.model.set_rows(self.rows.values())
+        self.assertEqual(self.shown(), ['apricot', 'appstore', 'applet'])
+        self.check_mapping()
+
+    def test_rename_moves_row(self):
+        sid = next(s for s, r in self.rows.items() if r['name'] == 'apricot')
+        self.rows[sid] = db_row(sid, 'zap')
+        self.model.apply_rows([self.rows[sid]])
+        self.assertEqual(self.shown(), ['apple', 'zap', 'appstore', 'applet'])
+        self.check_mapping()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+utils_lnk 解析器：截断 / 损坏的 .lnk 只让该文件失败 (返回 None)，不影响其余文件
+
+用法:
+    python -m pytest tests
+"""
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner_backend.utils_lnk import HAS_ID_LIST, LNK_CLSID, LNK_HEADER_SIZE, build_lnk, read_lnk, read_lnk_targets
+
+
+def id_list_lnk():
+    """只含 IDList 的快捷方式：我的电脑 -> C:\\ -> app.exe"""
+    root = struct.pack('<HBB', 0x14, 0x1F, 0x50) + bytes(16)
+    volume = b'\x2fC:\\' + bytes(19)
+    volume = struct.pack('<H', len(volume) + 2) + volume
+    entry = b'\x32\x00' + bytes(10) + b'app.exe\0'
+    entry = struct.pack('<H', len(entry) + 2) + entry
+    items = root + volume + entry + b'\0\0'
+    header = struct.pack('<I', LNK_HEADER_SIZE) + LNK_CLSID + struct.pack('<I', HAS_ID_LIST)
+    header += bytes(LNK_HEADER_SIZE - len(header))
+    return header + struct.pack('<H', len(items)) + items
+
+
+class TruncatedLnkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_id_list_target(self):
+        info = read_lnk(self.write('ok.lnk', id_list_lnk()))
+        self.assertEqual(info['target'], 'C:\\app.exe')
+
+    def test_every_truncation_is_tolerated(self):
+        for data in (id_list_lnk(), build_lnk('C:\\Program Files\\App\\app.exe', arguments='-x')):
+            for n in range(len(data)):
+                path = self.write('cut.lnk', data[:n])
+                try:
+                    read_lnk(path)
+                except Exception as e:
+                    self.fail(f"截断到 {n} 字节时抛出 {type(e).__name__}: {e}")
+
+    def test_item_larger_than_id_list(self):
+        # 第二项声明 100 字节，但文件在长度字段之后就结束了
+        data = id_list_lnk()[:LNK_HEADER_SIZE + 2 + 0x14] + struct.pack('<H', 100)
+        info = read_lnk(self.write('bad.lnk', data))
+        self.assertIsNotNone(info)
+        self.assertEqual(info['target'], '')
+
+    def test_bad_file_does_not_abort_batch(self):
+        good = self.write('good.lnk', build_lnk('C:\\App\\app.exe'))
+        bad = self.write('bad.lnk', id_list_lnk()[:LNK_HEADER_SIZE + 2 + 0x14] + struct.pack('<H', 100))
+        targets = read_lnk_targets([good, bad] * 20)
+        self.assertEqual(targets, ['C:\\App\\app.exe', ''] * 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,17 @@ from PySide6.QtGui import QCursor
 import scanner_backend as backend
 
 
+RULE_HELP_FILES = ("文件名(一行一个)，支持:\n"
+                   "  unins000.exe  完整文件名 (不区分大小写)\n"
+                   "  unins*.exe  通配符 * ? [...]\n"
+                   "  re:^unins\\d+\\.exe$  正则表达式 (以 re: 开头)")
+RULE_HELP_DIRS = ("目录名(一行一个)，支持:\n"
+                  "  node_modules  完整目录名 (不区分大小写)\n"
+                  "  cache*  通配符 * ? [...]\n"
+                  "  re:^temp\\d*$  正则表达式 (以 re: 开头)\n"
+                  "  */steamapps/common/*/_commonredist  含 / 的规则按完整路径匹配 (用 / 分隔)")
+
+
 class ListEditDialog(QDialog):
     def __init__(self, parent, title, data_set, help_text):
         super().__init__(parent)
@@ -160,6 +171,14 @@ class RulesDialog(QDialog):
         h_dedup.addWidget(lbl_sens);
         h_dedup.addStretch()
         l_adv.addLayout(h_dedup)
+
+        self.chk_incremental = QCheckBox("增量扫描：跳过未变化的目录 (Incremental)")
+        self.chk_incremental.setToolTip("复用上次扫描的目录索引，只重新分析修改过的文件夹。")
+        l_adv.addWidget(self.chk_incremental)
+
+        self.chk_process_rank = QCheckBox("多进程排序：大型目录树使用多个 CPU 核心 (Multi-Process)")
+        self.chk_process_rank.setToolTip("可执行文件很多时，把智能识别的评分排序分给多个进程并行计算。\n启动进程有额外开销，小目录无需开启。")
+        l_adv.addWidget(self.chk_process_rank)
         layout.addWidget(g_adv)
 
         # Bot
@@ -198,17 +217,19 @@ class RulesDialog(QDialog):
 
         self.chk_smart.setChecked(r.getboolean('enable_smart_root', True))
         self.chk_dedup.setChecked(r.getboolean('enable_deduplication', True))
+        self.chk_incremental.setChecked(r.getboolean('enable_incremental_scan', True))
+        self.chk_process_rank.setChecked(r.getboolean('enable_process_rank', False))
 
     def edit_blacklist(self):
-        d = ListEditDialog(self, "编辑黑名单", self.blocklist, "文件名(一行一个):");
+        d = ListEditDialog(self, "编辑黑名单", self.blocklist, RULE_HELP_FILES);
         if d.exec(): self.blocklist = d.get_data(); backend.save_blocklist(self.blocklist)
 
     def edit_ignored(self):
-        d = ListEditDialog(self, "编辑黑洞目录", self.ignored_dirs, "目录名(一行一个):");
+        d = ListEditDialog(self, "编辑黑洞目录", self.ignored_dirs, RULE_HELP_DIRS);
         if d.exec(): self.ignored_dirs = d.get_data(); backend.save_ignored_dirs(self.ignored_dirs)
 
     def edit_prog(self):
-        d = ListEditDialog(self, "编辑运行环境名单", self.prog_runtimes, "文件名(一行一个):");
+        d = ListEditDialog(self, "编辑运行环境名单", self.prog_runtimes, RULE_HELP_FILES);
         if d.exec(): self.prog_runtimes = d.get_data(); backend.manager_rules.save_prog_runtimes(self.prog_runtimes)
 
     def edit_bad_path(self):
@@ -235,6 +256,8 @@ class RulesDialog(QDialog):
 
         r['enable_smart_root'] = str(self.chk_smart.isChecked());
         r['enable_deduplication'] = str(self.chk_dedup.isChecked())
+        r['enable_incremental_scan'] = str(self.chk_incremental.isChecked())
+        r['enable_process_rank'] = str(self.chk_process_rank.isChecked())
 
         backend.save_config(self.config)
         self.accept()
\ No newline at end of file
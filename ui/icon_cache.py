@@ -0,0 +1,137 @@
+from PySide6.QtWidgets import QFileIconProvider
+from PySide6.QtCore import QFileInfo, QBuffer, QByteArray, QIODevice, QTimer
+from PySide6.QtGui import QIcon, QPixmap, QImage
+from collections import OrderedDict
+import os
+import scanner_backend as backend
+
+DEFAULT_PX = 32  # 列表/表格里的小图标 (高 DPI 下显示为 16 也足够清晰)
+MEMORY_CAPACITY = 1024  # 内存 LRU 条数
+FLUSH_DELAY_MS = 500  # 新图标攒一批再写库
+
+
+class IconCache:
+    """
+    两级图标缓存 (除 load_image 外只在 GUI 线程使用)
+    1. 内存 LRU：{(路径, 尺寸, mtime, 大小): QPixmap}
+    2. cache.db icon_cache：PNG，按 (路径, 尺寸) 存储，mtime / 大小不一致即失效
+    都未命中时才调用 QFileIconProvider (访问文件系统 + Shell)，结果回写两级缓存
+    """
+
+    def __init__(self, capacity=MEMORY_CAPACITY, max_db_mb=None):
+        self.capacity = capacity
+        if max_db_mb is None:
+            max_db_mb = backend.config_getint('Settings', 'icon_cache_max_mb', 64)
+        self.max_db_bytes = max_db_mb * 1024 * 1024
+        self._lru = OrderedDict()
+        self._provider = QFileIconProvider()
+        self._pending = []  # 待写库的新图标
+        self._touched = []  # 命中数据库的记录，写库时刷新使用时间
+        self._flush_scheduled = False
+
+    def icon(self, path, px=DEFAULT_PX):
+        """返回 path 的 QIcon；文件不存在时交给 QFileIconProvider 给出默认图标"""
+        pixmap = self.pixmap(path, px)
+        return QIcon(pixmap) if pixmap is not None else self.fallback_icon(path)
+
+    def pixmap(self, path, px=DEFAULT_PX):
+        pixmap = self.memory_pixmap(path, px)
+        if pixmap is not None: return pixmap
+        st, image = self.load_image(path, px)
+        if st is None: return None
+        if image is not None: return self.put_image(path, px, st, image)
+        return self.extract(path, px, st)
+
+    # --- 分步接口 (IconLoader 使用)：load_image 可在工作线程调用，其余只能在 GUI 线程 ---
+
+    def memory_pixmap(self, path, px):
+        """只查内存 LRU"""
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError, TypeError):
+            return None
+        key = (path, px, st.st_mtime, st.st_size)
+        pixmap = self._lru.get(key)
+        if pixmap is not None: self._lru.move_to_end(key)
+        return pixmap
+
+    def load_image(self, path, px):
+        """
+        线程安全：stat + 查数据库 + 解码 PNG
+        返回 (stat_result, QImage)；数据库未命中时 QImage 为 None，文件不存在时 stat_result 为 None
+        """
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError, TypeError):
+            return None, None
+        blob = backend.load_icon_blob(path, px, st.st_mtime, st.st_size)
+        if blob:
+            image = QImage()
+            if image.loadFromData(blob, "PNG"): return st, image
+        return st, None
+
+    def put_image(self, path, px, st, image):
+        """把数据库中读出的图标放入内存 LRU，返回 QPixmap"""
+        pixmap = QPixmap.fromImage(image)
+        self._touched.append((path, px))
+        self._schedule_flush()
+        self._remember((path, px, st.st_mtime, st.st_size), pixmap)
+        return pixmap
+
+    def extract(self, path, px, st):
+        """两级缓存都未命中：调用 QFileIconProvider 提取，并回写两级缓存"""
+        pixmap = self._provider.icon(QFileInfo(path)).pixmap(px, px)
+        if pixmap.isNull(): return None
+        self._pending.append((path, px, st.st_mtime, st.st_size, self._to_png(pixmap)))
+        self._schedule_flush()
+        self._remember((path, px, st.st_mtime, st.st_size), pixmap)
+        return pixmap
+
+    def fallback_icon(self, path):
+        """文件不存在等情况下的系统默认图标 (不缓存)"""
+        return self._provider.icon(QFileInfo(path))
+
+    def _remember(self, key, pixmap):
+        self._lru[key] = pixmap
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.capacity: self._lru.popitem(last=False)
+
+    def flush(self):
+        """把新图标与使用时间写入 cache.db，超出容量上限时淘汰最久未用的记录"""
+        self._flush_scheduled = False
+        if not self._pending and not self._touched: return
+        pending, touched = self._pending, self._touched
+        self._pending, self._touched = [], []
+        backend.save_icon_blobs(pending, touched)
+        if pending: backend.trim_icon_cache(self.max_db_bytes)
+
+    def invalidate(self, path=None):
+        """清除内存中的缓存 (path 为 None 时全部清除)；数据库中的记录依靠 mtime / 大小自动失效"""
+        if path is None:
+            self._lru.clear()
+            return
+        for key in [k for k in self._lru if k[0] == path]: del self._lru[key]
+
+    def _schedule_flush(self):
+        if self._flush_scheduled: return
+        self._flush_scheduled = True
+        QTimer.singleShot(FLUSH_DELAY_MS, self.flush)
+
+    @staticmethod
+    def _to_png(pixmap):
+        data = QByteArray()
+        buf = QBuffer(data)
+        buf.open(QIODevice.WriteOnly)
+        pixmap.save(buf, "PNG")
+        buf.close()
+        return bytes(data)
+
+
+_instance = None
+
+
+def get_icon_cache():
+    """全局共享的图标缓存 (首次调用时创建)"""
+    global _instance
+    if _instance is None: _instance = IconCache()
+    return _instance
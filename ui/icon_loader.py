@@ -0,0 +1,222 @@
+from PySide6.QtWidgets import QApplication, QStyle
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QIcon
+from collections import deque
+import heapq
+import itertools
+import threading
+import time
+from .icon_cache import get_icon_cache
+
+PRIORITY_VISIBLE = 0  # 当前在视口内
+PRIORITY_NORMAL = 1
+WORKER_COUNT = 4
+DELIVER_INTERVAL_MS = 30  # 批量回填间隔
+EXTRACT_BUDGET_S = 0.008  # 每次回填最多花在 Shell 提取上的时间，保证界面不卡
+
+
+class IconLoader(QObject):
+    """
+    异步图标加载服务
+    - request() 立即返回图标：内存命中直接返回真图标，否则返回占位图标，真图标稍后通过回调补上
+    - 工作线程：stat + 查 cache.db + 解码 PNG (QImage 线程安全)
+    - GUI 线程：每 30ms 批量回填一次；两级缓存都未命中的文件在 GUI 线程按时间片调用
+      QFileIconProvider (QPixmap / Shell 图标不能在工作线程创建)
+    - 按 group (通常是视图本身) 管理请求：prioritize() 提升视口内请求的优先级，cancel() 作废整组请求
+    """
+
+    def __init__(self, cache=None, workers=WORKER_COUNT):
+        super().__init__()
+        self.cache = cache or get_icon_cache()
+        self._cond = threading.Condition()
+        self._heap = []  # 工作线程队列: (优先级, 序号, key, 代数)
+        self._state = {}  # key -> 'queued' | 'taken' | 'extract'   (key = (group, path, px))
+        # group -> 代数，cancel 后旧结果直接丢弃；代数全局递增不重复，cancel 时可以直接删掉整组的记录
+        # (不长期持有已关闭视图的引用)，之后重新请求的同一组拿到新代数，旧结果不会被误认
+        self._gen = {}
+        self._gen_seq = itertools.count(1)
+        self._seq = itertools.count()
+        self._results = deque()  # 工作线程 -> GUI 线程
+        self._extract = []  # GUI 线程队列: (优先级, 序号, key, 代数, stat)
+        self._callbacks = {}  # key -> [callback(QIcon)]，只在 GUI 线程访问
+        self._placeholder = None
+        self._stopped = False
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(DELIVER_INTERVAL_MS)
+        self._timer.timeout.connect(self._deliver)
+
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for t in self._threads: t.start()
+
+    def placeholder(self):
+        if self._placeholder is None:
+            self._placeholder = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
+        return self._placeholder
+
+    def request(self, group, path, px, callback, priority=PRIORITY_NORMAL):
+        """
+        请求 path 的图标，返回可立即使用的 QIcon
+        若返回的是占位图标，真图标就绪后在 GUI 线程调用 callback(QIcon)；同一组内相同 (path, px) 的请求会合并
+        """
+        if not path: return self.placeholder()
+        pixmap = self.cache.memory_pixmap(path, px)
+        if pixmap is not None: return QIcon(pixmap)
+
+        key = (group, path, px)
+        self._callbacks.setdefault(key, []).append(callback)
+        with self._cond:
+            if key not in self._state:
+                self._state[key] = 'queued'
+                gen = self._gen.get(group)
+                if gen is None: gen = self._gen[group] = next(self._gen_seq)
+                heapq.heappush(self._heap, (priority, next(self._seq), key, gen))
+                self._cond.notify()
+        if not self._timer.isActive(): self._timer.start()
+        return self.placeholder()
+
+    def prioritize(self, group, paths, px):
+        """把 group 中这些路径 (通常是视口内的条目) 提到队首"""
+        with self._cond:
+            gen = self._gen.get(group)
+            if gen is None: return  # 该组没有未完成的请求
+            for path in paths:
+                key = (group, path, px)
+                state = self._state.get(key)
+                if state == 'queued':
+                    heapq.heappush(self._heap, (PRIORITY_VISIBLE, next(self._seq), key, gen))
+                elif state == 'extract':
+                    # extract 队列中的条目带着 stat，找到原条目重新入队
+                    for item in self._extract:
+                        if item[2] == key:
+                            heapq.heappush(self._extract, (PRIORITY_VISIBLE, next(self._seq), key, gen, item[4]))
+                            break
+            self._cond.notify_all()
+
+    def prioritize_visible(self, group, view, path_of_index, px):
+        """按视图当前可见的条目调用 prioritize；path_of_index(QModelIndex) -> 路径"""
+        paths = [path_of_index(idx) for idx in visible_indexes(view)]
+        self.prioritize(group, [p for p in paths if p], px)
+
+    def watch(self, group, view, path_of_index, px):
+        """视图滚动 / 缩放后 (防抖 50ms) 自动把视口内的请求提到队首；px 可以是整数或返回整数的函数"""
+        timer = QTimer(view)
+        timer.setSingleShot(True)
+        timer.setInterval(50)
+        timer.timeout.connect(lambda: self.prioritize_visible(group, view, path_of_index, px() if callable(px) else px))
+        view.verticalScrollBar().valueChanged.connect(lambda _: timer.start())
+        view.horizontalScrollBar().valueChanged.connect(lambda _: timer.start())
+
+    def cancel(self, group):
+        """
+        作废 group 的全部请求 (视图清空 / 关闭前调用)，已在处理中的结果到达后直接丢弃
+        同时移除该组在队列与状态表中的全部记录，加载器不再引用这个 group
+        """
+        with self._cond:
+            self._gen.pop(group, None)
+            for key in [k for k in self._state if k[0] is group]: del self._state[key]
+            self._heap = [e for e in self._heap if e[2][0] is not group]
+            heapq.heapify(self._heap)
+            self._extract = [e for e in self._extract if e[2][0] is not group]
+            heapq.heapify(self._extract)
+        for key in [k for k in self._callbacks if k[0] is group]: del self._callbacks[key]
+
+    def shutdown(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._timer.stop()
+
+    # --- 工作线程 ---
+    def _worker(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped: return
+                    entry = self._pop_queued()
+                    if entry is not None: break
+                    self._cond.wait()
+            self._load(*entry)
+            entry = None  # 等待下一个请求时不再引用上一个 key (其中的 group)
+
+    def _load(self, priority, _, key, gen):
+        try:
+            st, image = self.cache.load_image(key[1], key[2])
+        except Exception as e:
+            print(f"Icon Error: {e}")
+            st, image = None, None
+        self._results.append((priority, key, gen, st, image))
+
+    def _pop_queued(self):
+        # 调用方持有锁；跳过已取消 / 已被更高优先级副本取走的条目
+        while self._heap:
+            priority, seq, key, gen = heapq.heappop(self._heap)
+            if self._state.get(key) == 'queued' and self._gen.get(key[0]) == gen:
+                self._state[key] = 'taken'
+                return priority, seq, key, gen
+        return None
+
+    # --- GUI 线程 ---
+    def _deliver(self):
+        ready = []
+        # 1. 工作线程的结果
+        while self._results:
+            priority, key, gen, st, image = self._results.popleft()
+            with self._cond:
+                if self._gen.get(key[0]) != gen or self._state.get(key) != 'taken': continue
+                if image is None:
+                    self._state[key] = 'extract'
+                    heapq.heappush(self._extract, (priority, next(self._seq), key, gen, st))
+                    continue
+                del self._state[key]
+            ready.append((key, self.cache.put_image(key[1], key[2], st, image)))
+
+        # 2. 需要 Shell 提取的文件，按时间片处理
+        deadline = time.perf_counter() + EXTRACT_BUDGET_S
+        while self._extract and time.perf_counter() < deadline:
+            _, _, key, gen, st = heapq.heappop(self._extract)
+            with self._cond:
+                if self._gen.get(key[0]) != gen or self._state.get(key) != 'extract': continue
+                del self._state[key]
+            pixmap = self.cache.extract(key[1], key[2], st) if st is not None else None
+            ready.append((key, pixmap))
+
+        # 3. 批量回填
+        for key, pixmap in ready:
+            icon = QIcon(pixmap) if pixmap is not None else self.cache.fallback_icon(key[1])
+            for callback in self._callbacks.pop(key, ()):
+                callback(icon)
+
+        if not self._callbacks and not self._results:
+            self._timer.stop()
+
+
+def visible_indexes(view):
+    """返回视图视口内第一列的可见索引 (按行顺序；列表 IconMode 与树视图的 visualRect 都随行号单调)"""
+    model = view.model()
+    n = model.rowCount()
+    rect = view.viewport().rect()
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if view.visualRect(model.index(mid, 0)).bottom() < rect.top():
+            lo = mid + 1
+        else:
+            hi = mid
+    result = []
+    for row in range(lo, n):
+        idx = model.index(row, 0)
+        r = view.visualRect(idx)
+        if r.top() > rect.bottom(): break
+        if r.intersects(rect): result.append(idx)
+    return result
+
+
+_instance = None
+
+
+def get_icon_loader():
+    """全局共享的图标加载服务 (首次调用时创建，需在 QApplication 之后)"""
+    global _instance
+    if _instance is None: _instance = IconLoader()
+    return _instance
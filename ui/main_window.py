@@ -18,6 +18,8 @@ from .page_model_config import ModelConfigPage
 from .page_dedup import DedupPage
 from .dialog_welcome import WelcomeDialog
 from .dialog_about import AboutDialog
+from .icon_cache import get_icon_cache
+from .icon_loader import get_icon_loader
 
 
 # 【修复】 已移除 page_rules 导入，因为它是弹窗 (RulesDialog)，不由主窗口管理
@@ -46,7 +48,6 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("GGDesk Beta 9.4.1")
-        self.config = backend.load_config()
         backend.init_databases()
 
         self.build_ui()
@@ -181,7 +182,7 @@ class MainWindow(QMainWindow):
         self.page_scan.sig_busy.connect(self.update_busy_state)
         if hasattr(self.page_output, 'sig_path_changed'): self.page_output.sig_path_changed.connect(
             self.on_output_path_changed)
-        self.page_manage.sig_settings_changed.connect(self.page_quick.load_data)
+        self.page_manage.sig_settings_changed.connect(self.page_quick.apply_settings)
 
     def add_nav_btn(self, text, icon, idx, layout):
         btn = NavButton(text, icon)
@@ -217,7 +218,7 @@ class MainWindow(QMainWindow):
     def on_nav_clicked(self, idx):
         self.stack.setCurrentIndex(idx)
         if idx == 0:
-            self.page_quick.load_data()
+            self.page_quick.refresh()  # 数据未变化时直接返回
         elif idx == 1:
             self.page_manage.load_data()
 
@@ -225,7 +226,7 @@ class MainWindow(QMainWindow):
         AboutDialog(self).exec()
 
     def check_first_run(self):
-        if self.config.getboolean('Settings', 'is_first_run', fallback=True): self.show_welcome_dialog(modal=True)
+        if backend.config_getboolean('Settings', 'is_first_run', True): self.show_welcome_dialog(modal=True)
 
     def show_welcome_dialog(self, modal=False):
         welcome = WelcomeDialog(self)
@@ -233,9 +234,8 @@ class MainWindow(QMainWindow):
             welcome.exec()
         else:
             welcome.show()
-        if welcome.chk_no_show.isChecked() and self.config.getboolean('Settings', 'is_first_run', fallback=True):
-            self.config['Settings']['is_first_run'] = 'false';
-            backend.save_config(self.config)
+        if welcome.chk_no_show.isChecked() and backend.config_getboolean('Settings', 'is_first_run', True):
+            backend.config_set('Settings', 'is_first_run', 'false')
 
     @Slot(str)
     def update_status(self, msg):
@@ -250,7 +250,7 @@ class MainWindow(QMainWindow):
         if hasattr(self, 'page_scan'): self.page_scan.update_path_hint(path)
 
     def restore_geometry(self):
-        geo = self.config.get('Settings', 'window_geometry', fallback='')
+        geo = backend.config_get('Settings', 'window_geometry', '')
         try:
             w, h, x, y = map(int, re.split(r'[x+]', geo)); self.resize(QSize(w, h)); self.move(x, y)
         except:
@@ -260,6 +260,10 @@ class MainWindow(QMainWindow):
         self.page_scan.save_state();
         self.page_output.save_state()
         geo = self.geometry();
-        self.config['Settings']['window_geometry'] = f"{geo.width()}x{geo.height()}+{geo.x()}+{geo.y()}"
-        backend.save_config(self.config)
+        backend.config_set('Settings', 'window_geometry', f"{geo.width()}x{geo.height()}+{geo.x()}+{geo.y()}")
+        backend.flush_config()
+        get_icon_loader().shutdown()
+        get_icon_cache().flush()
+        backend.flush_launches()  # 写回缓冲中的启动次数
+        backend.close_databases()
         e.accept()
\ No newline at end of file
@@ -3,21 +3,19 @@ from PySide6.QtWidgets import (
     QTreeWidget, QTreeWidgetItem, QHeaderView, QFrame, QMessageBox,
     QSlider, QGroupBox, QCheckBox
 )
-from PySide6.QtCore import Qt, QSize, QFileInfo
+from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QIcon, QColor, QBrush, QAction
 import os
 import scanner_backend as backend
 # 复用之前的去重核心模块
 from scanner_backend.core_dedup import DuplicateAnalyzer
+from .icon_cache import get_icon_cache
 
 
 class DedupPage(QWidget):
     def __init__(self):
         super().__init__()
-        self.config = backend.load_config()
-        self.icon_provider = backend.utils_system.win32com  # 不对，这里直接用 UI 库
-        from PySide6.QtWidgets import QFileIconProvider
-        self.icon_provider = QFileIconProvider()
+        self.icon_cache = get_icon_cache()
 
         self.build_ui()
 
@@ -35,7 +33,7 @@ class DedupPage(QWidget):
         self.slider.setRange(10, 100)
 
         # 【Beta 9.1 优化】 读取全局配置的默认值
-        global_threshold = self.config['Rules'].getfloat('dedup_threshold', 0.6)
+        global_threshold = backend.config_getfloat('Rules', 'dedup_threshold', 0.6)
         self.slider.setValue(int(global_threshold * 100))
 
         self.lbl_val = QLabel(f"{int(global_threshold * 100)}%")
@@ -95,8 +93,7 @@ class DedupPage(QWidget):
     # 【Beta 9.1 新增】 反向同步配置
     def save_threshold_global(self):
         val = str(self.slider.value() / 100.0)
-        self.config['Rules']['dedup_threshold'] = val
-        backend.save_config(self.config)
+        backend.config_set('Rules', 'dedup_threshold', val)
         QMessageBox.information(self, "已保存",
                                 f"全局判重灵敏度已更新为 {self.lbl_val.text()}。\n扫描策略也将使用此标准。")
 
@@ -165,7 +162,7 @@ class DedupPage(QWidget):
                 # 设置图标
                 icon_path = p['lnk_path'] if os.path.exists(p['lnk_path']) else p['exe_path']
                 if p['type'] != 'uwp':
-                    item.setIcon(0, self.icon_provider.icon(QFileInfo(icon_path)))
+                    item.setIcon(0, self.icon_cache.icon(icon_path))
 
                 # 复选框：用于标记删除
                 item.setCheckState(0, Qt.Unchecked)
@@ -179,31 +176,12 @@ class DedupPage(QWidget):
 
     def run_clustering(self, items, analyzer):
         """
-        简单的聚类逻辑，利用 analyzer._is_similar
+        聚类逻辑：按相似关系取连通分量 (analyzer.cluster 内部做分块 + 候选过滤，不再两两比较)
         """
-        clusters = []
-        visited = set()
-
-        # 按名称排序，加速邻近比较
-        items.sort(key=lambda x: x['name'])
-
-        for i in range(len(items)):
-            if i in visited: continue
-
-            current_cluster = [items[i]]
-            visited.add(i)
-
-            for j in range(i + 1, len(items)):
-                if j in visited: continue
-
-                # 使用 analyzer 的核心相似度算法
-                if analyzer._is_similar(items[i], items[j]):
-                    current_cluster.append(items[j])
-                    visited.add(j)
-
-            clusters.append(current_cluster)
-
-        return clusters
+        # 每项只做一次路径/名称规范化，按名称排序，组内顺序稳定
+        candidates = analyzer.make_candidates(items)
+        candidates.sort(key=lambda c: c.item['name'])
+        return analyzer.cluster(candidates)
 
     def clean_selected(self):
         selected_items = []
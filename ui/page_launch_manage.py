@@ -1,13 +1,12 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
     QPushButton, QHBoxLayout, QHeaderView, QMessageBox, QAbstractItemView,
-    QGroupBox, QSlider, QComboBox, QCheckBox, QDialog, QApplication, QStyle,
-    QFileIconProvider  # <--- 【修复】 正确的位置在这里
+    QGroupBox, QSlider, QComboBox, QCheckBox, QDialog, QApplication, QStyle
 )
-from PySide6.QtCore import Qt, Signal, QFileInfo
-# from PySide6.QtGui import QFileIconProvider <--- 【错误】 已移除
+from PySide6.QtCore import Qt, Signal
 import os
 import scanner_backend as backend
+from .icon_cache import get_icon_cache
 
 
 # --- 数据库弹窗 ---
@@ -17,7 +16,7 @@ class DatabaseDialog(QDialog):
         self.setWindowTitle("数据库高级管理")
         self.resize(800, 600)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
-        self.icon_provider = QFileIconProvider()
+        self.icon_cache = get_icon_cache()
         self.build_ui()
         self.load_data()
 
@@ -52,7 +51,7 @@ class DatabaseDialog(QDialog):
             self.table.setItem(i, 0, QTableWidgetItem(str(row['id'])))
             item_name = QTableWidgetItem(row['name'])
             path = row['lnk_path'] if os.path.exists(row['lnk_path']) else row['exe_path']
-            if row['source_type'] != 'uwp': item_name.setIcon(self.icon_provider.icon(QFileInfo(path)))
+            if row['source_type'] != 'uwp': item_name.setIcon(self.icon_cache.icon(path))
             self.table.setItem(i, 1, item_name)
             self.table.setItem(i, 2, QTableWidgetItem(row['source_type']))
             self.table.setItem(i, 3, QTableWidgetItem(row['exe_path']))
@@ -73,7 +72,6 @@ class LaunchManagePage(QWidget):
 
     def __init__(self):
         super().__init__()
-        self.config = backend.load_config()
         self.build_ui()
         self.load_ui_states()
 
@@ -96,7 +94,7 @@ class LaunchManagePage(QWidget):
         l_view.addSpacing(20);
         l_view.addWidget(QLabel("排序:"))
         self.combo_sort = QComboBox();
-        self.combo_sort.addItems(["名称 (A-Z)", "热度", "时间"])
+        self.combo_sort.addItems(["名称 (A-Z)", "热度", "时间", "常用 (近期优先)"])
         self.combo_sort.currentIndexChanged.connect(self.save_settings)
         l_view.addWidget(self.combo_sort);
         l_view.addSpacing(20)
@@ -125,21 +123,22 @@ class LaunchManagePage(QWidget):
         layout.addWidget(btn_db)
 
     def load_ui_states(self):
-        s = self.config['Settings']
+        s = backend.load_config()['Settings']
         v = s.getint('launcher_icon_size', 72);
         self.slider_size.setValue(v);
         self.lbl_size_val.setText(f"{v}px")
         self.chk_badge.setChecked(s.getboolean('launcher_show_badges', True))
-        m = {'name': 0, 'count': 1, 'added': 2};
+        m = {'name': 0, 'count': 1, 'added': 2, 'frecency': 3};
         self.combo_sort.setCurrentIndex(m.get(s.get('launcher_sort_by', 'name'), 0))
         self.slider_size.valueChanged.connect(lambda v: self.lbl_size_val.setText(f"{v}px"))
 
     def save_settings(self):
-        s = self.config['Settings']
+        conf = backend.load_config()
+        s = conf['Settings']
         s['launcher_icon_size'] = str(self.slider_size.value())
         s['launcher_show_badges'] = str(self.chk_badge.isChecked())
-        s['launcher_sort_by'] = ['name', 'count', 'added'][self.combo_sort.currentIndex()]
-        backend.save_config(self.config)
+        s['launcher_sort_by'] = ['name', 'count', 'added', 'frecency'][self.combo_sort.currentIndex()]
+        backend.save_config(conf)
         self.sig_settings_changed.emit()
 
     def load_data(self): pass  # 占位，兼容旧接口
\ No newline at end of file
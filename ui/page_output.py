@@ -1,12 +1,11 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel,
-    QTreeWidget, QTreeWidgetItem, QHeaderView, QFileDialog, QFrame,
-    QFileIconProvider  # <--- 移到这里
+    QTreeWidget, QTreeWidgetItem, QHeaderView, QFileDialog, QFrame
 )
-from PySide6.QtCore import Qt, Signal, QFileInfo, QSize
-# from PySide6.QtGui import QFileIconProvider  <--- 删除这行
+from PySide6.QtCore import Qt, Signal, QSize
 import os
 import scanner_backend as backend
+from .icon_cache import get_icon_cache
 
 
 class OutputPage(QWidget):
@@ -14,8 +13,7 @@ class OutputPage(QWidget):
 
     def __init__(self):
         super().__init__()
-        self.config = backend.load_config()
-        self.icon_provider = QFileIconProvider()
+        self.icon_cache = get_icon_cache()
         self.build_ui()
 
     def build_ui(self):
@@ -51,7 +49,7 @@ class OutputPage(QWidget):
         layout.addWidget(btn_refresh, 0, Qt.AlignmentFlag.AlignRight)
 
         # Init
-        self.out_edit.setText(self.config.get('Settings', 'output_path', fallback=''))
+        self.out_edit.setText(backend.config_get('Settings', 'output_path', ''))
 
     def on_path_changed(self, text):
         self.refresh_existing_shortcuts()
@@ -70,12 +68,11 @@ class OutputPage(QWidget):
             for name, target in items:
                 t = QTreeWidgetItem([name, target])
                 full_lnk = os.path.join(path, name)
-                t.setIcon(0, self.icon_provider.icon(QFileInfo(full_lnk)))
+                t.setIcon(0, self.icon_cache.icon(full_lnk))
                 self.out_tree.addTopLevelItem(t)
             self.out_tree.header().resizeSections(QHeaderView.ResizeMode.ResizeToContents)
         else:
             self.out_tree.addTopLevelItem(QTreeWidgetItem(["(目录不存在)", ""]))
 
     def save_state(self):
-        self.config['Settings']['output_path'] = self.out_edit.text()
-        backend.save_config(self.config)
\ No newline at end of file
+        backend.config_set('Settings', 'output_path', self.out_edit.text())
\ No newline at end of file
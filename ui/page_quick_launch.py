@@ -1,18 +1,347 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem,
-    QMenu, QMessageBox, QFileIconProvider, QFrame, QApplication, QStyle
+    QWidget, QVBoxLayout, QLabel, QListView, QAbstractItemView,
+    QMenu, QMessageBox, QFrame, QApplication, QStyle, QLineEdit
 )
-from PySide6.QtCore import Qt, QSize, QFileInfo
+from PySide6.QtCore import Qt, QSize, QTimer, QAbstractListModel, QAbstractProxyModel, QModelIndex
 from PySide6.QtGui import QIcon, QAction
 import os
+import bisect
 import subprocess
 import scanner_backend as backend
+from scanner_backend.core_search import SearchIndex
+from .icon_loader import get_icon_loader
+
+# 自定义数据角色
+SidRole = Qt.UserRole
+ExeRole = Qt.UserRole + 1
+ArgsRole = Qt.UserRole + 2
+SourceRole = Qt.UserRole + 3
+IconPathRole = Qt.UserRole + 4
+RunCountRole = Qt.UserRole + 5
+AddedRole = Qt.UserRole + 6
+
+# 快照中每行的字段
+_FIELDS = ('id', 'name', 'exe_path', 'lnk_path', 'source_type', 'args', 'run_count', 'added_at', 'frecency')
+
+
+def _added_key(added_at):
+    # 'YYYY-MM-DD HH:MM:SS' -> 整数，用于降序排序
+    digits = ''.join(ch for ch in str(added_at or '') if ch.isdigit())
+    return int(digits) if digits else 0
+
+
+SORT_KEYS = {
+    'name': lambda r: (r['name'].lower(), r['id']),  # 名称升序
+    'count': lambda r: (-(r['run_count'] or 0), r['name'].lower(), r['id']),  # 热度降序
+    'added': lambda r: (-_added_key(r['added_at']), -r['id']),  # 与数据库默认顺序一致：添加时间降序
+    # 常用度降序 (对数得分可直接比较，见 core_frecency)，从未启动过的按名称排在最后
+    'frecency': lambda r: (r['frecency'] is None, -(r['frecency'] or 0.0), r['name'].lower(), r['id']),
+}
+BULK_CHANGE_LIMIT = 256  # 一次变化超过这么多行时直接重置模型，比逐行移动更快
+LAUNCH_FLUSH_MS = 5000  # 启动次数写回间隔 (异常退出最多丢失这段时间内的启动记录)
+
+
+class ShortcutListModel(QAbstractListModel):
+    """
+    启动台数据模型：持有按当前排序方式排好序的快捷方式快照，图标在条目第一次被绘制时才异步请求
+    - 排序在模型内用 Python 的 key 排序完成 (代理模型只负责过滤)，避免 lessThan 回调上万次
+    - set_rows() 与当前快照按 id 做差异比较，只对增删改的行发出通知；排序键变化的行移动到新位置
+    - apply_rows() 只接收变化的行 (来自数据库变更通知)，不需要重新读取整张表
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # [dict]，按排序键有序
+        self._keys = []  # 与 _rows 对应的排序键 (二分查找插入位置)
+        self._row_of = {}  # id -> 行号
+        self._icons = {}  # id -> QIcon (已加载的真图标)
+        self._requested = set()  # 已发出请求的 id
+        self.sort_mode = 'name'
+        self.icon_px = 72
+        self.icon_loader = get_icon_loader()
+        self._uwp_icon = None
+
+    # --- Qt 接口 ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        r = self._rows[index.row()]
+        if role == Qt.DisplayRole: return r['name']
+        if role == Qt.DecorationRole: return self._icon_for(r)
+        if role == Qt.TextAlignmentRole: return Qt.AlignCenter
+        if role == Qt.ToolTipRole: return r['exe_path']
+        if role == SidRole: return r['id']
+        if role == ExeRole: return r['exe_path']
+        if role == ArgsRole: return r['args']
+        if role == SourceRole: return r['source_type']
+        if role == IconPathRole: return r['icon_path']
+        if role == RunCountRole: return r['run_count']
+        if role == AddedRole: return r['added_at']
+        return None
+
+    # --- 数据更新 ---
+    def set_sort_mode(self, mode):
+        if mode not in SORT_KEYS: mode = 'name'
+        if mode == self.sort_mode: return
+        self.sort_mode = mode
+        self._reset(self._rows)
+
+    def set_rows(self, db_rows):
+        """用完整的数据库查询结果更新快照 (按 id 差异更新)"""
+        new_rows = {}
+        for row in db_rows:
+            r = self._snapshot(row)
+            new_rows[r['id']] = r
+        removed = [sid for sid in self._row_of if sid not in new_rows]
+        self._apply(removed, new_rows.values(), full=True)
+
+    def apply_rows(self, db_rows, removed_ids=()):
+        """
+        增量更新：db_rows 为发生变化 (新增或修改) 的行，removed_ids 为已删除的 id
+        不在快照中的删除 id 直接忽略
+        """
+        rows = {}
+        for row in db_rows:
+            r = self._snapshot(row)
+            rows[r['id']] = r  # 同一行可能同时按 id 与 exe_path 查到
+        removed = [sid for sid in set(removed_ids) if sid in self._row_of and sid not in rows]
+        self._apply(removed, list(rows.values()), full=False)
+
+    def _apply(self, removed, rows, full):
+        # full=True 时 rows 是完整快照，否则只是变化的行
+        added = [r for r in rows if r['id'] not in self._row_of]
+        changed = [r for r in rows if r['id'] in self._row_of and r != self._rows[self._row_of[r['id']]]]
+        if not self._rows or len(removed) + len(added) + len(changed) > BULK_CHANGE_LIMIT:
+            for sid in removed: self._forget_icon(sid)
+            for r in changed: self._forget_icon_if_moved(r)
+            if full:
+                self._reset(rows)
+            else:
+                gone = set(removed)
+                merged = {r['id']: r for r in self._rows if r['id'] not in gone}
+                for r in rows: merged[r['id']] = r
+                self._reset(merged.values())
+            return
+
+        # 1. 删除：从后往前逐行删除
+        for row in sorted((self._row_of[sid] for sid in removed), reverse=True):
+            self._remove_row(row)
+
+        # 2. 修改：排序键不变则原位替换，否则移动到新位置
+        key_of = SORT_KEYS[self.sort_mode]
+        for r in changed:
+            row = self._row_of[r['id']]
+            self._forget_icon_if_moved(r)
+            if key_of(r) == self._keys[row]:
+                self._rows[row] = r
+                idx = self.index(row)
+                self.dataChanged.emit(idx, idx)
+            else:
+                self._remove_row(row)
+                self._insert_row(r)
+
+        # 3. 新增：插入到排序位置
+        for r in added: self._insert_row(r)
+
+    def set_icon_px(self, px):
+        """图标尺寸变化：丢弃已加载的图标，只有可见条目会重新请求"""
+        if px == self.icon_px: return
+        self.icon_loader.cancel(self)
+        self.icon_px = px
+        self._icons.clear()
+        self._requested.clear()
+        if self._rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [Qt.DecorationRole])
+
+    def row_of(self, sid):
+        return self._row_of.get(sid)
+
+    def entries(self):
+        """[(id, 名称, exe 路径)]，用于构建搜索索引"""
+        return [(r['id'], r['name'], r['exe_path']) for r in self._rows]
+
+    # --- 内部 ---
+    @staticmethod
+    def _snapshot(row):
+        r = {k: row[k] for k in _FIELDS}
+        lnk = r['lnk_path'] or ''
+        r['icon_path'] = lnk if lnk and os.path.exists(lnk) else r['exe_path']
+        return r
+
+    def _reset(self, rows):
+        key_of = SORT_KEYS[self.sort_mode]
+        ordered = sorted(rows, key=key_of)
+        self.beginResetModel()
+        self._rows = ordered
+        self._keys = [key_of(r) for r in ordered]
+        self._reindex()
+        self.endResetModel()
+
+    def _remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._keys[row]
+        # endRemoveRows() 会通知代理重新映射 (SearchProxy 通过 row_of 查行号)，行号必须先更新
+        self._reindex()
+        self.endRemoveRows()
+
+    def _insert_row(self, r):
+        key = SORT_KEYS[self.sort_mode](r)
+        row = bisect.bisect_left(self._keys, key)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, r)
+        self._keys.insert(row, key)
+        self._reindex()
+        self.endInsertRows()
+
+    def _reindex(self):
+        self._row_of = {r['id']: k for k, r in enumerate(self._rows)}
+
+    def _forget_icon(self, sid):
+        self._icons.pop(sid, None)
+        self._requested.discard(sid)
+
+    def _forget_icon_if_moved(self, r):
+        row = self._row_of.get(r['id'])
+        if row is not None and self._rows[row]['icon_path'] != r['icon_path']: self._forget_icon(r['id'])
+
+    def _icon_for(self, r):
+        if r['source_type'] == 'uwp':
+            if self._uwp_icon is None:
+                self._uwp_icon = QApplication.style().standardIcon(QStyle.StandardPixmap.SP_DesktopIcon)
+            return self._uwp_icon
+        sid = r['id']
+        icon = self._icons.get(sid)
+        if icon is not None: return icon
+        if sid in self._requested: return self.icon_loader.placeholder()
+        # data() 只会为正在绘制的条目调用，所以图标天然按可见性加载
+        self._requested.add(sid)
+        icon = self.icon_loader.request(self, r['icon_path'], self.icon_px, lambda ic, sid=sid: self._on_icon(sid, ic))
+        if icon is not self.icon_loader.placeholder(): self._icons[sid] = icon
+        return icon
+
+    def _on_icon(self, sid, icon):
+        self._icons[sid] = icon
+        row = self._row_of.get(sid)
+        if row is not None:
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+
+class SearchProxy(QAbstractProxyModel):
+    """
+    搜索结果代理：查询为空时与源模型一一对应 (直接转发源模型的增删通知)；
+    有查询时按 SearchIndex 的相关度顺序只显示命中的行，源模型结构变化后重新查询
+    """
+
+    def __init__(self, search, parent=None):
+        super().__init__(parent)
+        self.search = search  # search(query) -> 按相关度排序的 id 列表
+        self.query = ''
+        self._map = None  # 代理行 -> 源行；None 表示未过滤
+        self._pos = {}  # 源行 -> 代理行
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self._before_change)
+        model.modelReset.connect(self._after_reset)
+        model.rowsAboutToBeInserted.connect(lambda p, first, last: self._before_change(first, last, True))
+        model.rowsInserted.connect(lambda p, first, last: self._after_change(True))
+        model.rowsAboutToBeRemoved.connect(lambda p, first, last: self._before_change(first, last, False))
+        model.rowsRemoved.connect(lambda p, first, last: self._after_change(False))
+        model.dataChanged.connect(self._on_data_changed)
+
+    def set_query(self, query):
+        query = query.strip()
+        if query == self.query: return
+        self.beginResetModel()
+        self.query = query
+        self._remap()
+        self.endResetModel()
+
+    def _remap(self):
+        if not self.query:
+            self._map, self._pos = None, {}
+            return
+        source = self.sourceModel()
+        rows = (source.row_of(sid) for sid in self.search(self.query))
+        self._map = [row for row in rows if row is not None]
+        self._pos = {row: k for k, row in enumerate(self._map)}
+
+    # --- 源模型通知 ---
+    def _before_change(self, first=0, last=0, insert=None):
+        if self._map is None and insert is not None:
+            if insert:
+                self.beginInsertRows(QModelIndex(), first, last)
+            else:
+                self.beginRemoveRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def _after_change(self, insert):
+        if self._map is None:
+            if insert:
+                self.endInsertRows()
+            else:
+                self.endRemoveRows()
+        else:
+            self._remap()
+            self.endResetModel()
+
+    def _after_reset(self):
+        self._remap()
+        self.endResetModel()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        if self._map is None:
+            self.dataChanged.emit(self.index(top_left.row(), 0), self.index(bottom_right.row(), 0), roles)
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            k = self._pos.get(row)
+            if k is not None:
+                idx = self.index(k, 0)
+                self.dataChanged.emit(idx, idx, roles)
+
+    # --- Qt 接口 ---
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid(): return 0
+        return len(self._map) if self._map is not None else self.sourceModel().rowCount()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < self.rowCount() or column != 0: return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid(): return QModelIndex()
+        row = proxy_index.row() if self._map is None else self._map[proxy_index.row()]
+        return self.sourceModel().index(row, 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid(): return QModelIndex()
+        row = source_index.row() if self._map is None else self._pos.get(source_index.row())
+        return QModelIndex() if row is None else self.index(row, 0)
 
 
 class QuickLaunchPage(QWidget):
     def __init__(self):
         super().__init__()
+        self._gen = None  # 快照对应的数据库变更代数，None 表示尚未加载
+        self.search_index = SearchIndex()
+        self._index_stale = True  # 整表重新加载后索引作废，等第一次搜索时再重建
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(LAUNCH_FLUSH_MS)
+        self._flush_timer.timeout.connect(backend.flush_launches)
         self.build_ui()
+        self.apply_settings()
 
     def build_ui(self):
         layout = QVBoxLayout(self);
@@ -24,133 +353,167 @@ class QuickLaunchPage(QWidget):
         self.lbl_header.setStyleSheet("font-size: 22pt; font-weight: 300; color: #555; margin-bottom: 10px;")
         layout.addWidget(self.lbl_header)
 
-        # 2. 图标列表 (极简风)
-        self.list_widget = QListWidget()
-        self.list_widget.setViewMode(QListWidget.IconMode)
-        self.list_widget.setResizeMode(QListWidget.Adjust)
-        self.list_widget.setMovement(QListWidget.Static)
-        self.list_widget.setSpacing(12)
+        # 搜索框：输入即过滤，回车启动第一个结果
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("🔍 搜索名称 / 拼音首字母 / 文件名，回车启动")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setStyleSheet("font-size: 12pt; padding: 6px 10px; border: 1px solid #ddd; border-radius: 8px;")
+        self.search_edit.textChanged.connect(self.on_search_changed)
+        self.search_edit.returnPressed.connect(self.launch_first)
+        layout.addWidget(self.search_edit)
+
+        # 2. 图标列表 (极简风)：Model / View，只绘制可见条目
+        self.model = ShortcutListModel(self)
+        self.proxy = SearchProxy(self.search, self)
+        self.proxy.setSourceModel(self.model)
+
+        self.view = QListView()
+        self.view.setModel(self.proxy)
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setResizeMode(QListView.Adjust)
+        self.view.setMovement(QListView.Static)
+        self.view.setSpacing(12)
+        self.view.setUniformItemSizes(True)  # 所有格子同尺寸，布局不需要逐项测量
+        self.view.setWordWrap(True)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
 
         # QSS: 透明背景，悬停圆角，选中微变
-        self.list_widget.setStyleSheet("""
-            QListWidget { 
-                background-color: transparent; 
-                border: none; 
+        self.view.setStyleSheet("""
+            QListView {
+                background-color: transparent;
+                border: none;
                 outline: none;
             }
-            QListWidget::item { 
+            QListView::item {
                 background-color: transparent;
-                border-radius: 10px; 
+                border-radius: 10px;
                 color: #333;
                 padding: 5px;
             }
-            QListWidget::item:hover { 
-                background-color: rgba(0, 0, 0, 0.05); 
+            QListView::item:hover {
+                background-color: rgba(0, 0, 0, 0.05);
             }
-            QListWidget::item:selected { 
-                background-color: rgba(0, 120, 215, 0.1); 
+            QListView::item:selected {
+                background-color: rgba(0, 120, 215, 0.1);
                 color: #000;
             }
         """)
 
-        self.list_widget.itemDoubleClicked.connect(self.launch_app)
-        self.list_widget.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.list_widget.customContextMenuRequested.connect(self.show_context_menu)
+        self.view.doubleClicked.connect(self.launch_app)
+        self.view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.view.customContextMenuRequested.connect(self.show_context_menu)
 
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.view)
 
     def load_data(self):
-        self.list_widget.clear()
+        self.apply_settings()
+        self.refresh()
+
+    def apply_settings(self):
+        """读取外观与排序设置 (设置变化时调用)"""
         config = backend.load_config()
 
         # 1. 读取外观设置
         size_px = config.getint('Settings', 'launcher_icon_size', fallback=72)
-        self.list_widget.setIconSize(QSize(size_px, size_px))
+        self.view.setIconSize(QSize(size_px, size_px))
         # 网格大小稍微比图标大一点，留出文字空间
-        self.list_widget.setGridSize(QSize(size_px + 40, size_px + 60))
+        self.view.setGridSize(QSize(size_px + 40, size_px + 60))
+        self.model.set_icon_px(size_px)
 
-        # 2. 读取数据
-        shortcuts = backend.get_all_shortcuts()
+        # 2. 排序逻辑
+        self.model.set_sort_mode(config.get('Settings', 'launcher_sort_by', fallback='name'))
 
-        # 3. 排序逻辑
-        sort_mode = config.get('Settings', 'launcher_sort_by', fallback='name')
-        if sort_mode == 'count':
-            shortcuts.sort(key=lambda x: x['run_count'], reverse=True)  # 热度降序
-        elif sort_mode == 'added':
-            pass  # 默认就是按时间 (added_at)
-        else:
-            shortcuts.sort(key=lambda x: x['name'].lower())  # 名称升序
-
-        provider = QFileIconProvider()
-
-        for row in shortcuts:
-            name = row['name'];
-            exe = row['exe_path'];
-            lnk = row['lnk_path'];
-            src = row['source_type']
-            sid = row['id'];
-            args = row['args']
-
-            item = QListWidgetItem(name)
-            item.setTextAlignment(Qt.AlignCenter)
-            item.setData(Qt.UserRole, sid);
-            item.setData(Qt.UserRole + 1, exe)
-            item.setData(Qt.UserRole + 2, args);
-            item.setData(Qt.UserRole + 3, src)
-
-            # 图标
-            icon_target = lnk if os.path.exists(lnk) else exe
-            if src == 'uwp':
-                item.setIcon(QApplication.style().standardIcon(QStyle.StandardPixmap.SP_DesktopIcon))
+        # TODO: 如果 show_badges 为真，这里应该绘制角标 (Beta 8)
+
+    def refresh(self):
+        """
+        按数据库变更通知刷新：代数未变直接返回；否则只读取变化的行
+        首次加载、落后太多或变化过多时才整表重新读取
+        """
+        gen = backend.change_generation()  # 先取代数再读数据，之后的写入会在下次刷新时补上
+        if gen == self._gen: return
+        events = backend.changes_since(self._gen) if self._gen is not None else None
+        ids, exe_paths, deleted = set(), set(), set()
+        for e in events or ():
+            if e.kind == 'delete':
+                deleted.update(e.ids)
             else:
-                item.setIcon(provider.icon(QFileInfo(icon_target)))
+                ids.update(e.ids)
+                exe_paths.update(e.exe_paths)
+        if events is None or len(ids) + len(exe_paths) + len(deleted) > BULK_CHANGE_LIMIT:
+            self._index_stale = True
+            self.model.set_rows(backend.get_all_shortcuts())
+        else:
+            rows = backend.get_shortcuts_by_ids(ids) if ids else []
+            if exe_paths: rows += backend.get_shortcuts_by_exe_paths(exe_paths)
+            present = {row['id'] for row in rows}
+            removed = (deleted | ids) - present
+            if not self._index_stale:
+                # 索引先于模型更新，代理收到模型通知后重新查询时看到的就是新数据
+                for sid in removed: self.search_index.remove(sid)
+                for row in rows: self.search_index.update(row['id'], row['name'], row['exe_path'])
+            self.model.apply_rows(rows, removed)
+        self._gen = gen
+
+    # --- 搜索 ---
+    def search(self, query):
+        if self._index_stale:
+            self.search_index.rebuild(self.model.entries())
+            self._index_stale = False
+        return self.search_index.search(query)
 
-            # TODO: 如果 show_badges 为真，这里应该绘制角标 (Beta 8)
+    def on_search_changed(self, text):
+        self.proxy.set_query(text)
+        if self.proxy.rowCount(): self.view.setCurrentIndex(self.proxy.index(0))
 
-            self.list_widget.addItem(item)
+    def launch_first(self):
+        index = self.view.currentIndex()
+        if not index.isValid(): index = self.proxy.index(0)
+        if index.isValid(): self.launch_app(index)
 
-    def launch_app(self, item):
-        exe_path = item.data(Qt.UserRole + 1);
-        args = item.data(Qt.UserRole + 2)
-        source = item.data(Qt.UserRole + 3);
-        sid = item.data(Qt.UserRole)
+    def launch_app(self, index):
+        exe_path = index.data(ExeRole);
+        args = index.data(ArgsRole)
+        source = index.data(SourceRole);
+        sid = index.data(SidRole)
         try:
             if source == 'uwp':
                 subprocess.Popen(f'explorer.exe {args}')
             else:
                 os.startfile(exe_path)
-            backend.increment_run_count(sid)
+            backend.record_launch(sid)  # 只记在内存里，定时批量写回
+            if not self._flush_timer.isActive(): self._flush_timer.start()
         except Exception as e:
             QMessageBox.warning(self, "启动失败", str(e))
 
     def show_context_menu(self, pos):
-        item = self.list_widget.itemAt(pos)
-        if not item: return
+        index = self.view.indexAt(pos)
+        if not index.isValid(): return
         menu = QMenu();
         menu.setStyleSheet(
             "QMenu { background: white; border: 1px solid #ccc; padding: 5px; } QMenu::item { padding: 5px 20px; } QMenu::item:selected { background: #eee; }")
 
-        menu.addAction("🚀 运行", lambda: self.launch_app(item))
-        menu.addAction("🛡️ 管理员运行", lambda: self.run_as_admin(item))
+        menu.addAction("🚀 运行", lambda: self.launch_app(index))
+        menu.addAction("🛡️ 管理员运行", lambda: self.run_as_admin(index))
 
-        if item.data(Qt.UserRole + 3) != 'uwp':
+        if index.data(SourceRole) != 'uwp':
             menu.addSeparator()
             menu.addAction("📂 打开所在位置",
-                           lambda: subprocess.Popen(f'explorer /select,"{item.data(Qt.UserRole + 1)}"'))
+                           lambda: subprocess.Popen(f'explorer /select,"{index.data(ExeRole)}"'))
 
         menu.addSeparator()
-        menu.addAction("🗑️ 移除", lambda: self.delete_item(item))
-        menu.exec(self.list_widget.mapToGlobal(pos))
+        menu.addAction("🗑️ 移除", lambda: self.delete_item(index))
+        menu.exec(self.view.mapToGlobal(pos))
 
-    def run_as_admin(self, item):
+    def run_as_admin(self, index):
         try:
             import ctypes
-            ctypes.windll.shell32.ShellExecuteW(None, "runas", item.data(Qt.UserRole + 1), None, None, 1)
+            ctypes.windll.shell32.ShellExecuteW(None, "runas", index.data(ExeRole), None, None, 1)
         except Exception as e:
             QMessageBox.warning(self, "错误", str(e))
 
-    def delete_item(self, item):
-        if QMessageBox.question(self, "确认", f"移除 {item.text()}?",
+    def delete_item(self, index):
+        if QMessageBox.question(self, "确认", f"移除 {index.data(Qt.DisplayRole)}?",
                                 QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
-            backend.delete_shortcut(item.data(Qt.UserRole))
-            self.load_data()
\ No newline at end of file
+            backend.delete_shortcut(index.data(SidRole))
+            self.refresh()
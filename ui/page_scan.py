@@ -1,19 +1,237 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel,
-    QTreeWidget, QTreeWidgetItem, QHeaderView, QDialog, QDialogButtonBox,
-    QCheckBox, QFileDialog, QMessageBox, QFileIconProvider, QFrame, QGroupBox,
+    QTreeWidget, QTreeWidgetItem, QTreeView, QHeaderView, QDialog, QDialogButtonBox,
+    QCheckBox, QFileDialog, QMessageBox, QFrame, QGroupBox,
     QComboBox, QStyle, QSizePolicy, QMenu
 )
-from PySide6.QtCore import Qt, Signal, Slot, QThread, QObject, QSize, QFileInfo
+from PySide6.QtCore import (Qt, Signal, Slot, QThread, QObject, QSize, QAbstractTableModel, QModelIndex,
+                            QSortFilterProxyModel)
 from PySide6.QtGui import QIcon, QColor, QBrush, QFont, QAction, QCursor
 import os
+import time
 import scanner_backend as backend
+from .icon_cache import get_icon_cache, DEFAULT_PX
+from .icon_loader import get_icon_loader
 from .dialog_rules import RulesDialog
 
 
-# --- 线程类 (保持不变) ---
+SOURCE_LABELS = {'start_menu': '开始菜单', 'uwp': '应用商店', 'custom': '自定义'}
+SCAN_COLUMNS = ['程序名称', '推荐执行文件', '来源', '状态', '所在目录']
+ProgramRole = Qt.ItemDataRole.UserRole  # 行对应的 programs 下标
+# 状态列: (文字, 提示, 颜色)，按 "是否已存在" 取
+_STATUS = (("🆕 新增", "新发现的程序", QBrush(QColor("#2E8B57"))),
+           ("✅ 已存在", "快捷方式已存在", QBrush(QColor("#888888"))))
+_SOURCE_BRUSH = QBrush(QColor("#005FB8"))
+
+
+class ScanResultModel(QAbstractTableModel):
+    """
+    扫描结果模型：按列存储 (每列一个列表，行号即 programs 下标，只追加不删除)
+    - 勾选状态是一个整数位图 (第 i 位对应第 i 行)，每个来源另有一个行位图；
+      全选 / 取消全选 / 计数都是整数位运算 + bit_count()，不逐行循环
+    - 来源筛选交给 SourceFilterProxy
+    - 图标在条目第一次被绘制时才请求
+    """
+    checks_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.icon_loader = get_icon_loader()
+        self._init_store()
+
+    def _init_store(self):
+        self.programs = []  # 原始扫描结果 (修改执行文件 / 生成快捷方式时使用)
+        self._names = [];
+        self._targets = [];
+        self._displays = [];
+        self._sources = [];
+        self._roots = []
+        self._existing = []  # 快捷方式是否已存在
+        self._checked = 0  # 勾选位图
+        self._source_bits = {}  # 来源文字 -> 行位图
+        self._icons = {}  # 行号 -> QIcon (已加载的真图标)
+        self._requested = set()
+
+    def clear(self):
+        self.beginResetModel()
+        self.icon_loader.cancel(self)
+        self._init_store()
+        self.endResetModel()
+        self.checks_changed.emit()
+
+    # --- Qt 接口 ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(SCAN_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole: return SCAN_COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid(): return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        return flags | Qt.ItemIsUserCheckable if index.column() == 0 else flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if col == 0: return self._names[row]
+            if col == 1: return self._displays[row]
+            if col == 2: return self._sources[row]
+            if col == 3: return _STATUS[self._existing[row]][0]
+            return self._roots[row]
+        if role == ProgramRole: return row
+        if col == 0:
+            if role == Qt.CheckStateRole: return Qt.Checked if self._checked >> row & 1 else Qt.Unchecked
+        elif col == 1:
+            if role == Qt.DecorationRole: return self._icon_for(row)
+            if role == Qt.ToolTipRole: return self._targets[row] or None
+        elif col == 2:
+            if role == Qt.ForegroundRole: return _SOURCE_BRUSH
+        elif col == 3:
+            if role == Qt.ForegroundRole: return _STATUS[self._existing[row]][2]
+            if role == Qt.ToolTipRole: return _STATUS[self._existing[row]][1]
+            if role == Qt.TextAlignmentRole: return Qt.AlignCenter
+        elif role == Qt.ToolTipRole:
+            return self._roots[row]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid() or index.column() != 0: return False
+        bit = 1 << index.row()
+        if Qt.CheckState(value) == Qt.Checked:
+            self._checked |= bit
+        else:
+            self._checked &= ~bit
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.checks_changed.emit()
+        return True
+
+    # --- 数据 ---
+    def append_programs(self, batch, check_new, check_exist, existing):
+        """追加一批扫描结果；existing 为已有快捷方式的目标路径 (规范化后) 集合"""
+        if not batch: return
+        start = len(self._names)
+        self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+        checked = 0;
+        source_bits = {}
+        for i, p in enumerate(batch):
+            target = p['selected_exes'][0] if p['selected_exes'] else ""
+            if p.get('type') == 'uwp':
+                name_disp = "UWP 应用"; norm_target = target
+            else:
+                name_disp = os.path.basename(target) if target else "未选择"; norm_target = backend.normalize_path(target)
+            exists = norm_target in existing
+            source = SOURCE_LABELS.get(p.get('type', 'custom'), '未知')
+            self.programs.append(p)
+            self._names.append(p['name']);
+            self._targets.append(target);
+            self._displays.append(name_disp)
+            self._sources.append(source);
+            self._roots.append(p['root_path']);
+            self._existing.append(exists)
+            # 先在批内的小整数上置位，最后整体移位合并，避免每行都复制一次大整数
+            if (check_exist if exists else check_new): checked |= 1 << i
+            source_bits[source] = source_bits.get(source, 0) | 1 << i
+        self._checked |= checked << start
+        for source, bits in source_bits.items():
+            self._source_bits[source] = self._source_bits.get(source, 0) | bits << start
+        self.endInsertRows()
+        self.checks_changed.emit()
+
+    def update_target(self, row):
+        """programs[row] 的执行文件被修改后刷新显示"""
+        target = self.programs[row]['selected_exes'][0] if self.programs[row]['selected_exes'] else ""
+        self._targets[row] = target
+        self._displays[row] = os.path.basename(target)
+        self._icons.pop(row, None);
+        self._requested.discard(row)
+        idx = self.index(row, 1)
+        self.dataChanged.emit(idx, idx)
+
+    def source_text(self, row):
+        return self._sources[row]
+
+    # --- 位图 ---
+    def all_rows(self):
+        return (1 << len(self._names)) - 1
+
+    def source_rows(self, predicate):
+        """来源文字满足 predicate 的所有行 (位图)"""
+        mask = 0
+        for source, bits in self._source_bits.items():
+            if predicate(source): mask |= bits
+        return mask
+
+    def set_checked(self, mask, checked):
+        """批量勾选 / 取消勾选位图 mask 中的行"""
+        new = self._checked | mask if checked else self._checked & ~mask
+        if new == self._checked: return
+        self._checked = new
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self._names) - 1, 0), [Qt.CheckStateRole])
+        self.checks_changed.emit()
+
+    def checked_count(self, mask):
+        return (self._checked & mask).bit_count()
+
+    def checked_rows(self):
+        """已勾选的行号 (升序)"""
+        bits = bin(self._checked)[:1:-1]  # 低位在前
+        return [i for i, b in enumerate(bits) if b == '1']
+
+    # --- 图标 ---
+    def icon_path(self, row):
+        return self._targets[row] if self.programs[row].get('type') != 'uwp' else None
+
+    def _icon_for(self, row):
+        path = self.icon_path(row)
+        if not path: return None
+        icon = self._icons.get(row)
+        if icon is not None: return icon
+        if row in self._requested: return self.icon_loader.placeholder()
+        self._requested.add(row)
+        icon = self.icon_loader.request(self, path, DEFAULT_PX, lambda ic, row=row: self._on_icon(row, ic))
+        if icon is not self.icon_loader.placeholder(): self._icons[row] = icon
+        return icon
+
+    def _on_icon(self, row, icon):
+        if row >= len(self._names): return
+        self._icons[row] = icon
+        idx = self.index(row, 1)
+        self.dataChanged.emit(idx, idx, [Qt.DecorationRole])
+
+
+class SourceFilterProxy(QSortFilterProxyModel):
+    """按来源筛选扫描结果：直接读模型的来源列，不经过 data() 与正则匹配"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.filter_key = ""
+        # 来源列不会变化，勾选变化时不需要重新过滤 (否则全选一次要重新过滤全部行)
+        self.setDynamicSortFilter(False)
+        self.setSourceModel(model)
+
+    def set_filter_key(self, key):
+        self.filter_key = key
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, row, parent):
+        return self.filter_key == "" or self.filter_key in self.sourceModel().source_text(row)
+
+
+# --- 线程类 ---
+# 扫描结果攒够 SCAN_BATCH_SIZE 个或距上次发送超过 SCAN_BATCH_INTERVAL 秒时整批发送，
+# 界面每批只做一次跨线程调用、一次插入与一次计数刷新
+SCAN_BATCH_SIZE = 200
+SCAN_BATCH_INTERVAL = 0.1  # 秒
+
+
 class ScanWorker(QObject):
-    item_found = Signal(dict);
+    items_found = Signal(list);
     finished = Signal();
     log = Signal(str)
 
@@ -29,6 +247,8 @@ class ScanWorker(QObject):
 
     @Slot()
     def run(self):
+        batch = [];
+        last = time.monotonic()
         try:
             blk, _ = backend.load_blocklist();
             ign, _ = backend.load_ignored_dirs()
@@ -36,11 +256,51 @@ class ScanWorker(QObject):
                                                            lambda: not self.is_running)
             for program in iterator:
                 if not self.is_running: break
-                self.item_found.emit(program)
-            self.finished.emit()
+                batch.append(program)
+                now = time.monotonic()
+                if len(batch) >= SCAN_BATCH_SIZE or now - last >= SCAN_BATCH_INTERVAL:
+                    self.items_found.emit(batch);
+                    batch = [];
+                    last = now
+        except Exception as e:
+            self.log.emit(f"Error: {e}")
+        # 出错或停止时已找到的结果照常送出
+        if batch: self.items_found.emit(batch)
+        self.finished.emit()
+
+
+class GenerateWorker(QObject):
+    progress = Signal(int, int);
+    finished = Signal(int, int);
+    log = Signal(str)
+
+    def __init__(self, tasks, add_db):
+        super().__init__()
+        self.tasks = tasks;
+        self.add_db = add_db;
+        self.is_running = True
+
+    @Slot()
+    def stop(self):
+        self.is_running = False
+
+    @Slot()
+    def run(self):
+        cnt = 0;
+        db_cnt = 0
+        try:
+            results = backend.create_shortcuts_batch(self.tasks, lambda d, t: self.progress.emit(d, t),
+                                                     lambda: not self.is_running)
+            rows = []
+            for (name, exe, lnk_path, args, src), ok, msg in results:
+                if not ok: self.log.emit(msg); continue
+                cnt += 1
+                rows.append((name, exe, lnk_path, src, args))
+            # 一次批量写入 (单个事务)
+            if self.add_db: db_cnt = backend.upsert_shortcuts(rows)
         except Exception as e:
-            self.log.emit(f"Error: {e}");
-            self.finished.emit()
+            self.log.emit(f"Error: {e}")
+        self.finished.emit(cnt, db_cnt)
 
 
 # --- 弹窗类 (保持不变) ---
@@ -103,7 +363,7 @@ class RefineWindow(QDialog):
         self.program_data = program_data;
         self.all_exes = program_data.get('all_exes', [])
         self.original_selection = set(program_data['selected_exes']);
-        self.icon_provider = QFileIconProvider()
+        self.icon_loader = get_icon_loader()
         self.build_ui()
         if self.all_exes:
             self.populate_tree(); self.pre_select_items(); self.on_filter_changed(); self.update_count_label()
@@ -145,6 +405,7 @@ class RefineWindow(QDialog):
         self.tree.setAlternatingRowColors(True);
         self.tree.setIconSize(QSize(20, 20))
         self.tree.setStyleSheet("QTreeWidget { border: 1px solid #CCCCCC; border-radius: 4px; }")
+        self.icon_loader.watch(self.tree, self.tree, lambda idx: idx.data(Qt.ItemDataRole.UserRole), DEFAULT_PX)
         self.tree.itemDoubleClicked.connect(self.on_item_double_clicked);
         self.tree.itemSelectionChanged.connect(self.update_count_label)
         content_layout.addWidget(self.tree)
@@ -175,7 +436,8 @@ class RefineWindow(QDialog):
         items = []
         for (full_path, file_name, size_bytes, rel_path) in self.all_exes:
             item = QTreeWidgetItem([file_name, f"{size_bytes / 1024 / 1024:.2f} MB", full_path])
-            item.setIcon(0, self.icon_provider.icon(QFileInfo(full_path)));
+            item.setIcon(0, self.icon_loader.request(self.tree, full_path, DEFAULT_PX,
+                                                     lambda icon, it=item: it.setIcon(0, icon)));
             item.setData(0, Qt.ItemDataRole.UserRole, full_path);
             items.append(item)
         self.tree.addTopLevelItems(items);
@@ -214,6 +476,11 @@ class RefineWindow(QDialog):
     def select_none(self):
         self.tree.clearSelection()
 
+    def done(self, result):
+        # 关闭前作废尚未回填的图标请求 (条目随窗口销毁)
+        self.icon_loader.cancel(self.tree)
+        super().done(result)
+
     def on_ok(self):
         self.program_data['selected_exes'] = tuple(
             [i.data(0, Qt.ItemDataRole.UserRole) for i in self.tree.selectedItems()])
@@ -228,12 +495,17 @@ class ScanPage(QWidget):
 
     def __init__(self):
         super().__init__()
-        self.config = backend.load_config()
-        self.programs = []
+        self.results = ScanResultModel(self)
+        self.results.checks_changed.connect(self.update_selection_count)
         self.scan_thread = None;
         self.scan_worker = None;
-        self.icon_provider = QFileIconProvider()
+        self.gen_thread = None;
+        self.gen_worker = None;
+        self.gen_output = ""
+        self.icon_cache = get_icon_cache()
+        self.icon_loader = get_icon_loader()
         self.existing_shortcuts = {}
+        self.filter_key = ""
         self.build_ui()
         self.update_rules_summary()
 
@@ -276,11 +548,14 @@ class ScanPage(QWidget):
         pb_layout.setContentsMargins(0, 0, 0, 0)
         self.path_edit = QLineEdit();
         self.path_edit.setReadOnly(True);
-        self.path_edit.setPlaceholderText("请选择要扫描的根目录...")
+        self.path_edit.setPlaceholderText("请选择要扫描的根目录 (可添加多个，各目录并发扫描)...")
         btn_browse = QPushButton("📂 选择目录");
         btn_browse.clicked.connect(self.browse_scan_path)
+        btn_add_path = QPushButton("➕ 添加目录");
+        btn_add_path.clicked.connect(self.add_scan_path)
         pb_layout.addWidget(self.path_edit);
-        pb_layout.addWidget(btn_browse)
+        pb_layout.addWidget(btn_browse);
+        pb_layout.addWidget(btn_add_path)
         panel_layout.addWidget(self.path_box)
 
         # 1.3 规则概览
@@ -333,12 +608,15 @@ class ScanPage(QWidget):
         res_layout.addLayout(tool_bar)
 
         # 2.2 列表
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(['程序名称', '推荐执行文件', '来源', '状态', '所在目录'])
+        self.proxy = SourceFilterProxy(self.results, self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.proxy)
+        self.tree.setRootIsDecorated(False);
+        self.tree.setUniformRowHeights(True)
         self.tree.setAlternatingRowColors(True);
         self.tree.setIconSize(QSize(24, 24))
-        self.tree.itemDoubleClicked.connect(self.open_refine)
-        self.tree.itemChanged.connect(self.on_tree_item_changed)
+        self.tree.doubleClicked.connect(self.open_refine)
+        self.icon_loader.watch(self.results, self.tree, self.icon_path_of_index, DEFAULT_PX)
         res_layout.addWidget(self.tree)
 
         # 2.3 提示
@@ -365,13 +643,13 @@ class ScanPage(QWidget):
         footer_layout.addWidget(self.btn_gen)
         main_layout.addLayout(footer_layout)
 
-        last = self.config.get('Settings', 'last_scan_path', fallback='')
+        last = backend.config_get('Settings', 'last_scan_path', '')
         if last: self.path_edit.setText(last)
 
     # 【Beta 9.9】 显示列表设置菜单
     def show_list_settings_menu(self):
         menu = QMenu(self)
-        rules = self.config['Rules']
+        rules = backend.load_config()['Rules']
 
         act_new = QAction("默认勾选 [🆕 新增程序]", self, checkable=True)
         act_new.setChecked(rules.getboolean('default_check_new', True))
@@ -386,8 +664,7 @@ class ScanPage(QWidget):
         menu.exec(QCursor.pos())
 
     def update_list_config(self, key, value):
-        self.config['Rules'][key] = str(value)
-        backend.save_config(self.config)
+        backend.config_set('Rules', key, value)
         # 不需要刷新列表，只影响后续
 
     def update_rules_summary(self):
@@ -408,7 +685,6 @@ class ScanPage(QWidget):
         self.lbl_rules_summary.setText("当前生效规则:  " + "   ".join(badges))
 
     def apply_list_filter(self, text):
-        root = self.tree.invisibleRootItem()
         filter_key = ""
         if "自定义" in text:
             filter_key = "自定义"
@@ -416,18 +692,14 @@ class ScanPage(QWidget):
             filter_key = "开始菜单"
         elif "应用商店" in text:
             filter_key = "应用商店"
-        visible_count = 0
-        for i in range(root.childCount()):
-            item = root.child(i)
-            if filter_key == "" or filter_key in item.text(2):
-                item.setHidden(False);
-                visible_count += 1
-            else:
-                item.setHidden(True)
-        checked = 0
-        for i in range(root.childCount()):
-            if root.child(i).checkState(0) == Qt.CheckState.Checked: checked += 1
-        self.lbl_count.setText(f"已选 {checked} / 可见 {visible_count}")
+        self.filter_key = filter_key
+        self.proxy.set_filter_key(filter_key)
+        self.update_selection_count()
+
+    def visible_rows(self):
+        """当前筛选下可见的行 (位图)"""
+        if self.filter_key == "": return self.results.all_rows()
+        return self.results.source_rows(lambda source: self.filter_key in source)
 
     def open_rules_dialog(self):
         RulesDialog(self).exec()
@@ -445,9 +717,16 @@ class ScanPage(QWidget):
             for name, target in raw: self.existing_shortcuts[backend.normalize_path(target)] = name
 
     def browse_scan_path(self):
-        d = QFileDialog.getExistingDirectory(self, "选择目录", self.path_edit.text())
+        roots = backend.split_roots(self.path_edit.text())
+        d = QFileDialog.getExistingDirectory(self, "选择目录", roots[0] if roots else "")
         if d: self.path_edit.setText(d)
 
+    def add_scan_path(self):
+        # 多个目录用 ; 分隔保存在同一个配置项中
+        roots = backend.split_roots(self.path_edit.text())
+        d = QFileDialog.getExistingDirectory(self, "添加目录", roots[-1] if roots else "")
+        if d: self.path_edit.setText(";".join(backend.split_roots(roots + [d])))
+
     def toggle_scan(self):
         if self.scan_thread and self.scan_thread.isRunning():
             self.scan_worker.stop();
@@ -460,13 +739,12 @@ class ScanPage(QWidget):
         if self.chk_uwp.isChecked(): sources.append('uwp')
         custom_path = ""
         if self.chk_custom.isChecked():
-            custom_path = self.path_edit.text()
+            custom_path = ";".join(backend.split_roots(self.path_edit.text()))
             if not custom_path: QMessageBox.warning(self, "提示", "请选择自定义目录。"); return
             sources.append('custom')
         if not sources: QMessageBox.warning(self, "提示", "请至少选择一种扫描范围。"); return
 
-        self.tree.clear();
-        self.programs = [];
+        self.results.clear();
         self.btn_gen.setEnabled(False)
         self.combo_filter.setCurrentIndex(0)
         conf = backend.load_config();
@@ -483,7 +761,7 @@ class ScanPage(QWidget):
         self.scan_thread = QThread(self)
         self.scan_worker = ScanWorker(sources, custom_path)
         self.scan_worker.moveToThread(self.scan_thread)
-        self.scan_worker.item_found.connect(self.on_item_found)
+        self.scan_worker.items_found.connect(self.on_items_found)
         self.scan_worker.log.connect(self.sig_log)
         self.scan_worker.finished.connect(self.on_scan_done)
         self.scan_thread.started.connect(self.scan_worker.run)
@@ -491,51 +769,25 @@ class ScanPage(QWidget):
         self.scan_thread.finished.connect(self.cleanup_thread)
         self.scan_thread.start()
 
-    @Slot(dict)
-    def on_item_found(self, p):
-        self.programs.append(p)
-        conf = backend.load_config();
-        rules = conf['Rules']
-        check_new = rules.getboolean('default_check_new', True)
-        check_exist = rules.getboolean('default_check_existing', False)
-        target = p['selected_exes'][0] if p['selected_exes'] else ""
-        if p.get('type') == 'uwp':
-            name_disp = "UWP 应用"; norm_target = target
-        else:
-            name_disp = os.path.basename(target) if target else "未选择"; norm_target = backend.normalize_path(target)
-        status_text = "🆕 新增";
-        status_tooltip = "新发现的程序";
-        status_color = "#2E8B57";
-        check_state = Qt.CheckState.Checked if check_new else Qt.CheckState.Unchecked
-        if norm_target in self.existing_shortcuts:
-            status_text = "✅ 已存在";
-            status_tooltip = f"快捷方式已存在";
-            status_color = "#888888";
-            check_state = Qt.CheckState.Checked if check_exist else Qt.CheckState.Unchecked
-        source_map = {'start_menu': '开始菜单', 'uwp': '应用商店', 'custom': '自定义'}
-        source_text = source_map.get(p.get('type', 'custom'), '未知')
-        item = QTreeWidgetItem([p['name'], name_disp, source_text, status_text, p['root_path']])
-        item.setCheckState(0, check_state);
-        item.setToolTip(4, p['root_path'])
-        item.setForeground(3, QBrush(QColor(status_color)));
-        item.setToolTip(3, status_tooltip)
-        item.setTextAlignment(3, Qt.AlignmentFlag.AlignCenter);
-        item.setForeground(2, QBrush(QColor("#005FB8")))
-        if p.get('type') != 'uwp' and target: item.setIcon(1,
-                                                           self.icon_provider.icon(QFileInfo(target))); item.setToolTip(
-            1, target)
-        item.setData(0, Qt.ItemDataRole.UserRole, len(self.programs) - 1)
-        self.tree.addTopLevelItem(item)
-        self.update_selection_count()
+    @Slot(list)
+    def on_items_found(self, batch):
+        # 配置每批读取一次
+        check_new = backend.config_getboolean('Rules', 'default_check_new', True)
+        check_exist = backend.config_getboolean('Rules', 'default_check_existing', False)
+        self.results.append_programs(batch, check_new, check_exist, self.existing_shortcuts)
+
+    def icon_path_of_index(self, idx):
+        row = idx.data(ProgramRole)
+        return None if row is None else self.results.icon_path(row)
 
     @Slot()
     def on_scan_done(self):
-        self.sig_status.emit(f"就绪 - 共发现 {len(self.programs)} 个程序")
+        self.sig_status.emit(f"就绪 - 共发现 {len(self.results.programs)} 个程序")
         self.btn_action.setText("🚀 开始扫描");
         self.btn_action.setObjectName("primaryButton");
         self.btn_action.setStyle(self.style())
         self.btn_action.setEnabled(True);
-        self.btn_gen.setEnabled(len(self.programs) > 0)
+        self.btn_gen.setEnabled(len(self.results.programs) > 0)
         self.sig_busy.emit(False)
 
     @Slot()
@@ -546,60 +798,41 @@ class ScanPage(QWidget):
         self.scan_worker = None
 
     def toggle_select_all(self, state):
-        is_checked = (state == Qt.CheckState.Checked.value)
-        self.tree.blockSignals(True)
-        root = self.tree.invisibleRootItem()
-        visible_count = 0
-        for i in range(root.childCount()):
-            item = root.child(i)
-            if not item.isHidden():
-                item.setCheckState(0, Qt.CheckState.Checked if is_checked else Qt.CheckState.Unchecked)
-                visible_count += 1
-        self.tree.blockSignals(False)
-        self.update_selection_count()
-
-    def on_tree_item_changed(self, item, column):
-        if column == 0: self.update_selection_count()
+        self.results.set_checked(self.visible_rows(), state == Qt.CheckState.Checked.value)
 
     def update_selection_count(self):
-        checked = 0;
-        visible = 0;
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
-            if not item.isHidden():
-                visible += 1
-                if item.checkState(0) == Qt.CheckState.Checked: checked += 1
-        self.lbl_count.setText(f"已选 {checked} / 可见 {visible}")
-
-    def open_refine(self, item):
-        idx = item.data(0, Qt.ItemDataRole.UserRole);
-        prog = self.programs[idx]
+        visible = self.visible_rows()
+        self.lbl_count.setText(f"已选 {self.results.checked_count(visible)} / 可见 {visible.bit_count()}")
+
+    def open_refine(self, index):
+        row = index.data(ProgramRole);
+        prog = self.results.programs[row]
         if prog.get('type') == 'uwp' or prog.get('type') == 'start_menu': QMessageBox.information(self, "提示",
                                                                                                   "系统应用不支持修改。"); return
         if RefineWindow(self, prog).exec() == QDialog.DialogCode.Accepted:
-            target = prog['selected_exes'][0] if prog['selected_exes'] else "";
-            item.setText(1, os.path.basename(target))
-            if target: item.setIcon(1, self.icon_provider.icon(QFileInfo(target)))
+            self.results.update_target(row)
 
     def generate(self):
+        if self.gen_thread and self.gen_thread.isRunning():
+            self.gen_worker.stop();
+            self.btn_gen.setText("正在取消...");
+            self.btn_gen.setEnabled(False);
+            return
+
         conf = backend.load_config();
         out = conf.get('Settings', 'output_path', fallback='').strip()
         if not out: out = os.path.join(os.path.expanduser('~'), 'Desktop', backend.DEFAULT_OUTPUT_FOLDER_NAME)
         if not os.path.exists(out): os.makedirs(out)
         tasks = []
-        root = self.tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
-            if item.checkState(0) == Qt.CheckState.Checked:
-                idx = item.data(0, Qt.ItemDataRole.UserRole);
-                p = self.programs[idx]
-                for exe in p['selected_exes']:
-                    name = os.path.splitext(os.path.basename(exe))[0]
-                    if p.get('type') == 'uwp': name = p['name']
-                    lnk_path = os.path.join(out, f"{name}.lnk");
-                    args = f"shell:AppsFolder\\{exe}" if p.get('type') == 'uwp' else "";
-                    tasks.append((p['name'], exe, lnk_path, args, p.get('type', 'custom')))
+        programs = self.results.programs
+        for idx in self.results.checked_rows():
+            p = programs[idx]
+            for exe in p['selected_exes']:
+                name = os.path.splitext(os.path.basename(exe))[0]
+                if p.get('type') == 'uwp': name = p['name']
+                lnk_path = os.path.join(out, f"{name}.lnk");
+                args = f"shell:AppsFolder\\{exe}" if p.get('type') == 'uwp' else "";
+                tasks.append((p['name'], exe, lnk_path, args, p.get('type', 'custom')))
         existing = set(os.listdir(out)) if os.path.exists(out) else set();
         ovr = 0
         for _, _, lnk_path, _, _ in tasks:
@@ -607,18 +840,48 @@ class ScanPage(QWidget):
         if ovr > 0:
             if QMessageBox.question(self, "覆盖确认", f"有 {ovr} 个冲突，是否覆盖？",
                                     QMessageBox.Yes | QMessageBox.No) == QMessageBox.No: return
-        cnt = 0;
-        add_db = self.chk_add_to_db.isChecked();
-        db_cnt = 0
-        for name, exe, lnk_path, args, src in tasks:
-            if backend.create_shortcut(exe, lnk_path, args)[0]:
-                cnt += 1
-                if add_db and backend.add_shortcut_to_db(name, exe, lnk_path, src, args): db_cnt += 1
+
+        # 后台批量写入 (纯 Python 序列化 + 并行)，界面保持响应，可随时取消
+        self.gen_output = out
+        self.btn_gen.setText("🛑 取消生成");
+        self.btn_action.setEnabled(False)
+        self.sig_status.emit(f"正在生成 0/{len(tasks)} ...");
+        self.sig_busy.emit(True)
+
+        self.gen_thread = QThread(self)
+        self.gen_worker = GenerateWorker(tasks, self.chk_add_to_db.isChecked())
+        self.gen_worker.moveToThread(self.gen_thread)
+        self.gen_worker.progress.connect(self.on_gen_progress)
+        self.gen_worker.log.connect(self.sig_log)
+        self.gen_worker.finished.connect(self.on_gen_done)
+        self.gen_thread.started.connect(self.gen_worker.run)
+        self.gen_worker.finished.connect(self.gen_thread.quit)
+        self.gen_thread.finished.connect(self.cleanup_gen_thread)
+        self.gen_thread.start()
+
+    @Slot(int, int)
+    def on_gen_progress(self, done, total):
+        self.sig_status.emit(f"正在生成 {done}/{total} ...")
+
+    @Slot(int, int)
+    def on_gen_done(self, cnt, db_cnt):
+        self.btn_gen.setText("✨ 生成选中快捷方式");
+        self.btn_gen.setEnabled(True);
+        self.btn_action.setEnabled(True)
+        self.sig_busy.emit(False)
         msg = f"创建 {cnt} 个快捷方式。";
-        if add_db: msg += f"\n入库 {db_cnt} 个。"
-        GenSuccessDialog(self, cnt, out).exec()
+        if self.chk_add_to_db.isChecked(): msg += f" 入库 {db_cnt} 个。"
+        self.sig_status.emit(msg)
+        GenSuccessDialog(self, cnt, self.gen_output).exec()
+
+    @Slot()
+    def cleanup_gen_thread(self):
+        if self.gen_thread: self.gen_thread.deleteLater()
+        if self.gen_worker: self.gen_worker.deleteLater()
+        self.gen_thread = None;
+        self.gen_worker = None
 
     def save_state(self):
-        self.config['Settings']['last_scan_path'] = self.path_edit.text()
-        backend.save_config(self.config)
-        if self.scan_thread: self.scan_worker.stop(); self.scan_thread.wait(1000)
\ No newline at end of file
+        backend.config_set('Settings', 'last_scan_path', self.path_edit.text())
+        if self.scan_thread: self.scan_worker.stop(); self.scan_thread.wait(1000)
+        if self.gen_thread: self.gen_worker.stop(); self.gen_thread.wait(3000)
\ No newline at end of file
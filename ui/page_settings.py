@@ -10,7 +10,6 @@ import scanner_styles as styles
 class SettingsPage(QWidget):
     def __init__(self):
         super().__init__()
-        self.config = backend.load_config()
         self.build_ui()
 
     def build_ui(self):
@@ -65,14 +64,13 @@ class SettingsPage(QWidget):
         layout.addWidget(self.log_view)
 
         # Load Theme
-        theme = self.config.get('Settings', 'theme', fallback='dark')
+        theme = backend.config_get('Settings', 'theme', 'dark')
         self.cb_theme.setCurrentIndex(1 if theme == 'light' else 0)
 
     def apply_theme(self, idx):
-        self.config['Settings']['theme'] = 'light' if idx == 1 else 'dark'
         # TODO: 实现跟随系统逻辑
         QApplication.instance().setStyleSheet(styles.LIGHT_QSS if idx == 1 else styles.DARK_QSS)
-        backend.save_config(self.config)
+        backend.config_set('Settings', 'theme', 'light' if idx == 1 else 'dark')
 
     def reset_db(self):
         if QMessageBox.question(self, "警告", "确定要清空所有已保存的快捷方式吗？",